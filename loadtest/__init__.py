@@ -0,0 +1,5 @@
+"""
+HTTP load tests for the docker-compose stack, generated from the Bruno collection.
+
+    python -m loadtest --users 20 --duration 60 --ramp-up 10
+"""
@@ -0,0 +1,80 @@
+"""
+Run weighted user journeys against the docker-compose stack.
+
+    python -m loadtest [--users 10] [--duration 60] [--ramp-up 5] [--think-time 0.5]
+        [--journeys open_board=5,drag_cards=3,login=0] [--output report.json]
+        [--users-url http://localhost:8000/api] [--tasks-url http://localhost:5005/api]
+        [--history-url http://localhost:5006] [--collection api_docs]
+
+Prints p50/p95/p99 latency and throughput per endpoint and, with --output,
+writes the same report as JSON. Exits with status 1 when any request failed.
+"""
+import argparse
+import json
+import os
+import sys
+from .collection import load_collection
+from .journeys import EXTRA_REQUESTS, JOURNEYS, onboarding, with_weights
+from .runner import Target, format_report, run_load
+
+DEFAULT_COLLECTION = os.path.join(os.path.dirname(__file__), "..", "api_docs")
+
+
+def _weights(value: str) -> dict:
+    weights = {}
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION)
+    parser.add_argument("--users-url", default=Target.users_url)
+    parser.add_argument("--tasks-url", default=Target.tasks_url)
+    parser.add_argument("--history-url", default=Target.history_url)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds to start all users")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between steps")
+    parser.add_argument("--cards-per-board", type=int, default=5)
+    parser.add_argument("--journeys", default="", help="Weight overrides, e.g. login=0,open_board=8")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    requests = load_collection(args.collection)
+    for extra in EXTRA_REQUESTS:
+        # Share the folder variables ({{url}}) with the documented requests
+        folder_vars = next(
+            (r.variables for r in requests.values() if r.folder == extra.folder), {}
+        )
+        extra.variables = {**folder_vars, **extra.variables}
+        requests.setdefault(extra.name, extra)
+
+    report = run_load(
+        requests,
+        Target(args.users_url, args.tasks_url, args.history_url),
+        onboarding(args.cards_per_board),
+        with_weights(JOURNEYS, _weights(args.journeys)),
+        users=args.users,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        think_time=args.think_time,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if any(s["errors"] for s in report["endpoints"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Read the Bruno collection in api_docs/ into request templates.
+
+Both formats in the collection are supported: classic `.bru` files (the User
+folder) and OpenCollection `.yml` files (the tasks folder). Folder level
+variables (`folder.bru` / `opencollection.yml`) are kept with every request so
+`{{url}}` resolves the same way it does in Bruno.
+"""
+import json
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import yaml
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options"}
+
+_VARIABLE = re.compile(r"{{\s*([\w.-]+)\s*}}")
+_PATH_PARAM = re.compile(r"/:(\w+)")
+_BLOCK_START = re.compile(r"^([\w:-]+)\s*([{\[])\s*$")
+
+
+@dataclass
+class RequestTemplate:
+    """One request of the collection, with `{{variables}}` and `:path` params left unresolved."""
+
+    name: str
+    folder: str
+    method: str
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body_type: str = "none"
+    body: Any = None
+    auth: str = "inherit"
+    variables: Dict[str, str] = field(default_factory=dict)
+
+    def render(
+        self,
+        variables: Dict[str, Any],
+        body: Any = None,
+        query: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, str, Dict[str, str], Optional[bytes]]:
+        """
+        Resolve the template against `variables`.
+
+        Args:
+            variables (Dict[str, Any]): Environment and runtime variables, including path params
+            body (Any): Replaces the body stored in the collection when given
+            query (Optional[Dict[str, Any]]): Query string parameters, None values are dropped
+
+        Returns:
+            Tuple[str, str, Dict[str, str], Optional[bytes]]: method, url, headers and encoded body
+        """
+        scope = {**self.variables, **variables}
+        url = _PATH_PARAM.sub(lambda m: f"/{scope[m.group(1)]}", substitute(self.url, scope))
+        if query:
+            params = {k: v for k, v in query.items() if v is not None}
+            if params:
+                url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+        headers = {k: substitute(v, scope) for k, v in self.headers.items()}
+        if self.auth != "none" and scope.get("accessToken"):
+            headers.setdefault("Authorization", f"Bearer {scope['accessToken']}")
+
+        # Overrides of requests documented without a body (the tasks API) are sent as JSON
+        body_type = self.body_type
+        payload = body
+        if payload is not None and body_type == "none":
+            body_type = "json"
+        elif payload is None and self.method in ("GET", "HEAD"):
+            body_type = "none"
+        elif payload is None and isinstance(self.body, dict):
+            payload = {k: substitute(v, scope) for k, v in self.body.items()}
+        elif payload is None and self.body is not None:
+            payload = substitute(self.body, scope)
+        encoded, content_type = encode_body(body_type, payload)
+        if content_type:
+            headers["Content-Type"] = content_type
+
+        return self.method, url, headers, encoded
+
+
+def substitute(value: str, variables: Dict[str, Any]) -> str:
+    """Replace `{{name}}` placeholders, resolving nested ones (e.g. url -> baseUrl)."""
+    for _ in range(5):
+        replaced = _VARIABLE.sub(
+            lambda m: str(variables.get(m.group(1), m.group(0))), value
+        )
+        if replaced == value:
+            break
+        value = replaced
+    return value
+
+
+def encode_body(body_type: str, body: Any) -> Tuple[Optional[bytes], Optional[str]]:
+    if body is None or body_type == "none":
+        return None, None
+    if body_type == "json":
+        data = body if isinstance(body, str) else json.dumps(body)
+        return data.encode(), "application/json"
+    if body_type == "form":
+        return urlencode(body).encode(), "application/x-www-form-urlencoded"
+    if body_type == "multipart":
+        boundary = uuid.uuid4().hex
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'
+            for k, v in body.items()
+        ]
+        data = "".join(parts) + f"--{boundary}--\r\n"
+        return data.encode(), f"multipart/form-data; boundary={boundary}"
+    raise ValueError(f"Unsupported body type {body_type}")
+
+
+def parse_bru(text: str) -> Dict[str, Any]:
+    """
+    Split a .bru file into its blocks.
+
+    Dictionary blocks (`meta { ... }`) become dicts, list blocks
+    (`vars:secret [ ... ]`) lists, and script/json blocks keep their raw text.
+    Entries prefixed with `~` are disabled in Bruno and skipped.
+    """
+    blocks: Dict[str, Any] = {}
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        match = _BLOCK_START.match(lines[i])
+        i += 1
+        if not match:
+            continue
+        name, opener = match.groups()
+        closer = "}" if opener == "{" else "]"
+        content = []
+        while i < len(lines) and lines[i].rstrip() != closer:
+            content.append(lines[i])
+            i += 1
+        i += 1
+
+        if opener == "[":
+            blocks[name] = [l.strip().rstrip(",") for l in content if l.strip()]
+        elif name.startswith(("script", "tests", "docs")) or name in ("body:json", "body:text"):
+            blocks[name] = "\n".join(l[2:] if l.startswith("  ") else l for l in content).strip()
+        else:
+            entries = {}
+            for line in content:
+                key, sep, value = line.strip().partition(":")
+                if sep and key and not key.startswith("~"):
+                    entries[key.strip()] = value.strip()
+            blocks[name] = entries
+    return blocks
+
+
+# `body:` mode of the request block -> (body block, encoding)
+_BRU_BODIES = {
+    "json": ("body:json", "json"),
+    "formUrlEncoded": ("body:form-urlencoded", "form"),
+    "multipartForm": ("body:multipart-form", "multipart"),
+}
+
+
+def request_from_bru(path: str, folder: str, variables: Dict[str, str]) -> Optional[RequestTemplate]:
+    with open(path) as f:
+        blocks = parse_bru(f.read())
+
+    method = next((m for m in HTTP_METHODS if m in blocks), None)
+    if method is None:
+        return None
+
+    http = blocks[method]
+    body_block, body_type = _BRU_BODIES.get(http.get("body", "none"), (None, "none"))
+    body = blocks.get(body_block)
+
+    name = blocks.get("meta", {}).get("name") or os.path.splitext(os.path.basename(path))[0]
+    return RequestTemplate(
+        name=name,
+        folder=folder,
+        method=method.upper(),
+        url=http["url"],
+        headers=blocks.get("headers", {}),
+        body_type=body_type,
+        body=body,
+        auth=http.get("auth", "inherit"),
+        variables=variables,
+    )
+
+
+def request_from_yml(path: str, folder: str, variables: Dict[str, str]) -> Optional[RequestTemplate]:
+    with open(path) as f:
+        document = yaml.safe_load(f) or {}
+
+    http = document.get("http")
+    if not http:
+        return None
+
+    body = http.get("body") or {}
+    body_type = {"json": "json", "form-urlencoded": "form", "multipart-form": "multipart"}.get(
+        body.get("type"), "none"
+    )
+    headers = {h["name"]: h["value"] for h in http.get("headers", []) if not h.get("disabled")}
+
+    return RequestTemplate(
+        name=document.get("info", {}).get("name") or os.path.splitext(os.path.basename(path))[0],
+        folder=folder,
+        method=http["method"].upper(),
+        url=http["url"],
+        headers=headers,
+        body_type=body_type,
+        body=body.get("data"),
+        auth=http.get("auth", "inherit") if isinstance(http.get("auth"), str) else "inherit",
+        variables=variables,
+    )
+
+
+def _folder_variables(folder_path: str) -> Dict[str, str]:
+    bru = os.path.join(folder_path, "folder.bru")
+    if os.path.exists(bru):
+        with open(bru) as f:
+            blocks = parse_bru(f.read())
+        return dict(blocks.get("vars:pre-request", {}))
+
+    yml = os.path.join(folder_path, "opencollection.yml")
+    if os.path.exists(yml):
+        with open(yml) as f:
+            document = yaml.safe_load(f) or {}
+        return {
+            v["name"]: v["value"]
+            for v in document.get("request", {}).get("variables", [])
+        }
+
+    return {}
+
+
+def load_collection(root: str) -> Dict[str, RequestTemplate]:
+    """Load every request of the collection under `root`, keyed by request name."""
+    requests: Dict[str, RequestTemplate] = {}
+    for entry in sorted(os.listdir(root)):
+        folder_path = os.path.join(root, entry)
+        if not os.path.isdir(folder_path) or entry == "environments":
+            continue
+
+        variables = _folder_variables(folder_path)
+        for filename in sorted(os.listdir(folder_path)):
+            path = os.path.join(folder_path, filename)
+            if filename in ("folder.bru", "opencollection.yml"):
+                continue
+            if filename.endswith(".bru"):
+                template = request_from_bru(path, entry, variables)
+            elif filename.endswith((".yml", ".yaml")):
+                template = request_from_yml(path, entry, variables)
+            else:
+                continue
+            if template is not None:
+                requests[template.name] = template
+    return requests
+
+
+def load_environment(path: str) -> Dict[str, str]:
+    with open(path) as f:
+        return dict(parse_bru(f.read()).get("vars", {}))
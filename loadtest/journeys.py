@@ -0,0 +1,182 @@
+"""
+Weighted user journeys built from the collection's requests.
+
+Every virtual user runs ONBOARDING once (register, then create a project, a
+board and a few cards) and afterwards picks one of JOURNEYS at a time,
+proportionally to its weight. Steps refer to requests by their collection
+name; the few endpoints the collection does not document yet (tasks and
+history) are declared in EXTRA_REQUESTS with the same template syntax.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .collection import RequestTemplate
+
+USERS_FOLDER = "User"
+TASKS_FOLDER = "tasks API DOC - 3"
+HISTORY_FOLDER = "history"
+
+Vars = Dict[str, Any]
+
+TASK_STATUSES = ["todo", "in_progress", "done"]
+
+
+@dataclass
+class Step:
+    """
+    One request of a journey.
+
+    `body`, `query` and `params` build the request from the virtual user's
+    variables; `extract` stores values from the JSON response back into them.
+    A failing `optional` step is recorded but does not end the journey.
+    """
+
+    request: str
+    body: Optional[Callable[[Vars], Any]] = None
+    query: Optional[Callable[[Vars], Dict[str, Any]]] = None
+    params: Optional[Callable[[Vars], Dict[str, Any]]] = None
+    extract: Optional[Callable[[Any, Vars], None]] = None
+    expect: Tuple[int, ...] = (200, 201)
+    optional: bool = False
+
+
+@dataclass
+class Journey:
+    name: str
+    weight: int
+    steps: List[Step] = field(default_factory=list)
+
+
+EXTRA_REQUESTS = [
+    RequestTemplate("tasks.tasks_list_get", TASKS_FOLDER, "GET", "{{url}}/tasks/"),
+    RequestTemplate("tasks.task_create_post", TASKS_FOLDER, "POST", "{{url}}/tasks/"),
+    RequestTemplate("tasks.task_update_put", TASKS_FOLDER, "PUT", "{{url}}/tasks/:task_id"),
+    RequestTemplate("events.events_get", HISTORY_FOLDER, "GET", "{{historyUrl}}/events/"),
+]
+
+
+def _store_tokens(data: Any, vars: Vars) -> None:
+    vars["accessToken"] = data["tokens"]["access"]
+    vars["refreshToken"] = data["tokens"]["refresh"]
+    vars["user_id"] = data["user"]["id"]
+
+
+def _credentials(vars: Vars) -> Dict[str, str]:
+    return {"email": vars["email"], "password": vars["password"]}
+
+
+def _new_card(vars: Vars) -> Dict[str, Any]:
+    return {
+        "title": f"Card {vars['rng'].randint(1, 1_000_000)}",
+        "description": "Created by the load test",
+        "user_id": str(vars["user_id"]),
+        "assigned_to": str(vars["user_id"]),
+        "board_id": vars["board_id"],
+        "due_date": "2030-01-01T00:00:00+00:00",
+    }
+
+
+def _pick_card(vars: Vars) -> Dict[str, Any]:
+    return {"task_id": vars["rng"].choice(vars["task_ids"])}
+
+
+def _drag_card(vars: Vars) -> Dict[str, Any]:
+    return {"status": vars["rng"].choice(TASK_STATUSES)}
+
+
+def onboarding(cards_per_board: int) -> Journey:
+    return Journey(
+        name="onboarding",
+        weight=0,
+        steps=[
+            Step(
+                "register",
+                body=lambda v: {
+                    "username": v["username"],
+                    "email": v["email"],
+                    "password": v["password"],
+                    "password_confirm": v["password"],
+                },
+                extract=_store_tokens,
+                # Without the users service the virtual user keeps its synthetic user_id
+                optional=True,
+            ),
+            Step(
+                "projects.project_create_post",
+                body=lambda v: {"name": f"{v['username']} project", "owner_id": v["user_id"]},
+                extract=lambda data, v: v.update(project_id=data["id"]),
+            ),
+            Step(
+                "boards.board_create_post",
+                body=lambda v: {"name": f"{v['username']} board", "project_id": v["project_id"]},
+                extract=lambda data, v: v.update(board_id=data["id"], task_ids=[]),
+            ),
+        ]
+        + [
+            Step(
+                "tasks.task_create_post",
+                body=_new_card,
+                extract=lambda data, v: v["task_ids"].append(data["id"]),
+            )
+            for _ in range(cards_per_board)
+        ],
+    )
+
+
+JOURNEYS = [
+    Journey(
+        "login",
+        weight=1,
+        steps=[
+            Step("login", body=_credentials, extract=_store_tokens),
+            Step("profile"),
+        ],
+    ),
+    Journey(
+        "open_dashboard",
+        weight=4,
+        steps=[
+            Step("profile"),
+            Step("projects.projects_list_get", query=lambda v: {"owner_id": v["user_id"]}),
+            Step("boards.boards_list_get", query=lambda v: {"project_id": v["project_id"]}),
+        ],
+    ),
+    Journey(
+        "open_board",
+        weight=5,
+        steps=[
+            Step("boards.board_get_get", params=lambda v: {"board_id": v["board_id"]}),
+            Step("tasks.tasks_list_get", query=lambda v: {"board_id": v["board_id"]}),
+        ],
+    ),
+    Journey(
+        "drag_cards",
+        weight=3,
+        steps=[
+            Step("tasks.tasks_list_get", query=lambda v: {"board_id": v["board_id"]}),
+            Step("tasks.task_update_put", params=_pick_card, body=_drag_card),
+            Step("tasks.task_update_put", params=_pick_card, body=_drag_card),
+        ],
+    ),
+    Journey(
+        "card_history",
+        weight=2,
+        steps=[
+            Step(
+                "events.events_get",
+                query=lambda v: {"service": "tasks", "user_id": v["user_id"], "limit": 20},
+            ),
+        ],
+    ),
+]
+
+
+def with_weights(journeys: List[Journey], overrides: Dict[str, int]) -> List[Journey]:
+    """Apply `name=weight` overrides; journeys with weight 0 are left out."""
+    unknown = set(overrides) - {j.name for j in journeys}
+    if unknown:
+        raise ValueError(f"Unknown journeys: {', '.join(sorted(unknown))}")
+
+    weighted = [
+        Journey(j.name, overrides.get(j.name, j.weight), j.steps) for j in journeys
+    ]
+    return [j for j in weighted if j.weight > 0]
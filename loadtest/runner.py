@@ -0,0 +1,305 @@
+"""
+Drive virtual users through the journeys and collect per-endpoint latencies.
+
+Every virtual user is a thread with its own keep-alive connections, variables
+and random generator. Samples are kept per thread and merged once the run is
+over, so recording a request never takes a lock.
+"""
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from .collection import RequestTemplate
+from .journeys import HISTORY_FOLDER, Journey, Step
+
+FAILURE_BACKOFF = 0.1
+
+
+@dataclass
+class Target:
+    """Base URLs of the docker-compose stack, one per collection folder."""
+
+    users_url: str = "http://localhost:8000/api"
+    tasks_url: str = "http://localhost:5005/api"
+    history_url: str = "http://localhost:5006"
+
+    def variables(self, folder: str) -> Dict[str, str]:
+        if folder == HISTORY_FOLDER:
+            return {"historyUrl": self.history_url}
+        if folder == "User":
+            return {"baseUrl": self.users_url}
+        return {"baseUrl": self.tasks_url}
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies_ms.extend(other.latencies_ms)
+        self.errors += other.errors
+        self.statuses.update(other.statuses)
+
+
+class StepFailed(Exception):
+    pass
+
+
+class HttpClient:
+    """Keep-alive connections per host, reopened once when the server drops them."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._connections: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        key = (scheme, netloc)
+        if key not in self._connections:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            self._connections[key] = cls(netloc, timeout=self.timeout)
+        return self._connections[key]
+
+    def request(
+        self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]
+    ) -> Tuple[int, bytes]:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def close(self) -> None:
+        for conn in self._connections.values():
+            conn.close()
+
+
+class VirtualUser(threading.Thread):
+    def __init__(
+        self,
+        index: int,
+        requests: Dict[str, RequestTemplate],
+        target: Target,
+        onboarding: Journey,
+        journeys: List[Journey],
+        stop: threading.Event,
+        think_time: float,
+        timeout: float,
+        seed: int,
+    ):
+        super().__init__(name=f"vu-{index}", daemon=True)
+        self.requests = requests
+        self.target = target
+        self.onboarding = onboarding
+        self.journeys = journeys
+        self.stop = stop
+        self.think_time = think_time
+        self.client = HttpClient(timeout)
+        self.rng = random.Random(seed + index)
+
+        run_id = f"{seed}-{index}-{int(time.time())}"
+        self.vars: Dict[str, Any] = {
+            "rng": self.rng,
+            "username": f"loadtest{run_id}".replace("-", "_"),
+            "email": f"loadtest+{run_id}@example.com",
+            "password": "Loadtest@1234",
+            # Used when the users service is not part of the run
+            "user_id": 1_000_000 + index,
+        }
+        self.stats: Dict[str, EndpointStats] = {}
+        self.journey_results: Dict[str, Counter] = {}
+
+    def _run_step(self, step: Step) -> None:
+        template = self.requests[step.request]
+
+        try:
+            variables = {**self.target.variables(template.folder), **self.vars}
+            if step.params:
+                variables.update(step.params(self.vars))
+            method, url, headers, body = template.render(
+                variables,
+                body=step.body(self.vars) if step.body else None,
+                query=step.query(self.vars) if step.query else None,
+            )
+        except (KeyError, IndexError) as e:
+            raise StepFailed(f"{step.request}: missing variable {e}")
+
+        stats = self.stats.setdefault(step.request, EndpointStats())
+        started = time.perf_counter()
+        try:
+            status, payload = self.client.request(method, url, headers, body)
+        except (OSError, http.client.HTTPException) as e:
+            stats.errors += 1
+            stats.statuses["error"] += 1
+            raise StepFailed(f"{step.request}: {e}")
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.statuses[str(status)] += 1
+
+        if status not in step.expect:
+            stats.errors += 1
+            raise StepFailed(f"{step.request}: HTTP {status}")
+
+        if step.extract:
+            try:
+                step.extract(json.loads(payload), self.vars)
+            except (ValueError, KeyError, TypeError) as e:
+                raise StepFailed(f"{step.request}: unexpected response ({e})")
+
+    def _run_journey(self, journey: Journey) -> None:
+        results = self.journey_results.setdefault(journey.name, Counter())
+        for step in journey.steps:
+            if self.stop.is_set():
+                return
+            try:
+                self._run_step(step)
+            except StepFailed:
+                if step.optional:
+                    continue
+                results["failed"] += 1
+                # Keeps a user whose onboarding failed from spinning without sending requests
+                self.stop.wait(FAILURE_BACKOFF)
+                return
+            if self.think_time:
+                self.stop.wait(self.rng.uniform(0, 2 * self.think_time))
+        results["completed"] += 1
+
+    def run(self) -> None:
+        try:
+            self._run_journey(self.onboarding)
+            weights = [j.weight for j in self.journeys]
+            while not self.stop.is_set():
+                self._run_journey(self.rng.choices(self.journeys, weights)[0])
+        finally:
+            self.client.close()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def run_load(
+    requests: Dict[str, RequestTemplate],
+    target: Target,
+    onboarding: Journey,
+    journeys: List[Journey],
+    users: int,
+    duration: float,
+    ramp_up: float = 0.0,
+    think_time: float = 0.0,
+    timeout: float = 10.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Run `users` virtual users for `duration` seconds and return the report.
+
+    Users are started evenly over `ramp_up` seconds; throughput is computed
+    over the whole run, ramp-up included.
+    """
+    stop = threading.Event()
+    vus = [
+        VirtualUser(i, requests, target, onboarding, journeys, stop, think_time, timeout, seed)
+        for i in range(users)
+    ]
+
+    started = time.perf_counter()
+    for i, vu in enumerate(vus):
+        if stop.wait(ramp_up / users * i if users else 0):
+            break
+        vu.start()
+
+    stop.wait(max(0.0, duration - (time.perf_counter() - started)))
+    stop.set()
+    for vu in vus:
+        if vu.ident is not None:
+            vu.join(timeout + 1)
+    elapsed = time.perf_counter() - started
+
+    endpoints: Dict[str, EndpointStats] = {}
+    journey_results: Dict[str, Counter] = {}
+    for vu in vus:
+        for name, stats in vu.stats.items():
+            endpoints.setdefault(name, EndpointStats()).merge(stats)
+        for name, counts in vu.journey_results.items():
+            journey_results.setdefault(name, Counter()).update(counts)
+
+    return {
+        "config": {
+            "users": users,
+            "duration_s": duration,
+            "ramp_up_s": ramp_up,
+            "think_time_s": think_time,
+            "targets": vars(target),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": {
+            name: summarize(stats, elapsed) for name, stats in sorted(endpoints.items())
+        },
+        "journeys": {
+            name: {"completed": c["completed"], "failed": c["failed"]}
+            for name, c in sorted(journey_results.items())
+        },
+    }
+
+
+def summarize(stats: EndpointStats, elapsed: float) -> dict:
+    samples = sorted(stats.latencies_ms)
+    count = sum(stats.statuses.values())
+    return {
+        "requests": count,
+        "errors": stats.errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "max_ms": round(samples[-1], 2) if samples else 0.0,
+        "statuses": dict(stats.statuses),
+    }
+
+
+def format_report(report: dict) -> str:
+    header = (
+        f"{'endpoint':<32} {'reqs':>7} {'errors':>7} {'rps':>8}"
+        f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, s in report["endpoints"].items():
+        lines.append(
+            f"{name:<32} {s['requests']:>7} {s['errors']:>7} {s['throughput_rps']:>8.2f}"
+            f" {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}"
+        )
+
+    total = sum(s["requests"] for s in report["endpoints"].values())
+    lines.append("")
+    lines.append(
+        f"{total} requests in {report['elapsed_s']:.1f}s"
+        f" ({total / report['elapsed_s']:.2f} req/s) with {report['config']['users']} users"
+        if report["elapsed_s"]
+        else f"{total} requests"
+    )
+    for name, j in report["journeys"].items():
+        lines.append(f"  {name:<16} completed {j['completed']:>6}  failed {j['failed']:>6}")
+    return "\n".join(lines)
@@ -1,11 +1,26 @@
 from app.services.event_service import get_event_by_id, get_events
-from fastapi import APIRouter, HTTPException, Query
+from app.services.rollup_service import STATS_DIMENSIONS, get_stats
+from app.services.export_service import (
+    ExportFormat,
+    event_batches,
+    export_filter,
+    ndjson_stream,
+    parquet_stream,
+    pa,
+)
+from app.services.stream_service import hub, sse_events
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional ,List
-from app.schemas.event_schema import EventResponse
+from datetime import datetime
+from app.models.event_rollup import Granularity
+from app.schemas.event_schema import DetailsView, EventResponse, EventsStats, event_responses
 
 
 router = APIRouter(prefix="/events")
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/", response_model=List[EventResponse])
 async def events_get(
@@ -15,23 +30,161 @@ async def events_get(
     user_id: Optional[str] = Query(
         None, description="The user ID associated with the events"
     ),
-    limit: int = Query(50, description="The maximum number of events to return"),
+    since: Optional[datetime] = Query(
+        None, description="Only events at or after this time"
+    ),
+    until: Optional[datetime] = Query(
+        None, description="Only events before this time"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Continue after the previous page, from its {NEXT_CURSOR_HEADER} header",
+    ),
+    limit: int = Query(50, ge=1, le=500, description="The maximum number of events to return"),
     offset: int = Query(
         0,
-        description="The number of events to skip before starting to collect the results",
+        ge=0,
+        deprecated=True,
+        description="The number of events to skip before starting to collect the results; use `cursor` instead",
+    ),
+    details: DetailsView = Query(
+        DetailsView.FULL,
+        description="full, trim (first scalar entries only) or omit the details of each event",
     ),
 ):
     try:
-        events = await get_events(
-            service=service, user_id=user_id, limit=limit, offset=offset
+        page = await get_events(
+            service=service,
+            user_id=user_id,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+            offset=offset,
+            details=details,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # The body stays a plain list; the next page is linked from the headers.
+    # The events are already validated, so they are dumped here directly
+    # instead of going through response_model again
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return Response(
+        content=event_responses.dump_json(page.events, by_alias=True),
+        media_type="application/json",
+        headers=headers,
+    )
 
-        return events
 
+@router.get("/stats", response_model=EventsStats)
+async def events_stats(
+    granularity: Granularity = Query(Granularity.HOUR, description="Bucket size"),
+    since: Optional[datetime] = Query(
+        None, description="Start of the window; defaults to 24 hours or 30 days back"
+    ),
+    until: Optional[datetime] = Query(
+        None, description="End of the window; buckets starting before it are included"
+    ),
+    service: Optional[str] = Query(None, description="Only count events of this service"),
+    action: Optional[str] = Query(None, description="Only count events with this action"),
+    user_id: Optional[str] = Query(None, description="Only count events of this user"),
+    group_by: List[str] = Query(
+        list(STATS_DIMENSIONS),
+        description="Dimensions to count by, out of service, action and user_id",
+    ),
+):
+    unknown = set(group_by) - set(STATS_DIMENSIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Cannot group by {', '.join(sorted(unknown))}"
+        )
+
+    try:
+        return await get_stats(
+            granularity=granularity,
+            since=since,
+            until=until,
+            service=service,
+            action=action,
+            user_id=user_id,
+            group_by=group_by,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export")
+async def events_export(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or parquet"),
+    gzip: bool = Query(False, description="Gzip the NDJSON export into a .ndjson.gz file"),
+    service: Optional[str] = Query(None, description="Only events of this service"),
+    action: Optional[str] = Query(None, description="Only events with this action"),
+    user_id: Optional[str] = Query(None, description="Only events of this user"),
+    since: Optional[datetime] = Query(None, description="Only events at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only events before this time"),
+):
+    """
+    Stream every matching event, oldest first.
+
+    Events are read from the cursor and written out batch by batch, so memory
+    use does not depend on the size of the export.
+    """
+    if format is ExportFormat.PARQUET and pa is None:
+        raise HTTPException(status_code=501, detail="Parquet export is not available")
+
+    batches = event_batches(
+        export_filter(
+            service=service, action=action, user_id=user_id, since=since, until=until
+        )
+    )
+
+    if format is ExportFormat.PARQUET:
+        body, media_type, filename = (
+            parquet_stream(batches),
+            "application/vnd.apache.parquet",
+            "events.parquet",
+        )
+    elif gzip:
+        body, media_type, filename = (
+            ndjson_stream(batches, gzip=True),
+            "application/gzip",
+            "events.ndjson.gz",
+        )
+    else:
+        body, media_type, filename = ndjson_stream(batches), "application/x-ndjson", "events.ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/stream")
+async def events_stream(
+    service: Optional[str] = Query(None, description="Only events of this service"),
+    action: Optional[str] = Query(None, description="Only events with this action"),
+    user_id: Optional[str] = Query(None, description="Only events of this user"),
+):
+    """
+    Server-sent events for every matching event as it is stored.
+
+    Each event is sent as an `event` message whose data is the event as
+    returned by GET /events/{event_id}. A client too slow to keep up misses
+    events rather than holding up the others; how many is reported in a
+    `dropped` message before its next event.
+    """
+    subscription = hub.subscribe(service=service, action=action, user_id=user_id)
+    return StreamingResponse(
+        sse_events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{event_id}", response_model=EventResponse)
 async def events_get_by_id(event_id:str):
 
@@ -42,6 +195,8 @@ async def events_get_by_id(event_id:str):
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
 
-        return event
+        return Response(content=event.model_dump_json(by_alias=True), media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,17 +2,28 @@ from fastapi import FastAPI
 from app.core.config import settings
 from contextlib import asynccontextmanager
 from app.db.database import connect_to_mongo, close_mongo
+from app.services.stream_service import hub, close_event_publisher
 from app.apis.event_api import router as event_router
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware, router as profile_router
+from app.core.metrics import MetricsMiddleware, router as metrics_router
 @asynccontextmanager
 async def lifespan(app:FastAPI):
-    await connect_to_mongo()
+    await connect_to_mongo(sync_indexes=True)
     yield
+    await hub.stop()
+    await close_event_publisher()
     await close_mongo()
     
 
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+# Later middleware wraps earlier ones: the profile covers compression and the
+# metrics cover both
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 
@@ -27,4 +38,6 @@ def read_item(item_id: int, q: str | None = None):
     return {"item_id": item_id, "q": q}
 
 
-app.include_router(event_router)
\ No newline at end of file
+app.include_router(event_router)
+app.include_router(profile_router)
+app.include_router(metrics_router)
\ No newline at end of file
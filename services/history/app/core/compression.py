@@ -0,0 +1,236 @@
+import zlib
+from typing import Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/yaml",
+    "application/javascript",
+    "application/xml",
+)
+
+# Never compressed: SSE must reach the client event by event.
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(max(1, min(level, 9)), zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=max(0, min(level, 11)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(
+            level=max(1, min(level, 22))
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encodings() -> Dict[str, type]:
+    """Encoders in server preference order; brotli and zstd only when installed."""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    qualities = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities
+
+
+def negotiate(header: str, encoders: Dict[str, type]) -> Optional[type]:
+    """Pick the encoder with the highest client q-value, preferring the server order on ties."""
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name, encoder in encoders.items():
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts.
+
+    Responses sent in a single body message are only compressed when they
+    reach `minimum_size`. Streamed responses are compressed chunk by chunk,
+    flushing after each one so clients see data as soon as it is produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        level: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        )
+        self.level = settings.COMPRESSION_LEVEL if level is None else level
+        self.encoders = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoder_class = negotiate(
+            request_headers.get("accept-encoding", ""), self.encoders
+        )
+        responder = _CompressionResponder(
+            send, encoder_class, self.level, self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoder_class, level: int, minimum_size: int):
+        self._send = send
+        self.encoder_class = encoder_class
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+        self.started = False
+
+    def _should_compress(self, headers: Headers) -> bool:
+        status = self.start_message["status"]
+        return (
+            200 <= status
+            and status not in (204, 304)
+            and "content-encoding" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+            and _is_compressible(headers)
+        )
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            if not self._should_compress(headers):
+                self.passthrough = True
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        if not self.started:
+            headers.add_vary_header("Accept-Encoding")
+
+            if self.encoder_class is None or (
+                not more_body and len(body) < self.minimum_size
+            ):
+                self.passthrough = True
+                await self._start()
+                await self._send(message)
+                return
+
+            self.encoder = self.encoder_class(self.level)
+            headers["Content-Encoding"] = self.encoder.name
+            if "content-length" in headers:
+                del headers["content-length"]
+
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._start()
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self._start()
+
+        chunk = self.encoder.compress(body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    async def _start(self) -> None:
+        if not self.started:
+            self.started = True
+            await self._send(self.start_message)
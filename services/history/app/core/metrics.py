@@ -0,0 +1,215 @@
+import os
+import time
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from pymongo.monitoring import ConnectionPoolListener
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+# With PROMETHEUS_MULTIPROC_DIR set (required under pre-fork servers and the
+# prefork Celery pool), every process writes its samples there and /metrics
+# aggregates all of them.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+METRICS_PATH = "/metrics"
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route"],
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+mongo_pool_checkout_seconds = Histogram(
+    "mongo_pool_checkout_seconds",
+    "Time spent waiting for a connection from the MongoDB pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+mongo_pool_checkout_failures_total = Counter(
+    "mongo_pool_checkout_failures_total",
+    "MongoDB pool checkouts that failed",
+    ["reason"],
+)
+mongo_pool_connections_in_use = Gauge(
+    "mongo_pool_connections_in_use",
+    "Connections currently checked out of the MongoDB pool",
+    multiprocess_mode="livesum",
+)
+mongo_pool_connections_open = Gauge(
+    "mongo_pool_connections_open",
+    "Connections currently open in the MongoDB pool",
+    multiprocess_mode="livesum",
+)
+
+celery_tasks_consumed_total = Counter(
+    "celery_tasks_consumed_total",
+    "Celery tasks run by this worker",
+    ["task", "outcome"],
+)
+celery_task_duration_seconds = Histogram(
+    "celery_task_duration_seconds",
+    "Time spent running Celery tasks",
+    ["task"],
+)
+
+history_events_ingested_total = Counter(
+    "history_events_ingested_total",
+    "History events taken off the queue, by what became of them",
+    ["outcome"],
+)
+history_batch_size = Histogram(
+    "history_batch_size",
+    "Events written per insert_many batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+
+def registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency and in-flight requests.
+
+    Routes are labelled with their path template (e.g. /events/{event_id}),
+    which is only known once routing ran, never the raw path. Add it last so it
+    is the outermost middleware and the timings include the others.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            label = getattr(route, "path", UNMATCHED_ROUTE)
+            http_request_duration_seconds.labels(method, label).observe(
+                time.perf_counter() - started
+            )
+            http_requests_total.labels(method, label, status).inc()
+            http_requests_in_progress.labels(method).dec()
+
+
+class MongoPoolMetrics(ConnectionPoolListener):
+    """Pool listener exporting checkout wait, failures and connection counts."""
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        mongo_pool_checkout_failures_total.labels(event.reason).inc()
+        mongo_pool_checkout_seconds.observe(event.duration)
+
+    def connection_checked_out(self, event):
+        mongo_pool_checkout_seconds.observe(event.duration)
+        mongo_pool_connections_in_use.inc()
+
+    def connection_checked_in(self, event):
+        mongo_pool_connections_in_use.dec()
+
+    def connection_created(self, event):
+        mongo_pool_connections_open.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongo_pool_connections_open.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+def install_worker_metrics() -> None:
+    """
+    Count and time the tasks run by a Celery worker.
+
+    The worker has no HTTP server of its own, so with METRICS_WORKER_PORT set
+    the main process serves the aggregated metrics of its pool on that port.
+    """
+    from celery import signals
+
+    started = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def task_started(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    @signals.task_postrun.connect(weak=False)
+    def task_finished(task_id=None, task=None, state=None, **kwargs):
+        began = started.pop(task_id, None)
+        if began is not None:
+            celery_task_duration_seconds.labels(task.name).observe(
+                time.perf_counter() - began
+            )
+        celery_tasks_consumed_total.labels(task.name, (state or "unknown").lower()).inc()
+
+    @signals.worker_init.connect(weak=False)
+    def serve_metrics(**kwargs):
+        if settings.METRICS_WORKER_PORT:
+            start_http_server(settings.METRICS_WORKER_PORT, registry=registry())
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def drop_live_gauges(pid=None, **kwargs):
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(pid or os.getpid())
+
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get(METRICS_PATH)
+def metrics():
+    return Response(generate_latest(registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import random
+import secrets
+import time
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+PROFILE_HEADER = "x-profile-request"
+PROFILES_PATH = "/profiles"
+
+FORMATS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "html": (".html", "text/html"),
+}
+
+# Streams stay open for as long as the client reads them, so a sampled profile
+# would cover the whole connection. They are only profiled when signed.
+STREAMING_PATHS = ("/events/stream", "/events/export")
+STREAMING_MEDIA_TYPES = ("text/event-stream",)
+
+
+# sign, profile_request_token, verify_request_token and ProfileStore are the
+# same in the tasks, history and users services. Each service is built from
+# its own directory and cannot import the others, so the code is copied; the
+# tasks tests check that the copies stay identical.
+def sign(secret: str, value: str) -> str:
+    return hmac.new(secret.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def profile_request_token(secret: Optional[str] = None, ttl: Optional[int] = None) -> str:
+    """Build a value for the X-Profile-Request header, valid for `ttl` seconds."""
+    secret = secret or settings.PROFILE_SECRET
+    expires = str(int(time.time()) + (ttl or settings.PROFILE_SIGNATURE_TTL))
+    return f"{expires}.{sign(secret, expires)}"
+
+
+def verify_request_token(token: str, secret: str, max_ttl: int) -> bool:
+    """Accept unexpired tokens signed with `secret` whose expiry is at most `max_ttl` away."""
+    if not secret or not token:
+        return False
+
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or not hmac.compare_digest(sign(secret, expires), signature):
+        return False
+
+    now = time.time()
+    return now <= int(expires) <= now + max_ttl
+
+
+class ProfileStore:
+    """Profiles on local disk, keeping only the newest `max_files`."""
+
+    def __init__(self, directory: str, max_files: int, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {fmt}")
+        self.directory = directory
+        self.max_files = max_files
+        self.suffix, self.mimetype = FORMATS[fmt]
+        self.fmt = fmt
+
+    @classmethod
+    def from_settings(cls) -> "ProfileStore":
+        return cls(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES, settings.PROFILE_FORMAT)
+
+    def save(self, profile_id: str, profiler) -> None:
+        renderer = SpeedscopeRenderer() if self.fmt == "speedscope" else HTMLRenderer()
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(profile_id)
+        with open(f"{path}.tmp", "w") as f:
+            f.write(profiler.output(renderer=renderer))
+        os.replace(f"{path}.tmp", path)
+
+        self.prune()
+
+    def prune(self) -> None:
+        profiles = sorted(
+            entry for entry in os.listdir(self.directory) if entry.endswith(self.suffix)
+        )
+        # Ids start with a nanosecond timestamp, so name order is age order
+        for entry in profiles[: max(0, len(profiles) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, entry))
+            except FileNotFoundError:
+                pass
+
+    def path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, profile_id + self.suffix)
+
+
+# End of the code shared between the services
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests with pyinstrument when asked to.
+
+    A request is profiled when it carries a valid signed X-Profile-Request header
+    (see `profile_request_token`) or is picked by PROFILE_SAMPLE_RATE. Sampling
+    skips streaming routes and responses. The profile is written to PROFILE_DIR,
+    off the event loop, once the response is sent and linked from the
+    response's `Link` header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.store = ProfileStore.from_settings()
+
+    def _is_signed(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_HEADER, "")
+        return verify_request_token(token, settings.PROFILE_SECRET, settings.PROFILE_SIGNATURE_TTL)
+
+    def _is_sampled(self, scope: Scope) -> bool:
+        if scope["path"].startswith(STREAMING_PATHS):
+            return False
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            Profiler is None
+            or scope["type"] != "http"
+            or scope["path"].startswith(PROFILES_PATH)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        signed = self._is_signed(scope)
+        if not signed and not self._is_sampled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.time_ns()}-{secrets.token_hex(4)}"
+        signature = sign(settings.PROFILE_SECRET, profile_id)
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL, async_mode="enabled")
+        discarded = False
+
+        async def send_with_link(message: Message) -> None:
+            nonlocal discarded
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if not signed and headers.get("content-type", "").startswith(
+                    STREAMING_MEDIA_TYPES
+                ):
+                    discarded = True
+                    profiler.stop()
+                else:
+                    headers.append("X-Profile-Id", profile_id)
+                    headers.append(
+                        "Link", f'<{PROFILES_PATH}/{profile_id}?sig={signature}>; rel="profile"'
+                    )
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_link)
+        finally:
+            if profiler.is_running:
+                profiler.stop()
+            if not discarded:
+                # Rendering and writing the profile would otherwise block the loop
+                await asyncio.to_thread(self.store.save, profile_id, profiler)
+
+
+router = APIRouter(prefix=PROFILES_PATH, include_in_schema=False)
+
+
+@router.get("/{profile_id}")
+async def profile_get(profile_id: str, sig: str = Query("")):
+    if not settings.PROFILE_SECRET or not hmac.compare_digest(
+        sign(settings.PROFILE_SECRET, profile_id), sig
+    ):
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    store = ProfileStore.from_settings()
+    path = store.path(profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(path, media_type=store.mimetype)
@@ -0,0 +1,120 @@
+import os
+import time
+from typing import Optional
+from opentelemetry import context, propagate, trace
+from opentelemetry.propagators.textmap import Getter
+from opentelemetry.trace import SpanKind
+from app.core.config import settings
+
+# Set by the publisher next to the trace context so the consumer can tell how
+# long the message sat in the queue
+PUBLISHED_AT_HEADER = "published_at_ns"
+
+HISTORY_QUEUE = "history"
+
+# configure_tracing, _build_exporter and tracer are the same in the history and
+# users services. Each service is built from its own directory and cannot import
+# the other, so the code is copied; the history tests check that the copies stay
+# identical.
+_provider = None
+
+
+def configure_tracing(span_exporter=None) -> None:
+    """
+    Install the OpenTelemetry SDK for this process.
+
+    Spans are exported to an OTLP collector (TRACING_EXPORTER="otlp") or
+    appended as JSON lines to TRACING_FILE (TRACING_EXPORTER="file"). With
+    TRACING_EXPORTER empty nothing is installed and spans are no-ops.
+    """
+    global _provider
+
+    if span_exporter is None and (_provider is not None or not settings.TRACING_EXPORTER):
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME})
+    )
+    if span_exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    else:
+        # The batch processor restarts its export thread in forked pool workers
+        provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+
+    _provider = provider
+    trace.set_tracer_provider(provider)
+
+
+def _build_exporter():
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+    if settings.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter(
+            out=open(settings.TRACING_FILE, "a"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+
+    raise ValueError(f"Unknown tracing exporter {settings.TRACING_EXPORTER}")
+
+
+def tracer() -> trace.Tracer:
+    if _provider is not None:
+        return _provider.get_tracer(__name__)
+    return trace.get_tracer(__name__)
+
+
+# End of the code shared between the services
+
+
+def flush_tracing() -> None:
+    """Export buffered spans; pool processes exit without running atexit hooks."""
+    if _provider is not None:
+        _provider.force_flush()
+
+
+class _TaskRequestGetter(Getter):
+    """Reads trace headers from a Celery task request, where custom message
+    headers end up as attributes (or in `request_dict` for batched requests)."""
+
+    def get(self, carrier, key: str) -> Optional[list]:
+        value = getattr(carrier, key, None)
+        for headers in ("headers", "request_dict"):
+            if value is None:
+                value = (getattr(carrier, headers, None) or {}).get(key)
+        return [value] if value is not None else None
+
+    def keys(self, carrier) -> list:
+        return []
+
+
+def extract_task_context(request) -> context.Context:
+    return propagate.extract(request, getter=_TaskRequestGetter())
+
+
+def record_queue_wait(request, parent: context.Context) -> None:
+    """Add a span covering the time between publish and the worker picking the message up."""
+    published_at = _TaskRequestGetter().get(request, PUBLISHED_AT_HEADER)
+    if not published_at:
+        return
+
+    started = int(published_at[0])
+    span = tracer().start_span(
+        f"{HISTORY_QUEUE} wait",
+        context=parent,
+        kind=SpanKind.CONSUMER,
+        start_time=started,
+        attributes={
+            "messaging.system": "rabbitmq",
+            "messaging.destination.name": HISTORY_QUEUE,
+        },
+    )
+    span.end(end_time=max(started, time.time_ns()))
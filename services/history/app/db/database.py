@@ -1,20 +1,60 @@
+from typing import Optional
 from app.core.config import settings
 from beanie import init_beanie
 from pymongo import AsyncMongoClient
 from app.models.event import Event
+from app.models.event_rollup import EventRollup
+from app.core.metrics import MongoPoolMetrics
 
+# One pooled client per process (the API lifespan or a Celery worker process),
+# shared by every request or task it serves
+_client: Optional[AsyncMongoClient] = None
 
-async def connect_to_mongo():
-    client = AsyncMongoClient(host=settings.MONGO_DB_URL, authSource="admin")
+
+async def connect_to_mongo(sync_indexes: bool = False) -> AsyncMongoClient:
+    """
+    Connect the process's client and initialise Beanie on it.
+
+    With `sync_indexes`, the indexes declared on the documents are created when
+    missing; undeclared ones are only dropped with MONGO_DROP_UNDECLARED_INDEXES.
+    """
+    global _client
+
+    if _client is not None:
+        return _client
+
+    client = AsyncMongoClient(
+        host=settings.MONGO_DB_URL,
+        authSource="admin",
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        event_listeners=[MongoPoolMetrics()],
+    )
     database = client.get_database(settings.MONGO_DB_NAME)
     print(f"connecting to {settings.MONGO_DB_NAME}")
-    await init_beanie(database=database,document_models=[Event])
+    try:
+        await init_beanie(
+            database=database,
+            document_models=[Event, EventRollup],
+            skip_indexes=not sync_indexes,
+            allow_index_dropping=settings.MONGO_DROP_UNDECLARED_INDEXES,
+        )
+    except Exception:
+        await client.close()
+        raise
     print("MongoDB connection established")
-    
-    
+
+    _client = client
+    return client
+
+
 async def close_mongo():
-    
-    client = AsyncMongoClient(settings.MONGO_DB_URL)
+    global _client
+
+    if _client is None:
+        return
+
+    client, _client = _client, None
     print("Closing MongoDB connection...")
     await client.close()
-    print("MongoDB connection closed")
\ No newline at end of file
+    print("MongoDB connection closed")
@@ -1,9 +1,12 @@
 from beanie import Document
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime , timezone
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Event(Document):
     
+    # Assigned by the producer; the same event is only ever stored once
+    event_id: Optional[str] = None
     service: str
     action: str
     user_id: str
@@ -12,4 +15,25 @@ class Event(Document):
     
     class Settings:
         name =  "events"
+        # Synced when the API and the workers start. Each filter of
+        # `events_query` has an index ending in (timestamp, _id), so pages are
+        # read in order instead of sorted in memory.
+        indexes = [
+            IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id"),
+            IndexModel(
+                [("service", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                name="service_timestamp_id",
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                name="user_id_timestamp_id",
+            ),
+            # Partial, so events stored before producers sent ids don't collide
+            IndexModel(
+                [("event_id", ASCENDING)],
+                name="event_id_unique",
+                unique=True,
+                partialFilterExpression={"event_id": {"$type": "string"}},
+            ),
+        ]
     
@@ -0,0 +1,38 @@
+from beanie import Document
+from datetime import datetime
+from enum import Enum
+from pymongo import ASCENDING, IndexModel
+
+
+class Granularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class EventRollup(Document):
+    """Number of events of one service/action/user within one hour or day."""
+
+    granularity: Granularity
+    bucket: datetime
+    service: str
+    action: str
+    user_id: str
+    # Not `count`, which would shadow Document.count()
+    total: int = 0
+
+    class Settings:
+        name = "event_rollups"
+        indexes = [
+            # Target of the ingestion upserts and of the stats range scans
+            IndexModel(
+                [
+                    ("granularity", ASCENDING),
+                    ("bucket", ASCENDING),
+                    ("service", ASCENDING),
+                    ("action", ASCENDING),
+                    ("user_id", ASCENDING),
+                ],
+                name="rollup_key",
+                unique=True,
+            ),
+        ]
@@ -1,25 +1,58 @@
-from pydantic import BaseModel, Field
+from enum import Enum
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from bson import ObjectId as _ObjectId
 from pydantic.functional_validators import BeforeValidator
+from typing import List, Optional
 from typing_extensions import Annotated
+from app.models.event_rollup import Granularity
 
 ObjectId = Annotated[str, BeforeValidator(lambda v: str(v) if isinstance(v, _ObjectId) else v)]
 
 class EventCreate(BaseModel):
+    event_id: Optional[str] = Field(None, min_length=1, max_length=128)
     service: str = Field(...)
     action: str = Field(...)
     user_id: str = Field(...)
     details: dict = Field(...)
 
 
+class DetailsView(str, Enum):
+    """How much of `details` list views return."""
+
+    FULL = "full"
+    # Only the first scalar entries; nested objects and arrays are left out
+    TRIM = "trim"
+    OMIT = "omit"
+
+
 class EventResponse(BaseModel):
     id: ObjectId = Field(..., alias="_id")
+    event_id: Optional[str] = Field(None)
     service: str = Field(...)
     action: str = Field(...)
     user_id: str = Field(...)
-    details: dict = Field(...)
+    # None when omitted from a list view
+    details: Optional[dict] = Field(None)
     timestamp: datetime = Field(...)
 
+# Validates raw event documents and dumps them to JSON in one pass each
+event_responses = TypeAdapter(List[EventResponse])
+
+class EventsPage(BaseModel):
+    events: List[EventResponse] = Field(...)
+    next_cursor: Optional[str] = Field(None)
+
+class StatsBucket(BaseModel):
+    bucket: datetime = Field(...)
+    service: Optional[str] = Field(None)
+    action: Optional[str] = Field(None)
+    user_id: Optional[str] = Field(None)
+    count: int = Field(...)
+
 class EventsStats(BaseModel):
-    pass
\ No newline at end of file
+    granularity: Granularity = Field(...)
+    since: datetime = Field(...)
+    until: datetime = Field(...)
+    group_by: List[str] = Field(...)
+    buckets: List[StatsBucket] = Field(...)
@@ -0,0 +1,156 @@
+import gzip
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Dict, List, Optional
+from bson import json_util
+from app.core.config import settings
+from app.models.event import Event
+
+logger = getLogger(__name__)
+
+
+class RetentionPolicy:
+    """
+    How long events are kept, in days, by "service:action", then "service",
+    then the default. 0 keeps events forever.
+    """
+
+    def __init__(self, rules: Dict[str, int], default_days: int = 0):
+        self.default_days = default_days
+        self.action_rules = {}
+        self.service_rules = {}
+        for key, days in rules.items():
+            service, _, action = key.partition(":")
+            if action:
+                self.action_rules[(service, action)] = days
+            else:
+                self.service_rules[service] = days
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        return cls(settings.RETENTION_RULES, settings.RETENTION_DEFAULT_DAYS)
+
+    def days_for(self, service: str, action: str) -> int:
+        if (service, action) in self.action_rules:
+            return self.action_rules[(service, action)]
+        return self.service_rules.get(service, self.default_days)
+
+    def expired_filters(self, now: datetime) -> List[dict]:
+        """
+        One query filter per rule, matching the events it has expired.
+
+        Each event is matched by its most specific rule only, so a longer
+        "service:action" retention is not cut short by its service's rule.
+        """
+        filters = []
+
+        def cutoff(days: int) -> dict:
+            return {"timestamp": {"$lt": now - timedelta(days=days)}}
+
+        for (service, action), days in self.action_rules.items():
+            if days:
+                filters.append({"service": service, "action": action, **cutoff(days)})
+
+        for service, days in self.service_rules.items():
+            if days:
+                overridden = [a for s, a in self.action_rules if s == service]
+                filters.append(
+                    {"service": service, "action": {"$nin": overridden}, **cutoff(days)}
+                )
+
+        if self.default_days:
+            default = cutoff(self.default_days)
+            if self.service_rules:
+                default["service"] = {"$nin": list(self.service_rules)}
+            if self.action_rules:
+                default["$nor"] = [
+                    {"service": service, "action": action}
+                    for service, action in self.action_rules
+                ]
+            filters.append(default)
+
+        return filters
+
+
+class DailyArchive:
+    """
+    Gzipped JSON-lines files under `directory`, partitioned by the day of the
+    event: `day=YYYY-MM-DD/events-<first id>-<last id>.jsonl.gz`.
+
+    File names come from the archived ids, so a batch archived again after a
+    crash (before its events were deleted) replaces its earlier file.
+    """
+
+    def __init__(self, directory: str, compression_level: int = 6):
+        self.directory = directory
+        self.compression_level = compression_level
+
+    def write(self, documents: List[dict]) -> List[str]:
+        by_day = defaultdict(list)
+        for document in documents:
+            by_day[document["timestamp"].strftime("%Y-%m-%d")].append(document)
+
+        paths = []
+        for day, day_documents in sorted(by_day.items()):
+            partition = os.path.join(self.directory, f"day={day}")
+            os.makedirs(partition, exist_ok=True)
+            path = os.path.join(
+                partition,
+                f"events-{day_documents[0]['_id']}-{day_documents[-1]['_id']}.jsonl.gz",
+            )
+
+            with gzip.open(f"{path}.tmp", "wt", compresslevel=self.compression_level) as f:
+                for document in day_documents:
+                    f.write(json_util.dumps(document, json_options=json_util.RELAXED_JSON_OPTIONS))
+                    f.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{path}.tmp", path)
+            paths.append(path)
+
+        return paths
+
+
+async def archive_expired_events(
+    now: Optional[datetime] = None,
+    policy: Optional[RetentionPolicy] = None,
+    archive: Optional[DailyArchive] = None,
+    batch_size: Optional[int] = None,
+    collection=None,
+) -> int:
+    """
+    Move the events past their retention into the archive, then delete them.
+
+    Events are taken oldest first in batches. A batch is only deleted once its
+    archive files are on disk, so a failure leaves the events in place for the
+    next run.
+
+    Returns:
+        int: The number of events archived
+    """
+    now = now or datetime.now(timezone.utc)
+    policy = policy or RetentionPolicy.from_settings()
+    archive = archive or DailyArchive(settings.ARCHIVE_DIR)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    collection = collection if collection is not None else Event.get_pymongo_collection()
+
+    archived = 0
+    for expired in policy.expired_filters(now):
+        while True:
+            documents = await collection.find(
+                expired, sort=[("timestamp", 1), ("_id", 1)], limit=batch_size
+            ).to_list()
+            if not documents:
+                break
+
+            paths = archive.write(documents)
+            await collection.delete_many({"_id": {"$in": [d["_id"] for d in documents]}})
+            archived += len(documents)
+            logger.info(f"Archived {len(documents)} events to {', '.join(paths)}")
+
+            if len(documents) < batch_size:
+                break
+
+    return archived
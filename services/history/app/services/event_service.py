@@ -1,51 +1,317 @@
 from app.models.event import Event
-from app.schemas.event_schema import EventCreate, EventsStats, EventResponse
-from typing import Optional
-from datetime import datetime, timezone
+from app.schemas.event_schema import (
+    DetailsView,
+    EventCreate,
+    EventsPage,
+    EventsStats,
+    EventResponse,
+    event_responses,
+)
+from typing import Dict, List, Optional, Tuple
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from app.db.database import connect_to_mongo
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.services.rollup_service import record_rollups
+from app.services.stream_service import publish_events
+from opentelemetry.trace import SpanKind
+from logging import getLogger
 
-async def get_events(
+logger = getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def encode_cursor(event: EventResponse) -> str:
+    """Opaque position after `event` in the newest-first order: its timestamp in ms and id."""
+    timestamp = event.timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    millis = (timestamp - EPOCH) // timedelta(milliseconds=1)
+    return urlsafe_b64encode(f"{millis}:{event.id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        millis, _, event_id = (
+            urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().partition(":")
+        )
+        return EPOCH + timedelta(milliseconds=int(millis)), ObjectId(event_id)
+    except (ValueError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def events_query(
     service: Optional[str] = None,
     user_id: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, ObjectId]] = None,
 ):
+    """
+    Newest-first events, optionally filtered by service and/or user.
+
+    Every filter shape is served by one of the indexes declared on `Event`
+    without an in-memory sort; `index_test.py` checks the query plans.
+    `since` is inclusive and `until` exclusive. `after` is a decoded cursor:
+    only events older than that (timestamp, id) position are returned.
+    """
     filters = []
 
     if service:
         filters.append(Event.service == service)
     if user_id:
         filters.append(Event.user_id == user_id)
+    if since:
+        filters.append(Event.timestamp >= since)
+    if until:
+        filters.append(Event.timestamp < until)
+    if after:
+        timestamp, event_id = after
+        # A plain range keeps this a single index scan; only the events sharing
+        # the cursor's timestamp (one ingestion batch at most) are filtered out
+        filters.append(Event.timestamp <= timestamp)
+        filters.append({"$nor": [{"timestamp": timestamp, "_id": {"$gte": event_id}}]})
         
-    query = Event.find(*filters)
+    return Event.find(*filters).sort(-Event.timestamp, -Event.id)
+
+
+def details_projection(details: DetailsView = DetailsView.FULL) -> Optional[dict]:
+    """
+    The find projection for a `details` view, applied by the server so the
+    left-out parts of `details` are never sent over the wire.
+    """
+    if details is DetailsView.OMIT:
+        return {"details": 0}
+    if details is DetailsView.TRIM:
+        scalar_entries = {
+            "$filter": {
+                "input": {"$objectToArray": "$details"},
+                "cond": {"$not": [{"$in": [{"$type": "$$this.v"}, ["object", "array"]]}]},
+            }
+        }
+        return {
+            "event_id": 1,
+            "service": 1,
+            "action": 1,
+            "user_id": 1,
+            "timestamp": 1,
+            "details": {
+                "$arrayToObject": {
+                    "$slice": [scalar_entries, settings.EVENTS_DETAILS_TRIM_KEYS]
+                }
+            },
+        }
+    return None
 
-    events = await query.sort(-Event.timestamp).skip(offset).limit(limit).to_list()
-    
-    return [EventResponse(**event.model_dump(by_alias=True)) for event in events]
 
+async def get_events(
+    service: Optional[str] = None,
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    details: DetailsView = DetailsView.FULL,
+    collection=None,
+) -> EventsPage:
+    """
+    One page of events, newest first.
+
+    Pass the returned `next_cursor` back as `cursor` for the following page;
+    it is None on the last one. Raises ValueError for a malformed cursor.
 
-async def get_event_by_id(event_id: str):
+    The query is built by `events_query`, but run on the raw collection: the
+    documents are validated straight into `EventResponse` without building
+    `Event` documents first.
+    """
+    query = events_query(
+        service=service,
+        user_id=user_id,
+        since=since,
+        until=until,
+        after=decode_cursor(cursor) if cursor else None,
+    )
+    collection = collection if collection is not None else Event.get_pymongo_collection()
+
+    # One extra event tells whether there is a next page
+    documents = await collection.find(
+        query.get_filter_query(),
+        projection=details_projection(details),
+        sort=query.sort_expressions,
+        skip=offset,
+        limit=limit + 1,
+    ).to_list()
+
+    page = event_responses.validate_python(documents[:limit])
+    next_cursor = encode_cursor(page[-1]) if page and len(documents) > limit else None
 
-    event = await Event.get(event_id)
+    return EventsPage(events=page, next_cursor=next_cursor)
 
-    if not event:
+
+async def get_event_by_id(event_id: str, collection=None) -> Optional[EventResponse]:
+    try:
+        object_id = ObjectId(event_id)
+    except (InvalidId, TypeError):
         return None
 
-    return EventResponse(**event.model_dump(by_alias=True))
+    collection = collection if collection is not None else Event.get_pymongo_collection()
+    document = await collection.find_one({"_id": object_id})
+
+    if not document:
+        return None
+
+    return EventResponse.model_validate(document)
 
 
 async def create_event(event_data: dict):
-    
-    event_create = EventCreate(**event_data)
-
-    event = Event(
-        service=event_create.service,
-        action=event_create.action,
-        user_id=event_create.user_id,
-        details=event_create.details,
-        timestamp=datetime.now(timezone.utc),
-    )
 
-    await event.insert()
+    with tracer().start_as_current_span("create_event"):
+        event_create = EventCreate(**event_data)
+
+        event = Event(
+            event_id=event_create.event_id,
+            service=event_create.service,
+            action=event_create.action,
+            user_id=event_create.user_id,
+            details=event_create.details,
+            timestamp=datetime.now(timezone.utc),
+        )
+
+        with tracer().start_as_current_span(
+            "events insert",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "mongodb",
+                "db.operation.name": "insert",
+                "db.collection.name": "events",
+            },
+        ):
+            try:
+                await event.insert()
+            except DuplicateKeyError:
+                # Already stored by an earlier delivery of the same event
+                existing = await Event.find_one(Event.event_id == event_create.event_id)
+                if existing is None:
+                    raise
+                return str(existing.id)
+
+        await _update_rollups([event])
+        await publish_events([event])
+
+        return str(event.id)
+
+
+async def _update_rollups(events: List[Event]) -> None:
+    # Only events stored just now are counted, so redeliveries don't inflate
+    # the rollups. The events are already durable, so a failure here must not
+    # fail their batch; the stats of the current bucket come from the raw
+    # events anyway, and closed buckets left short are rebuilt by the
+    # repair-rollups job (see repair_recent_rollups).
+    try:
+        await record_rollups(events)
+    except Exception as e:
+        logger.error(f"Failed to update event rollups: {e}", exc_info=True)
+
+
+def _is_duplicate_event(error: dict) -> bool:
+    return error.get("code") == 11000 and "event_id" in (error.get("keyPattern") or {})
+
+
+
+@dataclass
+class BatchInsertResult:
+    inserted_ids: List[str] = field(default_factory=list)
+    # Events whose event id was already stored, by an earlier delivery or
+    # earlier in the same batch
+    duplicates: int = 0
+    # Position in the batch -> why that event was not stored
+    failed: Dict[int, str] = field(default_factory=dict)
+
+
+async def create_events(events_data: List[dict]) -> BatchInsertResult:
+    """
+    Store a batch of events with a single unordered `insert_many`.
+
+    Events whose `event_id` is already stored are skipped and counted in
+    `duplicates`, so a redelivered batch is safe to write again. Events that
+    fail validation or are rejected by the server are reported in `failed`
+    without affecting the rest of the batch. Any other error (network, write
+    concern) is raised, as nothing in the batch can be assumed stored.
+    """
+
+    result = BatchInsertResult()
+    events, positions = [], []
+    now = datetime.now(timezone.utc)
+
+    with tracer().start_as_current_span(
+        "create_events", attributes={"events.batch_size": len(events_data)}
+    ):
+        for position, event_data in enumerate(events_data):
+            try:
+                event_create = EventCreate(**event_data)
+            except (TypeError, ValidationError) as e:
+                result.failed[position] = f"{e}"
+                continue
+
+            # Ids are assigned here so the stored ones are known even when part
+            # of the batch is rejected
+            events.append(
+                Event(
+                    id=ObjectId(),
+                    event_id=event_create.event_id,
+                    service=event_create.service,
+                    action=event_create.action,
+                    user_id=event_create.user_id,
+                    details=event_create.details,
+                    timestamp=now,
+                )
+            )
+            positions.append(position)
+
+        if not events:
+            return result
+
+        rejected, duplicates = {}, set()
+        with tracer().start_as_current_span(
+            "events insert_many",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "mongodb",
+                "db.operation.name": "insert_many",
+                "db.collection.name": "events",
+                "db.operation.batch.size": len(events),
+            },
+        ):
+            try:
+                await Event.insert_many(events, ordered=False)
+            except BulkWriteError as e:
+                if e.details.get("writeConcernErrors"):
+                    raise
+                for error in e.details.get("writeErrors", []):
+                    if _is_duplicate_event(error):
+                        duplicates.add(error["index"])
+                    else:
+                        rejected[error["index"]] = error.get("errmsg", "write error")
+
+        result.duplicates = len(duplicates)
+        stored = []
+        for index, event in enumerate(events):
+            if index in duplicates:
+                continue
+            if index in rejected:
+                result.failed[positions[index]] = rejected[index]
+            else:
+                result.inserted_ids.append(str(event.id))
+                stored.append(event)
+
+        await _update_rollups(stored)
+        await publish_events(stored)
 
-    return str(event.id)
+        return result
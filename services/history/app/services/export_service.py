@@ -0,0 +1,194 @@
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, List, Optional
+from app.core.compression import GzipEncoder
+from app.core.config import settings
+from app.models.event import Event
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+def export_filter(
+    service: Optional[str] = None,
+    action: Optional[str] = None,
+    user_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    query = {}
+    if service:
+        query["service"] = service
+    if action:
+        query["action"] = action
+    if user_id:
+        query["user_id"] = user_id
+    if since or until:
+        query["timestamp"] = {}
+        if since:
+            query["timestamp"]["$gte"] = since
+        if until:
+            query["timestamp"]["$lt"] = until
+    return query
+
+
+async def event_batches(
+    query: dict, batch_size: Optional[int] = None, collection=None
+) -> AsyncIterator[List[dict]]:
+    """
+    Raw event documents matching `query`, oldest first, `batch_size` at a time.
+
+    Documents are read straight off the cursor without building models, and
+    only one batch is held at a time.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    collection = collection if collection is not None else Event.get_pymongo_collection()
+    cursor = collection.find(query, sort=[("timestamp", 1), ("_id", 1)], batch_size=batch_size)
+
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _timestamp(document: dict) -> datetime:
+    timestamp = document["timestamp"]
+    # Mongo hands datetimes back naive, in UTC
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+def _ndjson_line(document: dict) -> str:
+    return json.dumps(
+        {
+            "_id": str(document["_id"]),
+            "event_id": document.get("event_id"),
+            "service": document["service"],
+            "action": document["action"],
+            "user_id": document["user_id"],
+            "details": document.get("details", {}),
+            "timestamp": _timestamp(document).isoformat(),
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+async def ndjson_stream(
+    batches: AsyncIterator[List[dict]], gzip: bool = False
+) -> AsyncIterator[bytes]:
+    """One chunk per batch; gzip members are flushed per chunk so nothing waits for the end."""
+    encoder = GzipEncoder(settings.COMPRESSION_LEVEL) if gzip else None
+
+    async for batch in batches:
+        chunk = "".join(f"{_ndjson_line(document)}\n" for document in batch).encode()
+        yield encoder.compress(chunk) if encoder else chunk
+
+    if encoder:
+        yield encoder.finish()
+
+
+class _ChunkSink:
+    """Write-only file that hands over whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+PARQUET_SCHEMA = (
+    pa.schema(
+        [
+            ("_id", pa.string()),
+            ("event_id", pa.string()),
+            ("service", pa.string()),
+            ("action", pa.string()),
+            ("user_id", pa.string()),
+            # Free-form per event, so kept as a JSON document
+            ("details", pa.string()),
+            ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ]
+    )
+    if pa is not None
+    else None
+)
+
+
+def _row_group(documents: List[dict]):
+    return pa.Table.from_pydict(
+        {
+            "_id": [str(d["_id"]) for d in documents],
+            "event_id": [d.get("event_id") for d in documents],
+            "service": [d["service"] for d in documents],
+            "action": [d["action"] for d in documents],
+            "user_id": [d["user_id"] for d in documents],
+            "details": [
+                json.dumps(d.get("details", {}), separators=(",", ":"), default=str)
+                for d in documents
+            ],
+            "timestamp": [_timestamp(d) for d in documents],
+        },
+        schema=PARQUET_SCHEMA,
+    )
+
+
+async def parquet_stream(
+    batches: AsyncIterator[List[dict]], row_group_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    A Parquet file written one row group at a time.
+
+    Each row group is sent as soon as it is encoded; the footer that indexes
+    them follows the last one.
+    """
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow installed")
+
+    row_group_size = row_group_size or settings.EXPORT_ROW_GROUP_SIZE
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, PARQUET_SCHEMA, compression="zstd")
+    pending = []
+    try:
+        async for batch in batches:
+            pending += batch
+            if len(pending) >= row_group_size:
+                writer.write_table(_row_group(pending), row_group_size=len(pending))
+                pending = []
+                yield sink.drain()
+        if pending:
+            writer.write_table(_row_group(pending), row_group_size=len(pending))
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,292 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.models.event import Event
+from app.models.event_rollup import EventRollup, Granularity
+from app.services.archive_service import RetentionPolicy
+from app.schemas.event_schema import EventsStats, StatsBucket
+
+STATS_DIMENSIONS = ("service", "action", "user_id")
+
+# Window returned when the caller gives no `since`
+DEFAULT_WINDOWS = {
+    Granularity.HOUR: timedelta(hours=24),
+    Granularity.DAY: timedelta(days=30),
+}
+
+
+def bucket_start(timestamp: datetime, granularity: Granularity) -> datetime:
+    if timestamp.tzinfo is None:
+        # Mongo hands datetimes back naive, in UTC
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity is Granularity.DAY:
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+async def record_rollups(events: Iterable[Event], collection=None) -> None:
+    """
+    Add newly stored events to their hourly and daily rollups.
+
+    Counts are grouped per bucket first, so a batch costs one `$inc` upsert per
+    distinct service/action/user and bucket, sent in a single bulk write.
+    """
+    counts = Counter(
+        (
+            granularity.value,
+            bucket_start(event.timestamp, granularity),
+            event.service,
+            event.action,
+            event.user_id,
+        )
+        for event in events
+        for granularity in Granularity
+    )
+    if not counts:
+        return
+
+    collection = collection if collection is not None else EventRollup.get_pymongo_collection()
+    await collection.bulk_write(
+        [
+            UpdateOne(
+                {
+                    "granularity": granularity,
+                    "bucket": bucket,
+                    "service": service,
+                    "action": action,
+                    "user_id": user_id,
+                },
+                {"$inc": {"total": count}},
+                upsert=True,
+            )
+            for (granularity, bucket, service, action, user_id), count in counts.items()
+        ],
+        ordered=False,
+    )
+
+
+async def rebuild_rollups(
+    granularity: Granularity,
+    since: datetime,
+    until: datetime,
+    now: Optional[datetime] = None,
+    policy: Optional[RetentionPolicy] = None,
+    events=None,
+    rollups=None,
+) -> int:
+    """
+    Recompute the rollups of the buckets in [since, until) from the raw events.
+
+    Ingestion counts events with `$inc` after storing them, so a failed rollup
+    write, or a batch retried after a partial insert (whose stored events are
+    then skipped as duplicates), leaves buckets short. Totals are set rather
+    than incremented, so running this again is harmless.
+
+    Buckets starting before the retention cutoff of their service and action
+    may have lost raw events to the archive, so they are left as they are
+    rather than set to a smaller total. Keys with no raw events left keep
+    their counts too.
+
+    Returns:
+        int: The number of rollups written
+    """
+    now = now or datetime.now(timezone.utc)
+    policy = policy or RetentionPolicy.from_settings()
+    events = events if events is not None else Event.get_pymongo_collection()
+    rows = await _aggregate(
+        events,
+        [
+            {"$match": {"timestamp": {"$gte": since, "$lt": until}}},
+            {
+                "$group": {
+                    "_id": {
+                        "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": granularity.value}},
+                        **{dimension: f"${dimension}" for dimension in STATS_DIMENSIONS},
+                    },
+                    "total": {"$sum": 1},
+                }
+            },
+        ],
+    )
+    rows = [
+        row for row in rows if not _may_be_archived(row["_id"], granularity, now, policy)
+    ]
+    if not rows:
+        return 0
+
+    rollups = rollups if rollups is not None else EventRollup.get_pymongo_collection()
+    await rollups.bulk_write(
+        [
+            UpdateOne(
+                {
+                    "granularity": granularity.value,
+                    "bucket": row["_id"]["bucket"],
+                    **{dimension: row["_id"][dimension] for dimension in STATS_DIMENSIONS},
+                },
+                {"$set": {"total": row["total"]}},
+                upsert=True,
+            )
+            for row in rows
+        ],
+        ordered=False,
+    )
+    return len(rows)
+
+
+def _may_be_archived(
+    key: dict, granularity: Granularity, now: datetime, policy: RetentionPolicy
+) -> bool:
+    days = policy.days_for(key["service"], key["action"])
+    return bool(days) and bucket_start(key["bucket"], granularity) < now - timedelta(days=days)
+
+
+async def repair_recent_rollups(now: Optional[datetime] = None, events=None, rollups=None) -> int:
+    """
+    Rebuild the closed buckets of the last ROLLUP_REPAIR_HOURS.
+
+    A bucket is only rebuilt ROLLUP_REPAIR_GRACE_SECONDS after it closes, once
+    the `$inc` of the batches stored just before then has landed; rebuilding
+    earlier could count those events twice. Buckets the retention policy may
+    have archived from are skipped (see `rebuild_rollups`).
+    """
+    now = now or datetime.now(timezone.utc)
+    closed_before = now - timedelta(seconds=settings.ROLLUP_REPAIR_GRACE_SECONDS)
+
+    written = 0
+    for granularity in Granularity:
+        until = bucket_start(closed_before, granularity)
+        since = bucket_start(until - timedelta(hours=settings.ROLLUP_REPAIR_HOURS), granularity)
+        written += await rebuild_rollups(
+            granularity, since, until, now=now, events=events, rollups=rollups
+        )
+    return written
+
+
+async def _aggregate(collection, pipeline: List[dict]) -> List[dict]:
+    cursor = await collection.aggregate(pipeline)
+    return await cursor.to_list()
+
+
+async def get_stats(
+    granularity: Granularity = Granularity.HOUR,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    service: Optional[str] = None,
+    action: Optional[str] = None,
+    user_id: Optional[str] = None,
+    group_by: Iterable[str] = STATS_DIMENSIONS,
+    now: Optional[datetime] = None,
+    rollups=None,
+    events=None,
+) -> EventsStats:
+    """
+    Event counts per bucket, grouped by any of service, action and user.
+
+    Buckets that are over are read from the rollups of their granularity. The
+    current day is read from the hourly rollups of its closed hours, so only
+    the current, still filling hour is aggregated from the raw events and the
+    cost does not grow with the window. Buckets starting before `until` are
+    included whole.
+    """
+    group_by = [dimension for dimension in STATS_DIMENSIONS if dimension in set(group_by)]
+    now = now or datetime.now(timezone.utc)
+    until = until or now
+    since = since or until - DEFAULT_WINDOWS[granularity]
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+
+    start = bucket_start(since, granularity)
+    current = bucket_start(now, granularity)
+    current_hour = bucket_start(now, Granularity.HOUR)
+    filters = {
+        dimension: value
+        for dimension, value in zip(STATS_DIMENSIONS, (service, action, user_id))
+        if value
+    }
+    group_key = {dimension: f"${dimension}" for dimension in group_by}
+    rollups = rollups if rollups is not None else EventRollup.get_pymongo_collection()
+
+    rows = []
+    closed_until = min(current, until)
+    if start < closed_until:
+        rows += await _aggregate(
+            rollups,
+            [
+                {
+                    "$match": {
+                        "granularity": granularity.value,
+                        "bucket": {"$gte": start, "$lt": closed_until},
+                        **filters,
+                    }
+                },
+                {"$group": {"_id": {"bucket": "$bucket", **group_key}, "count": {"$sum": "$total"}}},
+            ],
+        )
+
+    if current < until:
+        open_since = max(start, current)
+        if open_since < current_hour:
+            # The closed hours of the current day
+            rows += await _aggregate(
+                rollups,
+                [
+                    {
+                        "$match": {
+                            "granularity": Granularity.HOUR.value,
+                            "bucket": {"$gte": open_since, "$lt": current_hour},
+                            **filters,
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": {"bucket": {"$literal": current}, **group_key},
+                            "count": {"$sum": "$total"},
+                        }
+                    },
+                ],
+            )
+
+        events = events if events is not None else Event.get_pymongo_collection()
+        rows += await _aggregate(
+            events,
+            [
+                {"$match": {"timestamp": {"$gte": max(open_since, current_hour)}, **filters}},
+                {
+                    "$group": {
+                        "_id": {
+                            "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": granularity.value}},
+                            **group_key,
+                        },
+                        "count": {"$sum": 1},
+                    }
+                },
+            ],
+        )
+
+    # The current day comes from both the hourly rollups and the raw events
+    counts = Counter()
+    for row in rows:
+        key = (
+            bucket_start(row["_id"]["bucket"], granularity),
+            *(row["_id"].get(dimension) for dimension in group_by),
+        )
+        counts[key] += row["count"]
+
+    buckets = sorted(
+        (
+            StatsBucket(bucket=bucket, count=count, **dict(zip(group_by, values)))
+            for (bucket, *values), count in counts.items()
+        ),
+        key=lambda b: (b.bucket, *(getattr(b, dimension) or "" for dimension in group_by)),
+    )
+
+    return EventsStats(
+        granularity=granularity,
+        since=start,
+        until=until,
+        group_by=group_by,
+        buckets=buckets,
+    )
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from logging import getLogger
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from redis import asyncio as aioredis
+from app.core.config import settings
+from app.models.event import Event
+from app.schemas.event_schema import EventResponse
+
+logger = getLogger(__name__)
+
+_publisher: Optional[aioredis.Redis] = None
+
+
+def _redis() -> aioredis.Redis:
+    return aioredis.from_url(settings.EVENTS_STREAM_REDIS_URL)
+
+
+async def publish_events(events: List[Event], client=None) -> None:
+    """
+    Announce newly stored events on the stream channel.
+
+    Best effort: the events are already stored, so failures are only logged
+    and tail subscribers simply miss them.
+    """
+    global _publisher
+
+    if not events:
+        return
+
+    try:
+        payloads = [
+            EventResponse(**event.model_dump(by_alias=True)).model_dump_json(by_alias=True)
+            for event in events
+        ]
+        if client is None:
+            _publisher = _publisher or _redis()
+            client = _publisher
+        async with client.pipeline(transaction=False) as pipe:
+            for payload in payloads:
+                pipe.publish(settings.EVENTS_STREAM_CHANNEL, payload)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to publish events to the stream: {e}", exc_info=True)
+
+
+async def close_event_publisher() -> None:
+    global _publisher
+
+    if _publisher is not None:
+        publisher, _publisher = _publisher, None
+        await publisher.aclose()
+
+
+class Subscription:
+    """
+    One client's view of the stream: the events matching its filters.
+
+    The queue is bounded. When the client falls behind, new events are dropped
+    for it alone and counted, and the count is reported before its next event.
+    """
+
+    def __init__(self, filters: Dict[str, str], max_queued: int):
+        self.filters = filters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        return all(event.get(key) == value for key, value in self.filters.items())
+
+    def offer(self, event_id: str, payload: str) -> None:
+        try:
+            self.queue.put_nowait((event_id, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def get(self) -> Tuple[str, str]:
+        return await self.queue.get()
+
+
+class EventStreamHub:
+    """
+    Fans the stream channel out to the connected clients of this process.
+
+    A single Redis subscription serves every client; it is opened with the
+    first one and reconnects on its own if Redis goes away.
+    """
+
+    def __init__(self, client_factory=_redis):
+        self.client_factory = client_factory
+        self.subscriptions: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, max_queued: Optional[int] = None, **filters) -> Subscription:
+        subscription = Subscription(
+            {key: value for key, value in filters.items() if value},
+            max_queued or settings.EVENTS_STREAM_QUEUE_SIZE,
+        )
+        self.subscriptions.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def dispatch(self, payload: str) -> None:
+        if not self.subscriptions:
+            return
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed stream message: {payload[:200]}")
+            return
+        for subscription in list(self.subscriptions):
+            if subscription.matches(event):
+                subscription.offer(event.get("_id", ""), payload)
+
+    async def _listen(self) -> None:
+        retry_delay = 1
+        while True:
+            client = self.client_factory()
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.EVENTS_STREAM_CHANNEL)
+                    retry_delay = 1
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            data = message["data"]
+                            self.dispatch(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event stream subscription failed: {e}", exc_info=True)
+            finally:
+                await client.aclose()
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+hub = EventStreamHub()
+
+
+async def sse_events(
+    subscription: Subscription, heartbeat: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for a subscription, with a comment line as heartbeat so
+    idle connections are not cut by proxies.
+    """
+    heartbeat = heartbeat or settings.EVENTS_STREAM_HEARTBEAT_SECONDS
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event_id, payload = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if subscription.dropped:
+                dropped, subscription.dropped = subscription.dropped, 0
+                yield f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n"
+            yield f"id: {event_id}\nevent: event\ndata: {payload}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
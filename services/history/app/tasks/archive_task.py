@@ -0,0 +1,14 @@
+from logging import getLogger
+from app.services.archive_service import archive_expired_events
+from app.tasks.event_task import ARCHIVE_TASK, app
+from app.tasks.worker_loop import run_in_worker_loop
+
+logger = getLogger(__name__)
+
+
+@app.task(name=ARCHIVE_TASK, ignore_result=True)
+def archive_expired_events_task():
+    """Archive and delete the events past their retention (see RETENTION_RULES)."""
+    archived = run_in_worker_loop(archive_expired_events())
+    logger.info(f"Archived {archived} expired history events")
+    return archived
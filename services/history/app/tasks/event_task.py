@@ -1,30 +1,74 @@
 from logging import getLogger
 from celery import Celery
-import asyncio
 from app.core.config import settings
 from kombu import Exchange, Queue
-from app.services.event_service import create_event
-from app.db.database import connect_to_mongo
+from app.services.event_service import create_events
+from app.tasks.worker_loop import run_in_worker_loop
 from pymongo import MongoClient
 from beanie import init_beanie
 from app.models.event import Event
 from datetime import datetime, timezone
 from app.schemas.event_schema import EventCreate
+from app.core.metrics import (
+    history_batch_size,
+    history_events_ingested_total,
+    install_worker_metrics,
+)
+from app.core.tracing import (
+    HISTORY_QUEUE,
+    PUBLISHED_AT_HEADER,
+    configure_tracing,
+    extract_task_context,
+    flush_tracing,
+    record_queue_wait,
+    tracer,
+)
+from celery.signals import worker_process_shutdown, worker_shutdown
+from celery_batches import Batches
+from opentelemetry import trace
+from opentelemetry.trace import Link, SpanKind
 
 app = Celery(
-    "tasks", broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND
+    "tasks",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.archive_task", "app.tasks.rollup_task"],
 )
 
 logger = getLogger(__name__)
 
 _dlx = Exchange("dlx", type="direct", durable=True)
+_failed_queue = Queue("history.failed", _dlx, routing_key="history.failed", durable=True)
+
+MAINTENANCE_QUEUE = "history.maintenance"
+ARCHIVE_TASK = "app.tasks.archive_task.archive_expired_events_task"
+REPAIR_ROLLUPS_TASK = "app.tasks.rollup_task.repair_rollups_task"
+
+RETRIES_HEADER = "batch_retries"
+# Message headers carried over when an event is published again
+_FORWARDED_HEADERS = ("traceparent", "tracestate", PUBLISHED_AT_HEADER)
 
 
 app.conf.update(
     task_ignore_result=True,
     task_routes=[
-        {"app.tasks.event_task.process_event_background": {"queue": "history"}}
+        {"app.tasks.event_task.process_event_background": {"queue": "history"}},
+        {ARCHIVE_TASK: {"queue": MAINTENANCE_QUEUE}},
+        {REPAIR_ROLLUPS_TASK: {"queue": MAINTENANCE_QUEUE}},
     ],
+    beat_schedule={
+        "archive-expired-events": {
+            "task": ARCHIVE_TASK,
+            "schedule": settings.ARCHIVE_INTERVAL_SECONDS,
+            # Runs that pile up behind a slow one would only find nothing left
+            "options": {"expires": settings.ARCHIVE_INTERVAL_SECONDS},
+        },
+        "repair-rollups": {
+            "task": REPAIR_ROLLUPS_TASK,
+            "schedule": settings.ROLLUP_REPAIR_INTERVAL_SECONDS,
+            "options": {"expires": settings.ROLLUP_REPAIR_INTERVAL_SECONDS},
+        },
+    },
     task_queue=[
         Queue(
             "history",
@@ -34,27 +78,125 @@ app.conf.update(
                 "x-dead-letter-routing-key": "history.failed",
             },
         ),
-        Queue("history.failed", _dlx, routing_key="history.failed", durable=True),
+        _failed_queue,
     ],
+    # A whole batch has to fit in the prefetch window to ever fill up
+    worker_prefetch_multiplier=settings.HISTORY_BATCH_SIZE,
 )
 
+install_worker_metrics()
+configure_tracing()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_spans(**kwargs):
+    flush_tracing()
+
+
+def _headers(request) -> dict:
+    return getattr(request, "request_dict", None) or {}
+
+
+def _event_data(request):
+    event_data = request.args[0] if request.args else request.kwargs.get("event_data")
+    if isinstance(event_data, dict) and not event_data.get("event_id") and request.id:
+        # Producers that don't assign ids still get redeliveries of the same
+        # message deduplicated; the id then travels with any republished copy
+        event_data = {**event_data, "event_id": f"task:{request.id}"}
+    return event_data
+
+
+def _republish(request, error: str, retries: int, **options) -> None:
+    headers = {k: v for k, v in _headers(request).items() if k in _FORWARDED_HEADERS}
+    headers[RETRIES_HEADER] = retries
+    headers["x-error"] = error[:1024]
+    app.send_task(
+        process_event_background.name,
+        args=[_event_data(request)],
+        headers=headers,
+        **options,
+    )
+
+
+def dead_letter(request, error: str) -> None:
+    """Park one event on history.failed, leaving the rest of its batch alone."""
+    logger.error(f"Dead-lettering history event {request.id}: {error}")
+    _republish(
+        request,
+        error,
+        int(_headers(request).get(RETRIES_HEADER, 0)),
+        queue=_failed_queue,
+        declare=[_failed_queue],
+    )
+    history_events_ingested_total.labels("dead_lettered").inc()
+
+
+def retry_or_dead_letter(request, error: str) -> None:
+    retries = int(_headers(request).get(RETRIES_HEADER, 0))
+    if retries >= settings.HISTORY_BATCH_MAX_RETRIES:
+        dead_letter(request, error)
+        return
+
+    _republish(
+        request, error, retries + 1, queue=HISTORY_QUEUE, countdown=min(2**retries, 60)
+    )
+    history_events_ingested_total.labels("retried").inc()
 
 
 @app.task(
+    base=Batches,
     name="app.tasks.event_task.process_event_background",
-    autoretry_for=(Exception,),
-    max_retries=3,
-    retry_backoff=True,
-    retry_backoff_max=60,
+    flush_every=settings.HISTORY_BATCH_SIZE,
+    flush_interval=settings.HISTORY_BATCH_INTERVAL,
+    acks_late=True,
     ignore_results=True,
 )
-def process_event_background(event_data):
-    try:
-        event_id = asyncio.run(create_event(event_data))
-        logger.info(f"Event saved successfully with ID: {event_id}")
-        print(f"[HISTORY WORKER] Event triggered with ID: {event_id}")
-        return
-    except Exception as e:
-        logger.error(f"Error processing history event: {e}", exc_info=True)
-        print(f"[HISTORY WORKER] Error: {e}")
-        raise
+def process_event_background(requests):
+    """
+    Store a micro-batch of history events with one unordered insert_many.
+
+    Messages are buffered until HISTORY_BATCH_SIZE arrive or HISTORY_BATCH_INTERVAL
+    passes, and are acked once this returns. By then every event is either stored
+    or published again: a rejected event goes to history.failed on its own, and a
+    batch that failed as a whole (Mongo unreachable) is retried with backoff
+    before its events are dead-lettered. Events are stored once per event_id,
+    so writing a redelivered batch again does not duplicate them.
+    """
+    # Continue each publisher's trace up to the queue; the batch links to all of them
+    parents = [extract_task_context(request) for request in requests]
+    for request, parent in zip(requests, parents):
+        record_queue_wait(request, parent)
+
+    links = [
+        Link(trace.get_current_span(parent).get_span_context()) for parent in parents
+    ]
+    with tracer().start_as_current_span(
+        f"{HISTORY_QUEUE} process",
+        kind=SpanKind.CONSUMER,
+        links=[link for link in links if link.context.is_valid],
+        attributes={
+            "messaging.system": "rabbitmq",
+            "messaging.destination.name": HISTORY_QUEUE,
+            "messaging.batch.message_count": len(requests),
+        },
+    ):
+        history_batch_size.observe(len(requests))
+        try:
+            result = run_in_worker_loop(
+                create_events([_event_data(request) for request in requests])
+            )
+        except Exception as e:
+            logger.error(f"Error storing history batch: {e}", exc_info=True)
+            print(f"[HISTORY WORKER] Error: {e}")
+            for request in requests:
+                retry_or_dead_letter(request, f"{e}")
+            return
+
+        for position, error in result.failed.items():
+            dead_letter(requests[position], error)
+
+        history_events_ingested_total.labels("inserted").inc(len(result.inserted_ids))
+        history_events_ingested_total.labels("duplicate").inc(result.duplicates)
+        logger.info(f"Stored {len(result.inserted_ids)} of {len(requests)} history events")
+        print(f"[HISTORY WORKER] Stored {len(result.inserted_ids)} events")
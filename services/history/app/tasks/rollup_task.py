@@ -0,0 +1,14 @@
+from logging import getLogger
+from app.services.rollup_service import repair_recent_rollups
+from app.tasks.event_task import REPAIR_ROLLUPS_TASK, app
+from app.tasks.worker_loop import run_in_worker_loop
+
+logger = getLogger(__name__)
+
+
+@app.task(name=REPAIR_ROLLUPS_TASK, ignore_result=True)
+def repair_rollups_task():
+    """Recompute the recently closed stats buckets from the raw events."""
+    written = run_in_worker_loop(repair_recent_rollups())
+    logger.info(f"Rebuilt {written} event rollups")
+    return written
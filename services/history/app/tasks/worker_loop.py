@@ -0,0 +1,68 @@
+import asyncio
+from logging import getLogger
+from typing import Awaitable, Optional, TypeVar
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from app.db.database import close_mongo, connect_to_mongo
+from app.services.stream_service import close_event_publisher
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def start_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create the process's event loop and connect Beanie on it.
+
+    The Mongo client binds to the loop it first runs on, so every task of the
+    process must run on this same loop rather than a fresh `asyncio.run`.
+    """
+    global _loop
+
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    # A no-op once connected; retried here if the connection failed earlier.
+    # Workers sync indexes too, as deduplication relies on the event_id one
+    _loop.run_until_complete(connect_to_mongo(sync_indexes=True))
+    return _loop
+
+
+def run_in_worker_loop(coro: Awaitable[T]) -> T:
+    # Started lazily for pools that never send worker_process_init (solo, eager)
+    return start_worker_loop().run_until_complete(coro)
+
+
+def stop_worker_loop() -> None:
+    global _loop
+
+    if _loop is None:
+        return
+
+    loop, _loop = _loop, None
+    try:
+        loop.run_until_complete(close_mongo())
+        loop.run_until_complete(close_event_publisher())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception as e:
+        logger.error(f"Error closing the worker loop: {e}", exc_info=True)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    try:
+        start_worker_loop()
+    except Exception as e:
+        # The first task retries the connection instead of the process dying
+        logger.error(f"Could not connect the worker to MongoDB: {e}", exc_info=True)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    stop_worker_loop()
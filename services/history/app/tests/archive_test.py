@@ -0,0 +1,123 @@
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId, json_util
+
+from app.services.archive_service import (
+    DailyArchive,
+    RetentionPolicy,
+    archive_expired_events,
+)
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the archiver, matching on service."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query, sort=None, limit=0):
+        self.queries.append(query)
+        cutoff = query["timestamp"]["$lt"]
+        matches = sorted(
+            (
+                d
+                for d in self.documents
+                if d["timestamp"] < cutoff and d["service"] == query.get("service", d["service"])
+            ),
+            key=lambda d: (d["timestamp"], d["_id"]),
+        )[:limit]
+
+        class Cursor:
+            async def to_list(self):
+                return matches
+
+        return Cursor()
+
+    async def delete_many(self, query):
+        ids = set(query["_id"]["$in"])
+        self.documents = [d for d in self.documents if d["_id"] not in ids]
+
+
+def event(service, days_old, action="task_create"):
+    return {
+        "_id": ObjectId(),
+        "event_id": f"{service}:{days_old}",
+        "service": service,
+        "action": action,
+        "user_id": "1",
+        "details": {},
+        "timestamp": NOW - timedelta(days=days_old),
+    }
+
+
+def read_archive(path):
+    with gzip.open(path, "rt") as f:
+        return [json_util.loads(line) for line in f]
+
+
+def test_policy_matches_each_event_by_its_most_specific_rule():
+    policy = RetentionPolicy({"tasks": 30, "tasks:task_update": 90, "users": 0}, default_days=7)
+
+    assert policy.days_for("tasks", "task_update") == 90
+    assert policy.days_for("tasks", "task_create") == 30
+    assert policy.days_for("users", "user_register") == 0
+    assert policy.days_for("boards", "board_create") == 7
+
+    action, service, default = policy.expired_filters(NOW)
+    assert action == {
+        "service": "tasks",
+        "action": "task_update",
+        "timestamp": {"$lt": NOW - timedelta(days=90)},
+    }
+    assert service["action"] == {"$nin": ["task_update"]}
+    assert default["service"] == {"$nin": ["tasks", "users"]}
+    assert default["$nor"] == [{"service": "tasks", "action": "task_update"}]
+    assert default["timestamp"] == {"$lt": NOW - timedelta(days=7)}
+
+
+def test_policy_without_retention_expires_nothing():
+    assert RetentionPolicy({}).expired_filters(NOW) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_events_are_archived_by_day_then_deleted(tmp_path):
+    kept = event("tasks", 5)
+    expired = [event("tasks", 40), event("tasks", 40), event("tasks", 41)]
+    collection = FakeCollection([kept, *expired])
+
+    archived = await archive_expired_events(
+        now=NOW,
+        policy=RetentionPolicy({"tasks": 30}),
+        archive=DailyArchive(str(tmp_path)),
+        batch_size=2,
+        collection=collection,
+    )
+
+    assert archived == 3
+    assert collection.documents == [kept]
+
+    days = sorted(p.name for p in tmp_path.iterdir())
+    assert days == ["day=2026-01-28", "day=2026-01-29"]
+    archived_ids = [
+        document["_id"]
+        for path in sorted(tmp_path.glob("day=*/*.jsonl.gz"))
+        for document in read_archive(path)
+    ]
+    assert sorted(archived_ids) == sorted(d["_id"] for d in expired)
+
+
+def test_archiving_the_same_batch_again_replaces_its_file(tmp_path):
+    archive = DailyArchive(str(tmp_path))
+    documents = [event("users", 400), event("users", 400)]
+
+    first = archive.write(documents)
+    second = archive.write(documents)
+
+    assert first == second
+    assert len(list(tmp_path.glob("day=*/*"))) == 1
+    assert [d["event_id"] for d in read_archive(first[0])] == ["users:400", "users:400"]
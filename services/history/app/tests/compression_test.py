@@ -0,0 +1,80 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, level=6)
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/large")
+    def large():
+        return {"items": ["x" * 50] * 50}
+
+    @app.get("/events/stream")
+    def stream():
+        def generate():
+            yield "data: one\n\n"
+            yield "data: two\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    @app.get("/events/export")
+    def export():
+        def generate():
+            for i in range(100):
+                yield f'{{"row": {i}}}\n'
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"items": ["x" * 50] * 50}
+
+
+def test_client_quality_values_are_respected(client):
+    response = client.get(
+        "/large", headers={"Accept-Encoding": "br;q=0.2, gzip;q=0.9"}
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_event_streams_are_never_compressed(client):
+    response = client.get("/events/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: one\n\ndata: two\n\n"
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk(client):
+    with client.stream(
+        "GET", "/events/export", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 100
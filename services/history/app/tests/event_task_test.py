@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from celery_batches import SimpleRequest
+from pymongo.errors import BulkWriteError
+
+from app.services.event_service import BatchInsertResult, create_events
+from app.tasks.event_task import RETRIES_HEADER, process_event_background
+
+
+def event(user_id="1"):
+    return {"service": "users", "action": "user_register", "user_id": user_id, "details": {}}
+
+
+def batch_request(event_data, headers=None):
+    return SimpleRequest(
+        f"task-{id(event_data)}", process_event_background.name, (event_data,), {}, {},
+        "worker", True, None, None, headers or {},
+    )
+
+
+@pytest.fixture
+def published():
+    with patch("app.tasks.event_task.app.send_task") as send_task, patch(
+        "app.tasks.worker_loop.connect_to_mongo", AsyncMock()
+    ):
+        yield send_task
+
+
+@pytest.mark.asyncio
+async def test_create_events_writes_one_unordered_batch():
+    with patch("app.services.event_service.Event") as MockEvent:
+        MockEvent.side_effect = lambda **kwargs: MagicMock(**kwargs)
+        MockEvent.insert_many = AsyncMock()
+
+        result = await create_events([event("1"), event("2")])
+
+    MockEvent.insert_many.assert_awaited_once()
+    documents = MockEvent.insert_many.await_args.args[0]
+    assert MockEvent.insert_many.await_args.kwargs == {"ordered": False}
+    assert result.inserted_ids == [str(document.id) for document in documents]
+    assert result.failed == {}
+
+
+@pytest.mark.asyncio
+async def test_create_events_reports_rejected_documents_by_position():
+    rejected = BulkWriteError(
+        {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]}
+    )
+    with patch("app.services.event_service.Event") as MockEvent:
+        MockEvent.side_effect = lambda **kwargs: MagicMock(**kwargs)
+        MockEvent.insert_many = AsyncMock(side_effect=rejected)
+
+        # The invalid event never reaches Mongo, so document 1 is position 2
+        result = await create_events([event("1"), {"service": "users"}, event("3"), event("4")])
+
+    assert len(result.inserted_ids) == 2
+    assert set(result.failed) == {1, 2}
+    assert result.failed[2] == "duplicate key"
+
+
+@pytest.mark.asyncio
+async def test_create_events_skips_events_already_stored():
+    duplicate = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000, "keyPattern": {"event_id": 1}, "errmsg": "dup"}
+            ]
+        }
+    )
+    with patch("app.services.event_service.Event") as MockEvent:
+        MockEvent.side_effect = lambda **kwargs: MagicMock(**kwargs)
+        MockEvent.insert_many = AsyncMock(side_effect=duplicate)
+
+        result = await create_events(
+            [{**event("1"), "event_id": "users:1"}, {**event("2"), "event_id": "users:2"}]
+        )
+
+    documents = MockEvent.insert_many.await_args.args[0]
+    assert [document.event_id for document in documents] == ["users:1", "users:2"]
+    assert result.duplicates == 1
+    assert result.inserted_ids == [str(documents[1].id)]
+    assert result.failed == {}
+
+
+@pytest.mark.asyncio
+async def test_create_events_raises_when_the_write_is_not_durable():
+    unacknowledged = BulkWriteError({"writeErrors": [], "writeConcernErrors": [{}]})
+    with patch("app.services.event_service.Event") as MockEvent:
+        MockEvent.side_effect = lambda **kwargs: MagicMock(**kwargs)
+        MockEvent.insert_many = AsyncMock(side_effect=unacknowledged)
+
+        with pytest.raises(BulkWriteError):
+            await create_events([event()])
+
+
+def test_only_failed_events_are_dead_lettered(published):
+    requests = [batch_request(event(str(i))) for i in range(3)]
+    result = BatchInsertResult(inserted_ids=["a", "c"], failed={1: "duplicate key"})
+
+    with patch("app.tasks.event_task.create_events", AsyncMock(return_value=result)) as create:
+        process_event_background(requests)
+
+    assert [e["user_id"] for e in create.await_args.args[0]] == ["0", "1", "2"]
+    published.assert_called_once()
+    options = published.call_args.kwargs
+    assert options["args"] == [{**event("1"), "event_id": f"task:{requests[1].id}"}]
+    assert options["queue"].name == "history.failed"
+    assert options["headers"]["x-error"] == "duplicate key"
+
+
+def test_messages_without_an_event_id_are_keyed_by_task_id(published):
+    requests = [batch_request(event("1")), batch_request({**event("2"), "event_id": "users:2"})]
+
+    with patch(
+        "app.tasks.event_task.create_events", AsyncMock(return_value=BatchInsertResult())
+    ) as create:
+        process_event_background(requests)
+
+    event_ids = [e["event_id"] for e in create.await_args.args[0]]
+    assert event_ids == [f"task:{requests[0].id}", "users:2"]
+
+
+def test_failed_batch_is_retried_then_dead_lettered(published, monkeypatch):
+    monkeypatch.setattr("app.tasks.event_task.settings.HISTORY_BATCH_MAX_RETRIES", 1)
+    fresh = batch_request(event("1"), {"traceparent": "00-abc-def-01"})
+    retried = batch_request(event("2"), {RETRIES_HEADER: 1})
+
+    with patch(
+        "app.tasks.event_task.create_events", AsyncMock(side_effect=ConnectionError("down"))
+    ):
+        process_event_background([fresh, retried])
+
+    first, second = (call.kwargs for call in published.call_args_list)
+    assert first["queue"] == "history"
+    assert first["countdown"] == 1
+    assert first["headers"] == {
+        "traceparent": "00-abc-def-01",
+        RETRIES_HEADER: 1,
+        "x-error": "down",
+    }
+    assert second["queue"].name == "history.failed"
@@ -1,62 +1,185 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
 
-from app.services.event_service import create_event, get_event_by_id, get_events
+from bson import ObjectId
+
+from app.schemas.event_schema import DetailsView, EventResponse, EventsPage
+from app.services.event_service import (
+    create_event,
+    decode_cursor,
+    encode_cursor,
+    get_event_by_id,
+    get_events,
+)
+
+
+class FakeEventsCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.find_args = None
+
+    def find(self, query, **kwargs):
+        self.find_args = (query, kwargs)
+        return SimpleNamespace(to_list=AsyncMock(return_value=self.documents))
+
+    async def find_one(self, query):
+        return next((d for d in self.documents if d["_id"] == query["_id"]), None)
+
+
+def stored_event(event_id, timestamp, details=None):
+    return {
+        "_id": event_id,
+        "service": "tasks",
+        "action": "task_create",
+        "user_id": "1",
+        "details": {} if details is None else details,
+        "timestamp": timestamp,
+    }
 
 
 @pytest.mark.asyncio
 async def test_get_events_returns_event_responses():
-    mock_event = MagicMock()
-    mock_event.model_dump.return_value = {
-        "_id": "event-1",
-        "service": "test-service",
-        "action": "created",
-        "user_id": "user-123",
-        "details": {"key": "value"},
-        "timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc),
-    }
+    collection = FakeEventsCollection(
+        [stored_event(ObjectId(), datetime(2026, 1, 1), details={"key": "value"})]
+    )
 
-    with patch("app.services.event_service.Event") as MockEvent:
-        mock_query = MagicMock()
-        mock_query.sort.return_value.skip.return_value.limit.return_value.to_list = AsyncMock(return_value=[mock_event])
-        MockEvent.find.return_value = mock_query
+    with patch("app.services.event_service.Event"):
+        page = await get_events(service="tasks", collection=collection)
+
+    assert len(page.events) == 1
+    assert page.events[0].service == "tasks"
+    assert page.events[0].details == {"key": "value"}
+    assert page.next_cursor is None
+    assert collection.find_args[1]["projection"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_events_returns_cursor_when_more_events_exist():
+    first, second, third = ObjectId(), ObjectId(), ObjectId()
+    at = datetime(2026, 1, 1, 12, 0, 0, 123000)
+    collection = FakeEventsCollection(
+        [stored_event(third, at), stored_event(second, at), stored_event(first, at)]
+    )
+
+    with patch("app.services.event_service.Event"):
+        page = await get_events(limit=2, collection=collection)
 
-        events = await get_events(service="test-service")
+    assert collection.find_args[1]["limit"] == 3
+    assert [e.id for e in page.events] == [str(third), str(second)]
+    # Timestamps come back from Mongo naive, in UTC
+    assert decode_cursor(page.next_cursor) == (at.replace(tzinfo=timezone.utc), second)
 
-    assert len(events) == 1
-    assert events[0].service == "test-service"
-    assert events[0].action == "created"
+
+@pytest.mark.asyncio
+async def test_get_events_leaves_details_out_on_the_server():
+    documents = [stored_event(ObjectId(), datetime(2026, 1, 1))]
+    for document in documents:
+        del document["details"]
+
+    with patch("app.services.event_service.Event"):
+        omitted = FakeEventsCollection(documents)
+        page = await get_events(details=DetailsView.OMIT, collection=omitted)
+        trimmed = FakeEventsCollection(documents)
+        await get_events(details=DetailsView.TRIM, collection=trimmed)
+
+    assert omitted.find_args[1]["projection"] == {"details": 0}
+    assert page.events[0].details is None
+    trim = trimmed.find_args[1]["projection"]["details"]["$arrayToObject"]["$slice"]
+    assert trim[1] == 10
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    event_id = ObjectId()
+    event = EventResponse(
+        _id=event_id,
+        service="tasks",
+        action="task_create",
+        user_id="1",
+        details={},
+        timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+    cursor = encode_cursor(event)
+
+    assert decode_cursor(cursor) == (event.timestamp, event_id)
+    for garbage in ("", "not-a-cursor", encode_cursor(event)[:-4]):
+        with pytest.raises(ValueError):
+            decode_cursor(garbage)
+
+
+def test_events_api_links_the_next_page_and_rejects_bad_cursors():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.apis.event_api import router
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    page = EventsPage(events=[], next_cursor="abc")
+
+    with patch("app.apis.event_api.get_events", AsyncMock(return_value=page)) as get:
+        response = client.get("/events/", params={"since": "2026-01-01T00:00:00Z", "cursor": "xyz"})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["x-next-cursor"] == "abc"
+    assert get.await_args.kwargs["since"] == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert get.await_args.kwargs["cursor"] == "xyz"
+
+    assert client.get("/events/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_events_api_serializes_events_as_response_model_would():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.apis.event_api import router
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    event = EventResponse.model_validate(
+        stored_event(ObjectId(), datetime(2026, 1, 1, 12, 0, 0, 123000), details={"a": 1})
+    )
+    page = EventsPage(events=[event])
+
+    with patch("app.apis.event_api.get_events", AsyncMock(return_value=page)) as get:
+        response = client.get("/events/", params={"details": "omit"})
+
+    assert response.status_code == 200
+    assert response.json() == [event.model_dump(mode="json", by_alias=True)]
+    assert "x-next-cursor" not in response.headers
+    assert get.await_args.kwargs["details"] is DetailsView.OMIT
+
+    with patch("app.apis.event_api.get_event_by_id", AsyncMock(return_value=event)):
+        assert client.get(f"/events/{event.id}").json() == event.model_dump(mode="json", by_alias=True)
+    with patch("app.apis.event_api.get_event_by_id", AsyncMock(return_value=None)):
+        assert client.get(f"/events/{event.id}").status_code == 404
 
 
 @pytest.mark.asyncio
 async def test_get_event_by_id_returns_response():
-    mock_event = MagicMock()
-    mock_event.model_dump.return_value = {
-        "_id": "event-1",
-        "service": "test-service",
-        "action": "created",
-        "user_id": "user-123",
-        "details": {"key": "value"},
-        "timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc),
-    }
+    event_id = ObjectId()
+    collection = FakeEventsCollection(
+        [stored_event(event_id, datetime(2026, 1, 1), details={"key": "value"})]
+    )
 
-    with patch("app.services.event_service.Event") as MockEvent:
-        MockEvent.get = AsyncMock(return_value=mock_event)
-        event = await get_event_by_id("event-1")
+    event = await get_event_by_id(str(event_id), collection=collection)
 
     assert event is not None
-    assert event.service == "test-service"
+    assert event.id == str(event_id)
+    assert event.details == {"key": "value"}
 
 
 @pytest.mark.asyncio
 async def test_get_event_by_id_returns_none_for_missing():
-    with patch("app.services.event_service.Event") as MockEvent:
-        MockEvent.get = AsyncMock(return_value=None)
-        event = await get_event_by_id("missing-id")
+    collection = FakeEventsCollection([])
 
-    assert event is None
+    assert await get_event_by_id(str(ObjectId()), collection=collection) is None
+    assert await get_event_by_id("missing-id", collection=collection) is None
 
 
 @pytest.mark.asyncio
@@ -77,6 +200,26 @@ async def test_create_event_inserts_and_returns_id():
     assert result == "new-event-id"
 
 
+@pytest.mark.asyncio
+async def test_create_event_returns_existing_id_for_duplicate_event_id():
+    with patch("app.services.event_service.Event") as MockEvent:
+        mock_instance = MagicMock()
+        mock_instance.insert = AsyncMock(side_effect=DuplicateKeyError("duplicate key"))
+        MockEvent.return_value = mock_instance
+        MockEvent.find_one = AsyncMock(return_value=MagicMock(id="stored-event-id"))
+
+        result = await create_event({
+            "event_id": "users:register:1",
+            "service": "users",
+            "action": "user_register",
+            "user_id": "1",
+            "details": {},
+        })
+
+    assert result == "stored-event-id"
+    assert MockEvent.call_args.kwargs["event_id"] == "users:register:1"
+
+
 @pytest.mark.asyncio
 async def test_create_event_requires_user_id():
     with pytest.raises(ValidationError):
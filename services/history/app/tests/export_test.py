@@ -0,0 +1,140 @@
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+import pyarrow.parquet as pq
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.apis.event_api import router
+from app.services.export_service import (
+    event_batches,
+    export_filter,
+    ndjson_stream,
+    parquet_stream,
+)
+
+
+def document(i):
+    return {
+        "_id": ObjectId(),
+        "event_id": f"tasks:outbox:{i}",
+        "service": "tasks",
+        "action": "task_create",
+        "user_id": str(i),
+        "details": {"aggregate_id": i},
+        "timestamp": datetime(2026, 1, 1, 0, 0, i),
+    }
+
+
+class FakeCursorCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.find_args = None
+
+    def find(self, query, **kwargs):
+        self.find_args = (query, kwargs)
+        documents = self.documents
+
+        async def cursor():
+            for d in documents:
+                yield d
+
+        return cursor()
+
+
+async def batches_of(documents, size):
+    for start in range(0, len(documents), size):
+        yield documents[start : start + size]
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_event_batches_reads_the_cursor_in_batches():
+    collection = FakeCursorCollection([document(i) for i in range(5)])
+    query = export_filter(service="tasks", since=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    batches = await collect(event_batches(query, batch_size=2, collection=collection))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert collection.find_args == (
+        {"service": "tasks", "timestamp": {"$gte": datetime(2026, 1, 1, tzinfo=timezone.utc)}},
+        {"sort": [("timestamp", 1), ("_id", 1)], "batch_size": 2},
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_writes_one_chunk_per_batch():
+    documents = [document(i) for i in range(3)]
+
+    chunks = await collect(ndjson_stream(batches_of(documents, 2)))
+
+    assert len(chunks) == 2
+    lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [line["_id"] for line in lines] == [str(d["_id"]) for d in documents]
+    assert lines[0]["timestamp"] == "2026-01-01T00:00:00+00:00"
+    assert lines[2]["details"] == {"aggregate_id": 2}
+
+
+@pytest.mark.asyncio
+async def test_gzip_ndjson_stream_is_one_valid_gzip_file():
+    documents = [document(i) for i in range(3)]
+
+    plain = b"".join(await collect(ndjson_stream(batches_of(documents, 2))))
+    compressed = b"".join(await collect(ndjson_stream(batches_of(documents, 2), gzip=True)))
+
+    assert gzip.decompress(compressed) == plain
+
+
+@pytest.mark.asyncio
+async def test_parquet_stream_sends_row_groups_as_they_fill():
+    documents = [document(i) for i in range(7)]
+
+    chunks = await collect(parquet_stream(batches_of(documents, 2), row_group_size=4))
+
+    # Row group of 4 as soon as it fills, then the rest with the footer
+    assert len(chunks) == 2
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.metadata.num_rows == 7
+    rows = parquet.read().to_pylist()
+    assert rows[0]["event_id"] == "tasks:outbox:0"
+    assert json.loads(rows[6]["details"]) == {"aggregate_id": 6}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    documents = [document(i) for i in range(3)]
+    monkeypatch.setattr(
+        "app.apis.event_api.event_batches", lambda query: batches_of(documents, 2)
+    )
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_export_endpoint_streams_each_format(client):
+    ndjson = client.get("/events/export", params={"service": "tasks"})
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert len(ndjson.text.splitlines()) == 3
+
+    gzipped = client.get("/events/export", params={"gzip": "true"})
+    assert gzipped.headers["content-disposition"] == 'attachment; filename="events.ndjson.gz"'
+    assert gzip.decompress(gzipped.content) == ndjson.content
+
+    parquet = client.get("/events/export", params={"format": "parquet"})
+    assert parquet.headers["content-type"] == "application/vnd.apache.parquet"
+    assert pq.ParquetFile(io.BytesIO(parquet.content)).metadata.num_rows == 3
+
+
+def test_export_without_pyarrow_is_not_available(client, monkeypatch):
+    monkeypatch.setattr("app.apis.event_api.pa", None)
+
+    assert client.get("/events/export", params={"format": "parquet"}).status_code == 501
@@ -0,0 +1,102 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from bson import ObjectId
+from pymongo import AsyncMongoClient
+
+from app.models.event import Event
+from app.schemas.event_schema import DetailsView
+from app.services.event_service import events_query, get_events
+
+# Query plans need a real server; point this at a disposable MongoDB to run them
+MONGO_TEST_URL = os.getenv("MONGO_TEST_URL")
+
+pytestmark = pytest.mark.skipif(not MONGO_TEST_URL, reason="MONGO_TEST_URL is not set")
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+FILTER_SHAPES = [
+    {},
+    {"service": "tasks"},
+    {"user_id": "7"},
+    {"service": "tasks", "user_id": "7"},
+    {"since": NOW - timedelta(hours=24)},
+    {"service": "tasks", "since": NOW - timedelta(hours=24), "until": NOW},
+    {"user_id": "7", "after": (NOW - timedelta(seconds=50), ObjectId())},
+    {"service": "tasks", "since": NOW - timedelta(hours=1), "after": (NOW, ObjectId())},
+]
+
+
+def plan_stages(plan: dict) -> list:
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+
+@pytest_asyncio.fixture
+async def events_collection():
+    client = AsyncMongoClient(MONGO_TEST_URL)
+    database = client.get_database("history_index_test")
+    await init_beanie(database=database, document_models=[Event])
+
+    await Event.insert_many(
+        Event(
+            service=("tasks", "users")[i % 2],
+            action="task_create",
+            user_id=str(i % 10),
+            details={},
+            timestamp=NOW - timedelta(seconds=i // 5),
+        )
+        for i in range(200)
+    )
+    yield Event.get_pymongo_collection()
+
+    await client.drop_database("history_index_test")
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", FILTER_SHAPES, ids=lambda f: "+".join(f) or "all")
+async def test_event_queries_use_an_index_without_sorting(events_collection, filters):
+    query = events_query(**filters)
+
+    explain = await events_collection.find(
+        query.get_filter_query(), sort=query.sort_expressions, limit=50
+    ).explain()
+
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
+
+
+@pytest.mark.asyncio
+async def test_trimmed_details_keep_the_first_scalar_entries(events_collection):
+    scalars = {f"key_{i:02}": i for i in range(15)}
+    await events_collection.update_many(
+        {}, {"$set": {"details": {"nested": {"b": 2}, "list": [3], "flag": True, **scalars}}}
+    )
+
+    page = await get_events(limit=5, details=DetailsView.TRIM, collection=events_collection)
+    omitted = await get_events(limit=5, details=DetailsView.OMIT, collection=events_collection)
+
+    # Nested values are skipped and the rest is cut at EVENTS_DETAILS_TRIM_KEYS
+    expected = {"flag": True, **{f"key_{i:02}": i for i in range(9)}}
+    assert [e.details for e in page.events] == [expected] * 5
+    assert [e.details for e in omitted.events] == [None] * 5
+
+
+@pytest.mark.asyncio
+async def test_trimmed_details_of_events_without_details_are_none(events_collection):
+    await events_collection.update_many({}, {"$unset": {"details": ""}})
+
+    page = await get_events(limit=5, details=DetailsView.TRIM, collection=events_collection)
+
+    assert [e.details for e in page.events] == [None] * 5
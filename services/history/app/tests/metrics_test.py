@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware, MongoPoolMetrics, router
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+
+    @app.get("/events/{event_id}")
+    async def event(event_id: str):
+        return {"id": event_id}
+
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_path_template(client):
+    before = sample(
+        "http_requests_total", method="GET", route="/events/{event_id}", status="200"
+    )
+
+    client.get("/events/a")
+    client.get("/events/b")
+
+    assert (
+        sample("http_requests_total", method="GET", route="/events/{event_id}", status="200")
+        == before + 2
+    )
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+    body = client.get("/metrics").text
+    assert 'route="/events/{event_id}"' in body
+    assert 'route="/metrics"' not in body
+
+
+def test_pool_listener_tracks_checkouts():
+    listener = MongoPoolMetrics()
+    count = sample("mongo_pool_checkout_seconds_count")
+    in_use = sample("mongo_pool_connections_in_use")
+
+    listener.connection_checked_out(SimpleNamespace(duration=0.002))
+    assert sample("mongo_pool_connections_in_use") == in_use + 1
+
+    listener.connection_checked_in(SimpleNamespace())
+    listener.connection_check_out_failed(SimpleNamespace(reason="timeout", duration=1.0))
+
+    assert sample("mongo_pool_connections_in_use") == in_use
+    assert sample("mongo_pool_checkout_seconds_count") == count + 2
+    assert sample("mongo_pool_checkout_failures_total", reason="timeout") >= 1
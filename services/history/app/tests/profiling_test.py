@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.profiling import (
+    PROFILE_HEADER,
+    ProfilingMiddleware,
+    profile_request_token,
+    router,
+)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SECRET", "secret")
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SAMPLE_RATE", 0.0)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(router)
+
+    @app.get("/events/")
+    async def events():
+        return [{"service": "tasks"}]
+
+    @app.get("/events/export")
+    async def export():
+        return StreamingResponse(iter([b"{}\n"]), media_type="application/x-ndjson")
+
+    @app.get("/events/live")
+    async def live():
+        return StreamingResponse(iter([b"data: {}\n\n"]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_unsigned_requests_are_not_profiled(client):
+    response = client.get("/events/")
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+
+def test_signed_request_is_profiled_and_downloadable(client, tmp_path):
+    response = client.get(
+        "/events/", headers={PROFILE_HEADER: profile_request_token("secret", 60)}
+    )
+
+    profile_id = response.headers["x-profile-id"]
+    assert (tmp_path / f"{profile_id}.speedscope.json").exists()
+
+    link = response.headers["link"]
+    profile = client.get(link[link.index("<") + 1 : link.index(">")])
+    assert profile.status_code == 200
+    assert profile.json()["$schema"].startswith("https://www.speedscope.app")
+
+    assert client.get(f"/profiles/{profile_id}?sig=bad").status_code == 404
+
+
+def test_sampling_skips_streaming_routes_and_responses(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SAMPLE_RATE", 1.0)
+
+    assert "x-profile-id" in client.get("/events/").headers
+    assert "x-profile-id" not in client.get("/events/export").headers
+    assert "x-profile-id" not in client.get("/events/live").headers
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A signed request still profiles a stream
+    signed = client.get(
+        "/events/live", headers={PROFILE_HEADER: profile_request_token("secret", 60)}
+    )
+    assert "x-profile-id" in signed.headers
+
+
+def test_profiles_are_saved_off_the_event_loop(client, monkeypatch):
+    saved_on_loop = []
+
+    def save(self, profile_id, profiler):
+        try:
+            asyncio.get_running_loop()
+            saved_on_loop.append(True)
+        except RuntimeError:
+            saved_on_loop.append(False)
+
+    monkeypatch.setattr("app.core.profiling.ProfileStore.save", save)
+
+    client.get("/events/", headers={PROFILE_HEADER: profile_request_token("secret", 60)})
+
+    assert saved_on_loop == [False]
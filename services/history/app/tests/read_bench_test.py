@@ -0,0 +1,24 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from benchmarks.read_bench import run, sample_event
+
+MONGO_TEST_URL = os.getenv("MONGO_TEST_URL")
+
+
+def test_sample_event_looks_like_an_outbox_event():
+    event = sample_event(3, details_keys=2, now=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    assert event["event_id"] == "tasks:outbox:3"
+    assert set(event["details"]) == {"aggregate_type", "aggregate_id", "field_0", "field_1", "changes"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not MONGO_TEST_URL, reason="MONGO_TEST_URL is not set")
+async def test_run_rates_every_read_path():
+    results = await run(MONGO_TEST_URL, events=50, page_size=10, pages=3, details_keys=2)
+
+    assert set(results) == {"documents", "raw/full", "raw/trim", "raw/omit"}
+    assert all(rate > 0 for rate in results.values())
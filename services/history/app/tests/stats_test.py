@@ -0,0 +1,354 @@
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.apis.event_api import router
+from app.models.event import Event
+from app.models.event_rollup import EventRollup, Granularity
+from app.schemas.event_schema import EventsStats
+from app.services.archive_service import RetentionPolicy
+from app.services.rollup_service import (
+    get_stats,
+    rebuild_rollups,
+    record_rollups,
+    repair_recent_rollups,
+)
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=timezone.utc)
+
+# Aggregation pipelines need a real server; point this at a disposable MongoDB to run them
+MONGO_TEST_URL = os.getenv("MONGO_TEST_URL")
+
+
+class FakeCollection:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.pipelines = []
+        self.operations = []
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return SimpleNamespace(to_list=AsyncMock(return_value=self.rows))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations += operations
+
+
+def event(action, minute, user_id="1"):
+    return SimpleNamespace(
+        service="tasks",
+        action=action,
+        user_id=user_id,
+        timestamp=NOW.replace(minute=minute, tzinfo=None),
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_are_incremented_once_per_bucket_and_key():
+    collection = FakeCollection()
+
+    await record_rollups(
+        [event("task_create", 1), event("task_create", 2), event("task_update", 3)],
+        collection=collection,
+    )
+
+    updates = {
+        (op._filter["granularity"], op._filter["action"]): (op._filter["bucket"], op._doc)
+        for op in collection.operations
+    }
+    assert len(collection.operations) == 4
+    assert updates[("hour", "task_create")] == (
+        datetime(2026, 3, 10, 12, tzinfo=timezone.utc),
+        {"$inc": {"total": 2}},
+    )
+    assert updates[("day", "task_update")] == (
+        datetime(2026, 3, 10, tzinfo=timezone.utc),
+        {"$inc": {"total": 1}},
+    )
+    assert all(op._upsert for op in collection.operations)
+
+
+@pytest.mark.asyncio
+async def test_closed_buckets_come_from_rollups_and_the_current_one_from_events():
+    rollups = FakeCollection(
+        [
+            {"_id": {"bucket": datetime(2026, 3, 10, 11), "service": "tasks"}, "count": 4},
+            {"_id": {"bucket": datetime(2026, 3, 10, 10), "service": "tasks"}, "count": 7},
+        ]
+    )
+    events = FakeCollection(
+        [{"_id": {"bucket": datetime(2026, 3, 10, 12), "service": "tasks"}, "count": 2}]
+    )
+
+    stats = await get_stats(
+        since=datetime(2026, 3, 10, 10, 15, tzinfo=timezone.utc),
+        service="tasks",
+        group_by=["service"],
+        now=NOW,
+        rollups=rollups,
+        events=events,
+    )
+
+    match, group = rollups.pipelines[0]
+    assert match["$match"] == {
+        "granularity": "hour",
+        "bucket": {
+            "$gte": datetime(2026, 3, 10, 10, tzinfo=timezone.utc),
+            "$lt": datetime(2026, 3, 10, 12, tzinfo=timezone.utc),
+        },
+        "service": "tasks",
+    }
+    assert group["$group"]["_id"] == {"bucket": "$bucket", "service": "$service"}
+    assert events.pipelines[0][0]["$match"] == {
+        "timestamp": {"$gte": datetime(2026, 3, 10, 12, tzinfo=timezone.utc)},
+        "service": "tasks",
+    }
+
+    assert [(b.bucket.hour, b.count) for b in stats.buckets] == [(10, 7), (11, 4), (12, 2)]
+    assert stats.buckets[0].service == "tasks"
+    assert stats.buckets[0].user_id is None
+
+
+@pytest.mark.asyncio
+async def test_windows_touch_only_the_collection_they_need():
+    rollups, events = FakeCollection(), FakeCollection()
+
+    await get_stats(since=NOW.replace(minute=5), now=NOW, rollups=rollups, events=events)
+    assert (len(rollups.pipelines), len(events.pipelines)) == (0, 1)
+
+    await get_stats(
+        granularity=Granularity.DAY,
+        since=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        until=datetime(2026, 3, 1, tzinfo=timezone.utc),
+        now=NOW,
+        rollups=rollups,
+        events=events,
+    )
+    assert (len(rollups.pipelines), len(events.pipelines)) == (1, 1)
+    assert rollups.pipelines[0][0]["$match"]["granularity"] == "day"
+
+
+@pytest.mark.asyncio
+async def test_current_day_reads_closed_hours_from_hourly_rollups():
+    rollups = FakeCollection(
+        [{"_id": {"bucket": datetime(2026, 3, 10), "action": "task_create"}, "count": 40}]
+    )
+    events = FakeCollection(
+        [{"_id": {"bucket": datetime(2026, 3, 10), "action": "task_create"}, "count": 2}]
+    )
+
+    stats = await get_stats(
+        granularity=Granularity.DAY,
+        since=datetime(2026, 3, 10, tzinfo=timezone.utc),
+        group_by=["action"],
+        now=NOW,
+        rollups=rollups,
+        events=events,
+    )
+
+    ((match, group),) = rollups.pipelines
+    assert match["$match"] == {
+        "granularity": "hour",
+        "bucket": {
+            "$gte": datetime(2026, 3, 10, tzinfo=timezone.utc),
+            "$lt": datetime(2026, 3, 10, 12, tzinfo=timezone.utc),
+        },
+    }
+    assert group["$group"]["_id"]["bucket"] == {
+        "$literal": datetime(2026, 3, 10, tzinfo=timezone.utc)
+    }
+    # Only the open hour is read from the raw events
+    assert events.pipelines[0][0]["$match"] == {
+        "timestamp": {"$gte": datetime(2026, 3, 10, 12, tzinfo=timezone.utc)}
+    }
+    assert [(b.bucket.day, b.action, b.count) for b in stats.buckets] == [
+        (10, "task_create", 42)
+    ]
+
+
+def test_stats_endpoint_validates_grouping():
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    stats = EventsStats(
+        granularity="day", since=NOW, until=NOW, group_by=["action"], buckets=[]
+    )
+
+    with patch("app.apis.event_api.get_stats", AsyncMock(return_value=stats)) as get:
+        response = client.get("/events/stats", params={"granularity": "day", "group_by": "action"})
+
+    assert response.status_code == 200
+    assert response.json()["group_by"] == ["action"]
+    assert get.await_args.kwargs["granularity"] is Granularity.DAY
+    assert client.get("/events/stats", params={"group_by": "details"}).status_code == 400
+    assert client.get("/events/stats", params={"granularity": "week"}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_rebuild_sets_totals_from_the_raw_events():
+    bucket = datetime(2026, 3, 10, 11)
+    events = FakeCollection(
+        [
+            {
+                "_id": {"bucket": bucket, "service": "tasks", "action": "task_create", "user_id": "1"},
+                "total": 3,
+            }
+        ]
+    )
+    rollups = FakeCollection()
+
+    written = await rebuild_rollups(
+        Granularity.HOUR, bucket, NOW.replace(minute=0), events=events, rollups=rollups
+    )
+
+    assert written == 1
+    match = events.pipelines[0][0]["$match"]
+    assert match == {"timestamp": {"$gte": bucket, "$lt": NOW.replace(minute=0)}}
+    (operation,) = rollups.operations
+    assert operation._filter == {
+        "granularity": "hour",
+        "bucket": bucket,
+        "service": "tasks",
+        "action": "task_create",
+        "user_id": "1",
+    }
+    # Set, not incremented, so repeated repairs don't add up
+    assert operation._doc == {"$set": {"total": 3}}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_leaves_buckets_the_archive_may_have_emptied():
+    key = {"service": "tasks", "action": "task_update", "user_id": "1"}
+    events = FakeCollection(
+        [
+            {"_id": {"bucket": datetime(2026, 3, 8, 11), **key}, "total": 1},
+            {"_id": {"bucket": datetime(2026, 3, 8, 13), **key}, "total": 5},
+            {
+                "_id": {"bucket": datetime(2026, 3, 8, 11), **key, "action": "task_create"},
+                "total": 2,
+            },
+        ]
+    )
+    rollups = FakeCollection()
+
+    written = await rebuild_rollups(
+        Granularity.HOUR,
+        datetime(2026, 3, 8, tzinfo=timezone.utc),
+        NOW.replace(minute=0),
+        now=NOW,
+        policy=RetentionPolicy({"tasks:task_update": 2}),
+        events=events,
+        rollups=rollups,
+    )
+
+    # The 11:00 task_update bucket started before the 2-day cutoff of 12:30
+    assert written == 2
+    assert [
+        (op._filter["bucket"].hour, op._filter["action"], op._doc["$set"]["total"])
+        for op in rollups.operations
+    ] == [(13, "task_update", 5), (11, "task_create", 2)]
+
+
+@pytest.mark.asyncio
+async def test_repair_only_rebuilds_buckets_closed_for_the_grace_period(monkeypatch):
+    monkeypatch.setattr("app.services.rollup_service.settings.ROLLUP_REPAIR_HOURS", 48)
+    monkeypatch.setattr("app.services.rollup_service.settings.ROLLUP_REPAIR_GRACE_SECONDS", 300)
+    events, rollups = FakeCollection(), FakeCollection()
+
+    await repair_recent_rollups(now=NOW.replace(minute=3), events=events, rollups=rollups)
+
+    hour, day = (pipeline[0]["$match"]["timestamp"] for pipeline in events.pipelines)
+    # 12:03 is within the grace period of the 11:00 bucket, so it stops before it
+    assert hour == {
+        "$gte": datetime(2026, 3, 8, 11, tzinfo=timezone.utc),
+        "$lt": datetime(2026, 3, 10, 11, tzinfo=timezone.utc),
+    }
+    assert day == {
+        "$gte": datetime(2026, 3, 8, tzinfo=timezone.utc),
+        "$lt": datetime(2026, 3, 10, tzinfo=timezone.utc),
+    }
+    assert rollups.operations == []
+
+
+@pytest_asyncio.fixture
+async def mongo_collections():
+    from pymongo import AsyncMongoClient
+
+    client = AsyncMongoClient(MONGO_TEST_URL)
+    database = client.get_database("history_stats_test")
+    await init_beanie(database=database, document_models=[Event, EventRollup])
+    yield Event.get_pymongo_collection(), EventRollup.get_pymongo_collection()
+
+    await client.drop_database("history_stats_test")
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not MONGO_TEST_URL, reason="MONGO_TEST_URL is not set")
+async def test_rollups_rebuilt_from_raw_events_match_a_live_count(mongo_collections):
+    events, rollups = mongo_collections
+    now = datetime.now(timezone.utc).replace(minute=30, second=0, microsecond=0)
+    current_hour = now.replace(minute=0)
+    stored = [
+        Event(
+            service="tasks",
+            action=("task_create", "task_update")[i % 2],
+            user_id=str(i % 3),
+            details={},
+            timestamp=current_hour - timedelta(minutes=20 * i - 10),
+        )
+        for i in range(12)
+    ]
+    await Event.insert_many(stored)
+    # Only the hours before the current one are rolled up; its own events are read raw
+    closed = [e for e in stored if e.timestamp < current_hour]
+
+    written = await rebuild_rollups(
+        Granularity.HOUR,
+        current_hour - timedelta(days=1),
+        current_hour,
+        now=now,
+        policy=RetentionPolicy({}),
+        events=events,
+        rollups=rollups,
+    )
+    assert written == len({(bucket_of(e), e.action, e.user_id) for e in closed})
+
+    hourly = await get_stats(
+        since=current_hour - timedelta(hours=5),
+        group_by=["action"],
+        now=now,
+        rollups=rollups,
+        events=events,
+    )
+    daily = await get_stats(
+        granularity=Granularity.DAY,
+        since=now - timedelta(days=1),
+        group_by=[],
+        now=now,
+        rollups=rollups,
+        events=events,
+    )
+
+    expected = {}
+    for e in stored:
+        key = (bucket_of(e), e.action)
+        expected[key] = expected.get(key, 0) + 1
+    assert {(b.bucket, b.action): b.count for b in hourly.buckets} == expected
+    # Yesterday has no day rollups here, so only the current day is counted, from
+    # its hourly rollups and the raw events of the open hour
+    today = current_hour.replace(hour=0)
+    assert {b.bucket: b.count for b in daily.buckets} == {
+        today: sum(1 for e in stored if e.timestamp >= today)
+    }
+
+
+def bucket_of(event: Event) -> datetime:
+    return event.timestamp.replace(minute=0, second=0, microsecond=0)
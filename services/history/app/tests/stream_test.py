@@ -0,0 +1,192 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.apis.event_api import router
+from app.models.event import Event
+from app.services import stream_service
+from app.services.stream_service import EventStreamHub, publish_events, sse_events
+
+
+def payload(service="tasks", action="task_create", user_id="1"):
+    return json.dumps(
+        {"_id": str(ObjectId()), "service": service, "action": action, "user_id": user_id}
+    )
+
+
+class FakePipeline:
+    def __init__(self, published):
+        self.published = published
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def execute(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.published = []
+        self.fail = fail
+
+    def pipeline(self, transaction=True):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        return FakePipeline(self.published)
+
+
+def hub_without_listener():
+    hub = EventStreamHub()
+    # Nothing to subscribe to in the tests; messages are dispatched directly
+    hub._task = asyncio.get_running_loop().create_future()
+    return hub
+
+
+@pytest.mark.asyncio
+async def test_publish_events_sends_one_message_per_event():
+    client = FakeRedis()
+    events = [
+        Event.model_construct(
+            id=ObjectId(),
+            event_id=f"tasks:outbox:{i}",
+            service="tasks",
+            action="task_create",
+            user_id=str(i),
+            details={},
+            timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        for i in range(2)
+    ]
+
+    await publish_events(events, client=client)
+
+    assert [channel for channel, _ in client.published] == ["history:events"] * 2
+    messages = [json.loads(message) for _, message in client.published]
+    assert [m["_id"] for m in messages] == [str(e.id) for e in events]
+    assert messages[0]["event_id"] == "tasks:outbox:0"
+
+
+@pytest.mark.asyncio
+async def test_publish_events_failure_is_only_logged():
+    event = Event.model_construct(
+        id=ObjectId(),
+        service="tasks",
+        action="task_create",
+        user_id="1",
+        details={},
+        timestamp=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+    await publish_events([event], client=FakeRedis(fail=True))
+
+
+@pytest.mark.asyncio
+async def test_hub_delivers_matching_events_only():
+    hub = hub_without_listener()
+    tasks_only = hub.subscribe(service="tasks")
+    user_2 = hub.subscribe(user_id="2")
+    everything = hub.subscribe()
+
+    hub.dispatch(payload(service="tasks", user_id="1"))
+    hub.dispatch(payload(service="users", user_id="2"))
+
+    assert tasks_only.queue.qsize() == 1
+    assert user_2.queue.qsize() == 1
+    assert everything.queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_hub_ignores_malformed_messages():
+    hub = hub_without_listener()
+    subscription = hub.subscribe()
+
+    hub.dispatch("not json")
+
+    assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_events_without_blocking_others():
+    hub = hub_without_listener()
+    slow = hub.subscribe(max_queued=2)
+    fast = hub.subscribe(max_queued=10)
+
+    for _ in range(5):
+        hub.dispatch(payload())
+
+    assert slow.queue.qsize() == 2
+    assert slow.dropped == 3
+    assert fast.queue.qsize() == 5
+
+
+@pytest.mark.asyncio
+async def test_sse_events_reports_drops_before_the_next_event():
+    hub = hub_without_listener()
+    subscription = hub.subscribe(max_queued=1)
+    first, second = payload(), payload()
+    hub.dispatch(first)
+    hub.dispatch(second)
+
+    with patch.object(stream_service, "hub", hub):
+        stream = sse_events(subscription, heartbeat=10)
+        assert await stream.__anext__() == ": connected\n\n"
+        assert await stream.__anext__() == "event: dropped\ndata: {\"count\": 1}\n\n"
+        message = await stream.__anext__()
+        await stream.aclose()
+
+    assert message == f"id: {json.loads(first)['_id']}\nevent: event\ndata: {first}\n\n"
+    assert subscription not in hub.subscriptions
+
+
+@pytest.mark.asyncio
+async def test_sse_events_sends_heartbeats_when_idle():
+    hub = hub_without_listener()
+    subscription = hub.subscribe()
+
+    with patch.object(stream_service, "hub", hub):
+        stream = sse_events(subscription, heartbeat=0.01)
+        await stream.__anext__()
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        await stream.aclose()
+
+
+def test_stream_endpoint_filters_and_streams_events():
+    app = FastAPI()
+    app.include_router(router)
+    message = payload(service="tasks")
+    subscriptions = []
+
+    class StubHub:
+        def subscribe(self, **filters):
+            subscriptions.append(filters)
+            subscription = stream_service.Subscription({}, 10)
+            subscription.offer("1", message)
+            return subscription
+
+    async def finite_events(subscription):
+        yield ": connected\n\n"
+        event_id, data = await subscription.get()
+        yield f"id: {event_id}\nevent: event\ndata: {data}\n\n"
+
+    with patch("app.apis.event_api.hub", StubHub()), patch(
+        "app.apis.event_api.sse_events", finite_events
+    ):
+        response = TestClient(app).get("/events/stream", params={"service": "tasks"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert subscriptions == [{"service": "tasks", "action": None, "user_id": None}]
+    assert f"data: {message}" in response.text
@@ -0,0 +1,108 @@
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from celery_batches import SimpleRequest
+from opentelemetry import propagate
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core.tracing import (
+    PUBLISHED_AT_HEADER,
+    configure_tracing,
+    extract_task_context,
+    tracer,
+)
+from app.services.event_service import BatchInsertResult, create_event
+from app.tasks.event_task import process_event_background
+
+EXPORTER = InMemorySpanExporter()
+configure_tracing(EXPORTER)
+
+SERVICES_DIR = Path(__file__).resolve().parents[3]
+TRACING_COPIES = [
+    SERVICES_DIR / "history" / "app" / "core" / "tracing.py",
+    SERVICES_DIR / "users" / "utils" / "tracing.py",
+]
+
+
+def _shared_code(path: Path) -> str:
+    source = path.read_text()
+    start = source.index("# configure_tracing, _build_exporter and tracer are the same")
+    return source[start : source.index("# End of the code shared between the services")]
+
+
+@pytest.fixture(autouse=True)
+def spans():
+    EXPORTER.clear()
+    yield EXPORTER
+    EXPORTER.clear()
+
+
+def published_headers():
+    """Headers as the users service attaches them when publishing."""
+    headers = {}
+    with tracer().start_as_current_span("POST api/v1/auth/register/"):
+        propagate.inject(headers)
+    headers[PUBLISHED_AT_HEADER] = str(time.time_ns() - 5_000_000)
+    return headers
+
+
+def test_context_is_read_from_request_attributes_and_headers():
+    headers = published_headers()
+    trace_id = EXPORTER.get_finished_spans()[0].context.trace_id
+
+    for request in (SimpleNamespace(**headers), SimpleNamespace(headers=headers)):
+        parent = extract_task_context(request)
+        with tracer().start_as_current_span("child", context=parent) as span:
+            assert span.get_span_context().trace_id == trace_id
+
+
+@pytest.mark.asyncio
+async def test_create_event_traces_the_insert(spans):
+    with patch("app.services.event_service.Event") as MockEvent:
+        MockEvent.return_value = MagicMock(id="event-1", insert=AsyncMock())
+        await create_event(
+            {"service": "users", "action": "user_register", "user_id": "1", "details": {}}
+        )
+
+    insert, create = spans.get_finished_spans()
+    assert create.name == "create_event"
+    assert insert.name == "events insert"
+    assert insert.parent.span_id == create.context.span_id
+    assert insert.attributes["db.system"] == "mongodb"
+
+
+def test_worker_continues_the_publisher_trace(spans):
+    headers = published_headers()
+    trace_id = spans.get_finished_spans()[0].context.trace_id
+    request = SimpleRequest(
+        "task-1", process_event_background.name, ({},), {}, {}, "worker", True,
+        None, None, headers,
+    )
+
+    with patch(
+        "app.tasks.event_task.create_events", AsyncMock(return_value=BatchInsertResult())
+    ), patch("app.tasks.worker_loop.connect_to_mongo", AsyncMock()):
+        process_event_background([request])
+
+    names = {span.name: span for span in spans.get_finished_spans()}
+    assert {"history wait", "history process"} <= names.keys()
+    assert names["history wait"].context.trace_id == trace_id
+    # The batch span has its own trace, linked to every message it processed
+    process = names["history process"]
+    assert [link.context.trace_id for link in process.links] == [trace_id]
+    assert process.attributes["messaging.batch.message_count"] == 1
+    wait = names["history wait"]
+    assert wait.end_time - wait.start_time >= 5_000_000
+
+
+@pytest.mark.skipif(
+    not all(path.exists() for path in TRACING_COPIES),
+    reason="the users service is not checked out next to this one",
+)
+def test_tracing_setup_matches_the_users_service():
+    history, users = (_shared_code(path) for path in TRACING_COPIES)
+
+    assert users == history
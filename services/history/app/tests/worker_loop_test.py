@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.event_service import BatchInsertResult
+from app.tasks import worker_loop
+from app.tasks.event_task import process_event_background
+
+
+@pytest.fixture
+def mongo():
+    with patch("app.tasks.worker_loop.connect_to_mongo", AsyncMock()) as connect, patch(
+        "app.tasks.worker_loop.close_mongo", AsyncMock()
+    ) as close:
+        yield connect, close
+    worker_loop.stop_worker_loop()
+
+
+def test_tasks_share_one_loop_and_connection(mongo):
+    connect, close = mongo
+    loops = []
+
+    async def create_events(events_data):
+        loops.append(asyncio.get_running_loop())
+        return BatchInsertResult(inserted_ids=["event-1"])
+
+    worker_loop.init_worker_process()
+    with patch("app.tasks.event_task.create_events", create_events):
+        for _ in range(3):
+            process_event_background.apply(args=[{}])
+
+    assert len(set(map(id, loops))) == 1
+    assert connect.await_count == 4  # once at start, then a no-op check per task
+
+    worker_loop.shutdown_worker_process()
+
+    close.assert_awaited_once()
+    assert loops[0].is_closed()
+
+
+def test_failed_connection_is_retried_on_the_same_loop(mongo):
+    connect, _ = mongo
+    connect.side_effect = [ConnectionError("mongo is down")] + [None] * 3
+
+    worker_loop.init_worker_process()
+    loop = worker_loop.start_worker_loop()
+
+    assert connect.await_count == 2
+    assert worker_loop.start_worker_loop() is loop
+    assert worker_loop.run_in_worker_loop(asyncio.sleep(0, "ok")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_connect_reuses_the_process_client():
+    from app.db import database
+
+    with patch("app.db.database.AsyncMongoClient") as MockClient, patch(
+        "app.db.database.init_beanie", AsyncMock()
+    ) as init:
+        MockClient.return_value.close = AsyncMock()
+        first = await database.connect_to_mongo()
+        second = await database.connect_to_mongo()
+        await database.close_mongo()
+        await database.close_mongo()
+
+    assert first is second
+    MockClient.assert_called_once()
+    init.assert_awaited_once()
+    first.close.assert_awaited_once()
@@ -0,0 +1,125 @@
+"""
+Compare the GET /events/ read paths, in events per second per core.
+
+    python -m benchmarks.read_bench [--mongo-url URL] [--events 10000]
+        [--page-size 100] [--pages 200] [--details-keys 20]
+
+Seeds `--events` events into the `history_read_bench` database of `--mongo-url`
+(MONGO_TEST_URL by default), dropped afterwards, then reads `--pages` pages of
+`--page-size` events from the query to the JSON body, the way the endpoint does.
+
+"documents" is what the endpoint used to do: Beanie `Event` documents, an
+`EventResponse` built from each `model_dump`, then FastAPI's response_model
+validation and serialization. "raw/<details>" is `get_events` with that details
+view, dumped by `event_responses`.
+
+Rates are events over the CPU time of this process, so the time spent waiting on
+the server is left out and the figure is per core.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from beanie import init_beanie
+from fastapi.routing import serialize_response
+from pymongo import AsyncMongoClient
+from app.apis.event_api import router
+from app.models.event import Event
+from app.schemas.event_schema import DetailsView, EventResponse, event_responses
+from app.services.event_service import events_query, get_events
+
+DATABASE = "history_read_bench"
+WARMUP_PAGES = 5
+
+
+def sample_event(i: int, details_keys: int, now: datetime) -> dict:
+    """An outbox task event: a few ids, a snapshot of the task and its changes."""
+    details = {"aggregate_type": "task", "aggregate_id": i}
+    for key in range(details_keys):
+        details[f"field_{key}"] = f"value {key} of task {i} " * 4
+    details["changes"] = {"status": ["todo", "in_progress"], "tags": [f"tag-{t}" for t in range(5)]}
+    return {
+        "_id": ObjectId(),
+        "event_id": f"tasks:outbox:{i}",
+        "service": "tasks",
+        "action": "task_update",
+        "user_id": str(i % 50),
+        "details": details,
+        "timestamp": now - timedelta(seconds=i),
+    }
+
+
+def _response_field():
+    return next(route for route in router.routes if route.path == "/events/").response_field
+
+
+async def documents_page(limit: int, response_field) -> bytes:
+    events = await events_query().limit(limit).to_list()
+    page = [EventResponse(**event.model_dump(by_alias=True)) for event in events]
+    return await serialize_response(field=response_field, response_content=page, dump_json=True)
+
+
+async def raw_page(limit: int, details: DetailsView) -> bytes:
+    page = await get_events(limit=limit, details=details)
+    return event_responses.dump_json(page.events, by_alias=True)
+
+
+async def _rate(read_page, pages: int, page_size: int) -> float:
+    for _ in range(WARMUP_PAGES):
+        await read_page()
+    started = time.process_time()
+    for _ in range(pages):
+        await read_page()
+    return pages * page_size / (time.process_time() - started)
+
+
+async def run(mongo_url: str, events: int, page_size: int, pages: int, details_keys: int) -> dict:
+    client = AsyncMongoClient(mongo_url)
+    try:
+        database = client.get_database(DATABASE)
+        await init_beanie(database=database, document_models=[Event])
+        now = datetime.now(timezone.utc)
+        await Event.get_pymongo_collection().insert_many(
+            [sample_event(i, details_keys, now) for i in range(events)]
+        )
+
+        response_field = _response_field()
+        results = {
+            "documents": await _rate(
+                lambda: documents_page(page_size, response_field), pages, page_size
+            )
+        }
+        for details in DetailsView:
+            results[f"raw/{details.value}"] = await _rate(
+                lambda: raw_page(page_size, details), pages, page_size
+            )
+        return results
+    finally:
+        await client.drop_database(DATABASE)
+        await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mongo-url", default=os.getenv("MONGO_TEST_URL"))
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--details-keys", type=int, default=20)
+    args = parser.parse_args()
+    if not args.mongo_url:
+        parser.error("--mongo-url or MONGO_TEST_URL is required")
+
+    results = asyncio.run(
+        run(args.mongo_url, args.events, args.page_size, args.pages, args.details_keys)
+    )
+
+    baseline = results["documents"]
+    for case, rate in results.items():
+        print(f"{case:>14}: {rate:>10.0f} events/s per core | x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
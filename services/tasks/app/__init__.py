@@ -11,8 +11,31 @@ migrate = Migrate()
 def create_app() -> Flask:
     app = Flask(__name__)
 
+    if settings.PROXY_FIX_HOPS:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        # remote_addr becomes the client the trusted proxies saw, not the last proxy
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app, x_for=settings.PROXY_FIX_HOPS, x_proto=settings.PROXY_FIX_HOPS
+        )
+
     migrate.init_app(app=app, db=None, directory="./migrations")
 
+    from .core.decoding import RequestDecodeError, handle_decode_error
+
+    app.config["MAX_CONTENT_LENGTH"] = settings.MAX_BODY_BYTES
+    app.register_error_handler(RequestDecodeError, handle_decode_error)
+
+    from .core.metrics import init_metrics
+    from .core.profiling import init_profiling
+    from .core.compression import init_compression
+
+    init_metrics(app)
+
+    # Profiling first, so its after_request hook runs last and covers compression
+    init_profiling(app)
+    init_compression(app)
+
     from .apis.project_api import project_bp
 
     app.register_blueprint(project_bp)
@@ -22,5 +45,11 @@ def create_app() -> Flask:
     from .apis.task_api import task_bp
 
     app.register_blueprint(task_bp)
+    from .apis.job_api import job_bp
+
+    app.register_blueprint(job_bp)
+    from .apis.admin_api import admin_bp
+
+    app.register_blueprint(admin_bp)
 
     return app
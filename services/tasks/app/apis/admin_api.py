@@ -0,0 +1,42 @@
+from app import settings
+from app.db.slow_queries import slow_query_log
+from flask import Blueprint, jsonify, request, abort
+import hmac
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/api/v1/admin")
+
+
+@admin_bp.before_request
+def require_admin_token():
+    """
+    Admin endpoints are only served when ADMIN_TOKEN is configured
+    and the request carries it in the X-Admin-Token header.
+    """
+    if not settings.ADMIN_TOKEN:
+        abort(404)
+
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        return jsonify({"error": "Invalid admin token"}), 403
+
+
+@admin_bp.route("/slow-queries", methods=["GET"])
+def slow_queries_list():
+    """
+    Retrieve the most recent slow and timed-out queries, with their plans once captured.
+    """
+
+    try:
+        return jsonify(slow_query_log.entries()), 200
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 500
+
+
+@admin_bp.route("/slow-queries", methods=["DELETE"])
+def slow_queries_clear():
+    """
+    Clear the slow query log.
+    """
+
+    slow_query_log.clear()
+    return jsonify({"message": "Slow query log cleared"}), 200
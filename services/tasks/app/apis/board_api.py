@@ -6,8 +6,16 @@ from app.services.board_service import (
     get_board_by_project,
     delete_board,
 )
-from flask import Blueprint, jsonify, request
+from app.services.board_events import board_event_hub
+from app.services.task_service import get_board_changes
+from app.schemas.task_schema import BoardChanges
+from app import settings
+from app.core.admission import admission_control
+from app.core.decoding import decode_body
+from app.db.database import route_timeouts
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from utils.openapi.decorators import document
+import json
 
 board_bp = Blueprint("board", __name__, url_prefix="/api/v1/boards/")
 
@@ -36,6 +44,8 @@ board_bp = Blueprint("board", __name__, url_prefix="/api/v1/boards/")
     response_schema=BoardResponse,
 )
 @board_bp.route("/", methods=["GET"])
+@admission_control("boards_list")
+@route_timeouts(statement_timeout_ms=settings.LIST_STATEMENT_TIMEOUT_MS)
 def boards_list():
     """
     Retrieve a list of boards for a specific project.
@@ -46,7 +56,12 @@ def boards_list():
         limit = request.args.get("limit")
         offset = request.args.get("offset")
 
-        boards = get_board_by_project(project_id=project_id, limit=limit, offset=offset)
+        if project_id is None or not project_id.isdigit():
+            return jsonify({"error": "project_id must be a non-negative integer"}), 400
+
+        boards = get_board_by_project(
+            project_id=int(project_id), limit=limit, offset=offset
+        )
 
         data = [board.model_dump() for board in boards]
 
@@ -81,13 +96,9 @@ def board_create():
     Create a new board.
     """
 
-    data = request.get_json()
-
-    if not data:
-        return jsonify({"error": "No Data Provided"}), 400
+    board_data = decode_body(BoardCreate)
 
     try:
-        board_data = BoardCreate(**data)
         created_board = create_board(board_data=board_data)
         return jsonify(created_board.model_dump())
     except Exception as e:
@@ -103,13 +114,9 @@ def board_update(board_id: int):
     """
     Update a specific board by its ID.
     """
-    data = request.get_json()
-
-    if not data:
-        return jsonify({"error": "No Data Provided"}), 400
+    board_data = decode_body(BoardUpdate)
 
     try:
-        board_data = BoardUpdate(**data)
         updated_board = update_board(board_id=board_id, board_data=board_data)
         return jsonify(updated_board.model_dump())
     except Exception as e:
@@ -131,3 +138,84 @@ def board_delete(board_id: int):
         return jsonify({"message": "Board Deleted Successfully"}), 200
     except Exception as e:
         return jsonify({"error": f"{e}"}), 500
+
+
+@document(
+    query_params=[
+        {
+            "name": "since",
+            "type": "string",
+            "required": False,
+            "description": "Cursor returned by the previous sync; omit for a full sync",
+        },
+        {
+            "name": "limit",
+            "type": "integer",
+            "required": False,
+            "description": "The maximum number of changes to return",
+        },
+    ],
+    response_schema=BoardChanges,
+)
+@board_bp.route("/<int:board_id>/changes", methods=["GET"])
+@admission_control("board_changes")
+@route_timeouts(statement_timeout_ms=settings.LIST_STATEMENT_TIMEOUT_MS)
+def board_changes(board_id: int):
+    """
+    Retrieve the tasks created, updated or removed on a board since a cursor.
+    """
+
+    try:
+        since = request.args.get("since", "0")
+        limit = request.args.get("limit", "500")
+
+        if not since.isdigit() or not limit.isdigit():
+            return jsonify({"error": "since and limit must be non-negative integers"}), 400
+
+        changes = get_board_changes(board_id=board_id, since=since, limit=limit)
+
+        return jsonify(changes.model_dump(mode="json")), 200
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 500
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@board_bp.route("/<int:board_id>/stream", methods=["GET"])
+def board_stream(board_id: int):
+    """
+    Stream live task deltas for a board as Server-Sent Events.
+    """
+
+    try:
+        get_board_by_id(board_id=board_id)
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 404
+
+    subscription = board_event_hub.subscribe(board_id)
+
+    def events():
+        try:
+            yield _sse("subscribed", {"board_id": board_id})
+            while True:
+                if subscription.overflowed:
+                    subscription.reset()
+                    yield _sse("resync", {"board_id": board_id})
+                    continue
+
+                event = subscription.get(timeout=settings.BOARD_STREAM_HEARTBEAT)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield _sse(event["type"], event)
+        finally:
+            board_event_hub.unsubscribe(subscription)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,69 @@
+from logging import getLogger
+from app.schemas.job_schema import JobCreate, JobResponse
+from app.services.job_service import submit_job, get_job
+from app.tasks.jobs import enqueue_job
+from app.core.decoding import decode_body
+from flask import Blueprint, Response, jsonify, request
+from utils.openapi.decorators import document
+
+logger = getLogger(__name__)
+
+job_bp = Blueprint("job", __name__, url_prefix="/api/v1/jobs/")
+
+
+def job_accepted(job: JobResponse, created: bool) -> Response:
+    """Enqueue a newly stored job and answer 202 with its status URL."""
+    if created:
+        try:
+            enqueue_job(job.id)
+        except Exception as e:
+            # The job is stored; a worker picks up stalled pending jobs when it starts
+            logger.error(f"Failed to enqueue job {job.id}: {e}", exc_info=True)
+
+    response = jsonify(job.model_dump(mode="json"))
+    response.status_code = 202
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return response
+
+
+@document(
+    request_schema=JobCreate,
+    response_schema=JobResponse,
+)
+@job_bp.route("/", methods=["POST"])
+def job_create():
+    """
+    Submit a background job.
+
+    Responds with 202 and the job; poll the `Location` URL for its progress.
+    An `Idempotency-Key` header (or `idempotency_key` field) makes resubmissions
+    return the original job.
+    """
+
+    job_data = decode_body(JobCreate)
+    job_data.idempotency_key = job_data.idempotency_key or request.headers.get(
+        "Idempotency-Key"
+    )
+
+    try:
+        job, created = submit_job(job_data=job_data)
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 500
+
+    return job_accepted(job, created)
+
+
+@document(response_schema=JobResponse)
+@job_bp.route("/<job_id>", methods=["GET"])
+def job_get(job_id: str):
+    """
+    Retrieve a job's status, progress and result.
+    """
+
+    try:
+        job = get_job(job_id=job_id)
+        return jsonify(job.model_dump(mode="json")), 200
+    except ValueError as e:
+        return jsonify({"error": f"{e}"}), 404
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 500
@@ -5,11 +5,17 @@ from app.services.project_service import (
     update_project,
     delete_project,
 )
+from app.schemas.job_schema import JobResponse
 from app.schemas.project_schema import (
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
 )
+from app.apis.job_api import job_accepted
+from app.core.admission import admission_control
+from app.core.decoding import decode_body
+from app.db.database import route_timeouts
+from app import settings
 from flask import Blueprint, request, jsonify
 from utils.openapi.decorators import document
 
@@ -40,6 +46,8 @@ project_bp = Blueprint("project", __name__, url_prefix="/api/v1/projects")
     response_schema=ProjectResponse,
 )
 @project_bp.route("/", methods=["GET"])
+@admission_control("projects_list")
+@route_timeouts(statement_timeout_ms=settings.LIST_STATEMENT_TIMEOUT_MS)
 def projects_list():
     """
     Retrieve a paginated list of projects filtered by owner.
@@ -80,13 +88,9 @@ def project_create():
     """
     Create a new project with provided data.
     """
-    try:
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "No data found"}), 400
+    project_data = decode_body(ProjectCreate)
 
-        project_data = ProjectCreate(**data)
+    try:
         project = create_project(project_data=project_data)
         return jsonify(project.model_dump()), 201
     except Exception as e:
@@ -102,13 +106,9 @@ def project_update(project_id: int):
     """
     Update an existing project with new data.
     """
-    try:
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"error": "No data found"}), 400
+    project_data = decode_body(ProjectUpdate)
 
-        project_data = ProjectUpdate(**data)
+    try:
         project = update_project(project_id=project_id, project_data=project_data)
 
         if not project:
@@ -119,13 +119,20 @@ def project_update(project_id: int):
         return jsonify({"error": f"Failed to create project:{str(e)}"})
 
 
+@document(response_schema=JobResponse)
 @project_bp.route("/<int:project_id>", methods=["DELETE"])
 def project_delete(project_id: int):
     """
     Delete a project by ID.
+
+    The deletion runs as a background job: responds with 202 and the job, whose
+    progress can be polled at the `Location` URL.
     """
     try:
-        delete_project(project_id=project_id)
-        return jsonify({"message": "Project Deleted Successfully!"}), 200
-    except Exception as e:
+        job, created = delete_project(project_id=project_id)
+    except ValueError as e:
         return jsonify({"error": f"Failed to delete project: {str(e)}"}), 404
+    except Exception as e:
+        return jsonify({"error": f"Failed to delete project: {str(e)}"}), 500
+
+    return job_accepted(job, created)
@@ -5,7 +5,12 @@ from app.services.task_service import (
     create_task,
     update_task,
     delete_task,
+    get_task_stats,
 )
+from app.core.admission import admission_control
+from app.core.decoding import decode_body
+from app.db.database import route_timeouts
+from app import settings
 from flask import jsonify, request, Blueprint
 from utils.openapi.decorators import document
 
@@ -60,6 +65,8 @@ task_bp = Blueprint("task", __name__, url_prefix="/api/v1/tasks/")
     response_schema=TaskResponse,
 )
 @task_bp.route("/", methods=["GET"])
+@admission_control("tasks_list")
+@route_timeouts(statement_timeout_ms=settings.LIST_STATEMENT_TIMEOUT_MS)
 def tasks_list():
     """
     Retrieve a list of tasks based on optional query parameters.
@@ -74,8 +81,18 @@ def tasks_list():
         limit = request.args.get("limit")
         offset = request.args.get("offset")
 
+        if board_id is not None and not board_id.isdigit():
+            return jsonify({"error": "board_id must be a non-negative integer"}), 400
+
+        # Compared with an integer column, Postgres rejects the raw query string
         tasks = get_tasks(
-            board_id, user_id, assigned_to, status, priority, limit, offset
+            int(board_id) if board_id else None,
+            user_id,
+            assigned_to,
+            status,
+            priority,
+            limit,
+            offset,
         )
 
         data = [task.model_dump() for task in tasks]
@@ -87,6 +104,23 @@ def tasks_list():
         return jsonify({"error": f"{e}"}), 500
 
 
+@document(response_schema=TaskStats)
+@task_bp.route("/stats", methods=["GET"])
+@admission_control("tasks_stats", max_concurrent=2, cost=5)
+@route_timeouts(statement_timeout_ms=settings.REPORT_STATEMENT_TIMEOUT_MS)
+def tasks_stats():
+    """
+    Retrieve task counts by status, priority and user.
+    """
+
+    try:
+        stats = get_task_stats()
+        return jsonify(TaskStats(**stats).model_dump()), 200
+
+    except Exception as e:
+        return jsonify({"error": f"{e}"}), 500
+
+
 @document(response_schema=TaskResponse)
 @task_bp.route("/<int:task_id>", methods=["GET"])
 def task_get(task_id: int):
@@ -113,12 +147,9 @@ def task_create():
     Create a new task.
     """
 
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "No Data Provided"})
-    try:
+    task_data = decode_body(TaskCreate)
 
-        task_data = TaskCreate(**data)
+    try:
         created_task = create_task(task_data=task_data)
         return jsonify(created_task.model_dump())
     except Exception as e:
@@ -135,12 +166,9 @@ def task_update(task_id):
     Update an existing task.
     """
 
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "No Data Provided"}), 400
+    task_data = decode_body(TaskUpdate)
 
     try:
-        task_data = TaskUpdate(**data)
         updated_task = update_task(task_id=task_id, task_data=task_data)
         return jsonify(updated_task.model_dump())
     except Exception as e:
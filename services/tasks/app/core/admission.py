@@ -0,0 +1,167 @@
+import math
+import threading
+import time
+from functools import wraps
+from logging import getLogger
+from typing import Callable, Dict, Optional, Tuple
+from flask import jsonify, request
+from app import settings
+
+logger = getLogger(__name__)
+
+# Refill-and-take in one atomic step. Uses the Redis clock so that all app
+# processes agree on elapsed time. Returns {allowed, retry_after_seconds}.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class TokenBucketQuota:
+    """
+    Redis-backed token buckets shared by every process of the service.
+
+    Quotas fail open: when Redis is not configured or unreachable requests are
+    admitted, and Redis is not retried for a short back-off window.
+    """
+
+    FAILURE_BACKOFF = 30.0
+
+    def __init__(self, redis_url: str = settings.REDIS_URL):
+        self.redis_url = redis_url
+        self._script = None
+        self._disabled_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            import redis
+
+            client = redis.Redis.from_url(
+                self.redis_url, socket_timeout=0.05, socket_connect_timeout=0.05
+            )
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from the bucket at `key`.
+
+        Returns:
+            Tuple[bool, float]: Whether the request is admitted, and the seconds until it would be
+        """
+        if not self.redis_url or time.monotonic() < self._disabled_until:
+            return True, 0.0
+
+        try:
+            allowed, retry_after = self._get_script()(
+                keys=[f"{settings.SERVICE_NAME}:quota:{key}"], args=[rate, burst, cost]
+            )
+            return bool(allowed), float(retry_after)
+        except Exception as e:
+            logger.warning(f"Quota check skipped, Redis unavailable: {e}")
+            self._disabled_until = time.monotonic() + self.FAILURE_BACKOFF
+            return True, 0.0
+
+
+quota = TokenBucketQuota()
+
+_concurrency_limits: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def default_quota_key() -> str:
+    """
+    Identify the caller by the owner the request is scoped to, else by client address.
+
+    The service has no authentication of its own, so the owner is the
+    `owner_id` / `user_id` the listing is filtered by; every client reading one
+    owner's data shares that owner's quota. Other requests fall back to the
+    client address, which is only the real client's when the app runs directly
+    or behind ProxyFix configured with PROXY_FIX_HOPS.
+    """
+    owner_id = request.args.get("owner_id") or request.args.get("user_id")
+    if owner_id:
+        return f"owner:{owner_id}"
+    return f"addr:{request.remote_addr or 'anonymous'}"
+
+
+def _rejected(message: str, status: int, retry_after: float):
+    response = jsonify({"error": message})
+    response.status_code = status
+    response.headers["Retry-After"] = str(
+        max(settings.ADMISSION_RETRY_AFTER, math.ceil(retry_after))
+    )
+    return response
+
+
+def admission_control(
+    name: str,
+    max_concurrent: Optional[int] = None,
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    cost: int = 1,
+    key_func: Callable[[], str] = default_quota_key,
+):
+    """
+    Guard an expensive endpoint with a per-process concurrency limit and a per-caller quota.
+
+    Requests over the concurrency limit get an immediate 503, callers that ran out
+    of quota get a 429; both carry a Retry-After header. Apply it below the route
+    decorator so Flask registers the guarded function.
+
+    Args:
+        name (str): The endpoint's name, used for the limiter and the quota key
+        max_concurrent (Optional[int]): In-flight requests allowed per process. Defaults to settings.HEAVY_ENDPOINT_CONCURRENCY.
+        rate (Optional[float]): Tokens refilled per second. Defaults to settings.QUOTA_RATE.
+        burst (Optional[int]): Bucket size. Defaults to settings.QUOTA_BURST.
+        cost (int): Tokens taken per request
+        key_func (Callable[[], str]): Resolves the caller the quota applies to
+    """
+    max_concurrent = max_concurrent or settings.HEAVY_ENDPOINT_CONCURRENCY
+    rate = rate or settings.QUOTA_RATE
+    burst = burst or settings.QUOTA_BURST
+
+    limiter = _concurrency_limits.setdefault(
+        name, threading.BoundedSemaphore(max_concurrent)
+    )
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Concurrency first, so a request turned away with 503 spends no quota
+            if not limiter.acquire(blocking=False):
+                return _rejected("Server busy, try again later", 503, 0)
+
+            try:
+                allowed, retry_after = quota.take(f"{name}:{key_func()}", rate, burst, cost)
+                if not allowed:
+                    return _rejected("Rate limit exceeded", 429, retry_after)
+
+                return func(*args, **kwargs)
+            finally:
+                limiter.release()
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,176 @@
+"""
+Response compression for the Flask app.
+
+`init_compression` installs an after_request hook that rewrites a finished
+response: buffered bodies are compressed in one go, streamed ones are wrapped in
+a generator that compresses and flushes each chunk as the view yields it.
+"""
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+from flask import Flask, Response, request
+from app import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/yaml",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# The board stream's events are tiny and must not wait in a compressor buffer,
+# so it is sent as is even though it is text.
+EXCLUDED_MIMETYPES = {"text/event-stream"}
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = max(1, min(level, 9))
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, level: int):
+        self.quality = max(0, min(level, 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self.compressor = zstandard.ZstdCompressor(level=max(1, min(level, 22)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = self.compressor.compressobj()
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        yield compressor.flush()
+
+
+def available_encoders(level: int) -> Dict[str, object]:
+    """
+    Build one encoder per supported encoding, most preferred first. zstd and
+    brotli are left out when their packages are missing; gzip is always there.
+    """
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder(level)
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder(level)
+    encoders["gzip"] = GzipEncoder(level)
+    return encoders
+
+
+def negotiate(accept_encodings, encoders: Dict[str, object]) -> Optional[object]:
+    """
+    Choose from werkzeug's parsed Accept-Encoding. The highest q-value wins and
+    equal ones go to whichever encoder `encoders` lists first; None when the
+    client accepts none of them.
+    """
+    best, best_quality = None, 0
+    for name, encoder in encoders.items():
+        quality = accept_encodings[name]
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+
+def _is_compressible(response: Response) -> bool:
+    mimetype = response.mimetype or ""
+    if mimetype in EXCLUDED_MIMETYPES:
+        return False
+    return (
+        mimetype.startswith("text/")
+        or mimetype in COMPRESSIBLE_MIMETYPES
+        or mimetype.endswith("+json")
+    )
+
+
+def init_compression(
+    app: Flask, minimum_size: Optional[int] = None, level: Optional[int] = None
+) -> None:
+    """
+    Register the after_request hook that encodes responses for the client.
+
+    A buffered body is left alone below `minimum_size`, where the headers would
+    outweigh the savings. A streamed body's size is unknown up front, so it is
+    always encoded, with a flush after every chunk the view yields.
+
+    Args:
+        app (Flask): The application to install the hook on
+        minimum_size (Optional[int]): Smallest body worth compressing. Defaults to settings.COMPRESSION_MIN_SIZE.
+        level (Optional[int]): Compression level. Defaults to settings.COMPRESSION_LEVEL.
+    """
+    minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+    level = settings.COMPRESSION_LEVEL if level is None else level
+    encoders = available_encoders(level)
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or request.method == "HEAD"
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+            or not _is_compressible(response)
+        ):
+            return response
+
+        encoder = negotiate(request.accept_encodings, encoders)
+        response.vary.add("Accept-Encoding")
+        if encoder is None:
+            return response
+
+        if response.is_streamed:
+            chunks = response.iter_encoded()
+            response.response = encoder.stream(chunks)
+            response.headers.pop("Content-Length", None)
+            response.direct_passthrough = False
+        else:
+            data = response.get_data()
+            if len(data) < minimum_size:
+                return response
+            response.set_data(encoder.compress(data))
+
+        response.headers["Content-Encoding"] = encoder.name
+        return response
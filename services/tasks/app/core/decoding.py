@@ -0,0 +1,65 @@
+from typing import Any, List, Optional, Type, TypeVar
+from flask import jsonify, request
+from pydantic import BaseModel, ValidationError
+from app import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+# Bodies that carry no fields at all are rejected before validation
+EMPTY_BODIES = {b"", b"{}", b"null"}
+
+
+class RequestDecodeError(ValueError):
+    """Raised when a request body is missing, too large or fails validation."""
+
+    def __init__(self, message: str, status: int = 400, details: Optional[List[Any]] = None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.details = details
+
+
+def decode_body(model: Type[M], max_bytes: Optional[int] = None) -> M:
+    """
+    Validate the raw request body straight into a Pydantic model.
+
+    The bytes are handed to `model_validate_json`, so the JSON is parsed and
+    validated in one pass without building an intermediate dict.
+
+    Args:
+        model (Type[M]): The schema to validate against
+        max_bytes (Optional[int]): Body size limit. Defaults to settings.MAX_BODY_BYTES.
+
+    Raises:
+        RequestDecodeError: 400 for empty or invalid bodies, 413 for bodies over the limit
+
+    Returns:
+        M: The validated model
+    """
+    max_bytes = max_bytes or settings.MAX_BODY_BYTES
+
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise RequestDecodeError("Request body too large", status=413)
+
+    raw = request.get_data(cache=False)
+
+    if len(raw) > max_bytes:
+        raise RequestDecodeError("Request body too large", status=413)
+
+    if raw.strip() in EMPTY_BODIES:
+        raise RequestDecodeError("No Data Provided")
+
+    try:
+        return model.model_validate_json(raw)
+    except ValidationError as e:
+        raise RequestDecodeError(
+            "Invalid request body",
+            details=e.errors(include_url=False, include_context=False, include_input=False),
+        )
+
+
+def handle_decode_error(error: RequestDecodeError):
+    body = {"error": error.message}
+    if error.details is not None:
+        body["details"] = error.details
+    return jsonify(body), error.status
@@ -0,0 +1,181 @@
+import os
+import time
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+# With PROMETHEUS_MULTIPROC_DIR set (required under pre-fork servers), every
+# process writes its samples there and /metrics aggregates all of them.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route"],
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+db_pool_checkout_timeouts_total = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that gave up waiting for a connection",
+)
+db_pool_connections_in_use = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond the pool size",
+    multiprocess_mode="livesum",
+)
+db_pool_size = Gauge(
+    "db_pool_size",
+    "Configured pool size",
+    multiprocess_mode="livesum",
+)
+
+celery_tasks_published_total = Counter(
+    "celery_tasks_published_total",
+    "Celery tasks published",
+    ["task", "outcome"],
+)
+
+outbox_events_dead_lettered_total = Counter(
+    "outbox_events_dead_lettered_total",
+    "Outbox events given up on after repeated publish failures",
+)
+
+
+def registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of a dead worker; call it from the server's child-exit hook."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _update_pool_gauges(pool) -> None:
+    if hasattr(pool, "overflow"):
+        db_pool_overflow.set(max(0, pool.overflow()))
+        db_pool_size.set(pool.size())
+
+
+def _time_checkouts(pool) -> None:
+    """
+    Wrap `pool.connect` to time how long callers wait for a connection.
+
+    The pool has no event that fires before a checkout starts, so the wait is
+    measured around the call the engine makes for every new connection.
+    """
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        except exc.TimeoutError:
+            db_pool_checkout_timeouts_total.inc()
+            raise
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    _update_pool_gauges(pool)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Export checkout wait, in-use and overflow stats of the engine's pool."""
+    _time_checkouts(engine.pool)
+
+    @event.listens_for(engine, "engine_disposed")
+    def _pool_recreated(engine):
+        _time_checkouts(engine.pool)
+
+    # Pool events registered on the engine follow it across pool re-creation
+    @event.listens_for(engine, "checkout")
+    def _checked_out(dbapi_connection, connection_record, connection_proxy):
+        db_pool_connections_in_use.inc()
+        _update_pool_gauges(engine.pool)
+
+    @event.listens_for(engine, "checkin")
+    def _checked_in(dbapi_connection, connection_record):
+        db_pool_connections_in_use.dec()
+        _update_pool_gauges(engine.pool)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Record per-route latency and in-flight requests, and serve them on /metrics.
+
+    Routes are labelled with their URL rule (e.g. /api/v1/tasks/<int:task_id>),
+    never the raw path, to keep the label set bounded. Call it before any other
+    hook is registered so the timings include them.
+    """
+
+    def observe(status: int) -> None:
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        route = request.url_rule.rule if request.url_rule else UNMATCHED_ROUTE
+        http_request_duration_seconds.labels(request.method, route).observe(
+            time.perf_counter() - started
+        )
+        http_requests_total.labels(request.method, route, status).inc()
+        http_requests_in_progress.labels(request.method).dec()
+
+    @app.before_request
+    def start_timer():
+        if request.endpoint == "metrics":
+            return
+        g.metrics_started = time.perf_counter()
+        http_requests_in_progress.labels(request.method).inc()
+
+    @app.after_request
+    def record_response(response: Response) -> Response:
+        observe(response.status_code)
+        return response
+
+    @app.teardown_request
+    def record_unhandled_error(error):
+        # after_request is skipped when the view raised
+        observe(500)
+
+    app.add_url_rule("/metrics", "metrics", metrics_response)
@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import os
+import random
+import secrets
+import time
+from typing import Optional
+from flask import Flask, Response, abort, g, request, send_from_directory
+from app import settings
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    Profiler = None
+
+PROFILE_HEADER = "X-Profile-Request"
+
+FORMATS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "html": (".html", "text/html"),
+}
+
+
+# sign, profile_request_token, verify_request_token and ProfileStore are the
+# same in the tasks, history and users services. Each service is built from
+# its own directory and cannot import the others, so the code is copied; the
+# tasks tests check that the copies stay identical.
+def sign(secret: str, value: str) -> str:
+    return hmac.new(secret.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def profile_request_token(secret: Optional[str] = None, ttl: Optional[int] = None) -> str:
+    """Build a value for the X-Profile-Request header, valid for `ttl` seconds."""
+    secret = secret or settings.PROFILE_SECRET
+    expires = str(int(time.time()) + (ttl or settings.PROFILE_SIGNATURE_TTL))
+    return f"{expires}.{sign(secret, expires)}"
+
+
+def verify_request_token(token: str, secret: str, max_ttl: int) -> bool:
+    """Accept unexpired tokens signed with `secret` whose expiry is at most `max_ttl` away."""
+    if not secret or not token:
+        return False
+
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or not hmac.compare_digest(sign(secret, expires), signature):
+        return False
+
+    now = time.time()
+    return now <= int(expires) <= now + max_ttl
+
+
+class ProfileStore:
+    """Profiles on local disk, keeping only the newest `max_files`."""
+
+    def __init__(self, directory: str, max_files: int, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format {fmt}")
+        self.directory = directory
+        self.max_files = max_files
+        self.suffix, self.mimetype = FORMATS[fmt]
+        self.fmt = fmt
+
+    @classmethod
+    def from_settings(cls) -> "ProfileStore":
+        return cls(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES, settings.PROFILE_FORMAT)
+
+    def save(self, profile_id: str, profiler) -> None:
+        renderer = SpeedscopeRenderer() if self.fmt == "speedscope" else HTMLRenderer()
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(profile_id)
+        with open(f"{path}.tmp", "w") as f:
+            f.write(profiler.output(renderer=renderer))
+        os.replace(f"{path}.tmp", path)
+
+        self.prune()
+
+    def prune(self) -> None:
+        profiles = sorted(
+            entry for entry in os.listdir(self.directory) if entry.endswith(self.suffix)
+        )
+        # Ids start with a nanosecond timestamp, so name order is age order
+        for entry in profiles[: max(0, len(profiles) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, entry))
+            except FileNotFoundError:
+                pass
+
+    def path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, profile_id + self.suffix)
+
+
+# End of the code shared between the services
+
+
+def _should_profile() -> bool:
+    if verify_request_token(
+        request.headers.get(PROFILE_HEADER, ""),
+        settings.PROFILE_SECRET,
+        settings.PROFILE_SIGNATURE_TTL,
+    ):
+        return True
+    return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def init_profiling(app: Flask) -> None:
+    """
+    Profile requests with pyinstrument when asked to.
+
+    A request is profiled when it carries a valid signed X-Profile-Request header
+    (see `profile_request_token`) or is picked by PROFILE_SAMPLE_RATE. The profile
+    is written to PROFILE_DIR and linked from the response's `Link` header; it can
+    be downloaded from /api/v1/profiles/<id> with the signature from that link.
+    Downloads are disabled while PROFILE_SECRET is empty.
+
+    Call it before registering other after_request hooks so the profile covers them.
+    """
+    if Profiler is None:
+        return
+
+    store = ProfileStore.from_settings()
+    prefix = f"{settings.API_V1_PREFIX}/profiles"
+
+    @app.before_request
+    def start_profiler():
+        if request.path.startswith(prefix) or not _should_profile():
+            return
+        g.profiler = Profiler(interval=settings.PROFILE_INTERVAL)
+        g.profiler.start()
+
+    @app.after_request
+    def save_profile(response: Response) -> Response:
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return response
+
+        profiler.stop()
+        profile_id = f"{time.time_ns()}-{secrets.token_hex(4)}"
+        store.save(profile_id, profiler)
+        signature = sign(settings.PROFILE_SECRET, profile_id)
+        response.headers["X-Profile-Id"] = profile_id
+        response.headers.add("Link", f'<{prefix}/{profile_id}?sig={signature}>; rel="profile"')
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is not None and profiler.is_running:
+            profiler.stop()
+
+    def profile_get(profile_id: str):
+        signature = request.args.get("sig", "")
+        if not settings.PROFILE_SECRET or not hmac.compare_digest(
+            sign(settings.PROFILE_SECRET, profile_id), signature
+        ):
+            abort(404)
+        return send_from_directory(
+            os.path.abspath(store.directory),
+            os.path.basename(store.path(profile_id)),
+            mimetype=store.mimetype,
+        )
+
+    app.add_url_rule(f"{prefix}/<profile_id>", "profile_get", profile_get)
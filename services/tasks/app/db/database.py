@@ -1,15 +1,129 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 from app import settings
 from app.models import Base
-from typing import Iterator
+from app.db.liveness import install_idle_ping
+from app.db.slow_queries import install_slow_query_capture
+from app.core.metrics import instrument_engine
+from typing import Iterator, Optional, Tuple
 
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True, echo=True)
+engine = create_engine(settings.DB_URL, echo=True)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+install_idle_ping(engine, settings.DB_POOL_PING_IDLE_SECONDS)
+install_slow_query_capture(engine)
+instrument_engine(engine)
+
+# (statement_timeout_ms, lock_timeout_ms) overrides for sessions opened in the current context
+_db_timeouts: ContextVar[Optional[Tuple[int, int]]] = ContextVar(
+    "db_timeouts", default=None
+)
+
+
+def default_db_timeouts() -> Tuple[int, int]:
+    return settings.DB_STATEMENT_TIMEOUT_MS, settings.DB_LOCK_TIMEOUT_MS
+
+
+def current_db_timeouts() -> Tuple[int, int]:
+    overrides = _db_timeouts.get()
+    return default_db_timeouts() if overrides is None else overrides
+
+
+@contextmanager
+def db_timeouts(
+    statement_timeout_ms: Optional[int] = None, lock_timeout_ms: Optional[int] = None
+):
+    """
+    Override the Postgres timeouts for sessions opened inside the block.
+    Omitted values keep the enclosing ones; 0 disables a timeout.
+    """
+    current_statement, current_lock = current_db_timeouts()
+    token = _db_timeouts.set(
+        (
+            current_statement if statement_timeout_ms is None else statement_timeout_ms,
+            current_lock if lock_timeout_ms is None else lock_timeout_ms,
+        )
+    )
+    try:
+        yield
+    finally:
+        _db_timeouts.reset(token)
+
+
+def route_timeouts(
+    statement_timeout_ms: Optional[int] = None, lock_timeout_ms: Optional[int] = None
+):
+    """Apply per-route Postgres timeouts to every session the view opens."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with db_timeouts(statement_timeout_ms, lock_timeout_ms):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def install_default_timeouts(engine: Engine) -> None:
+    """
+    Start every Postgres connection of `engine` with the default timeouts.
+
+    The settings travel as libpq `options` in the startup packet, so they cost
+    no round trip at all; transactions only pay for a `set_config` when a
+    route overrides them (see `_apply_timeouts`).
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    @event.listens_for(engine, "do_connect")
+    def _connect_with_timeouts(dialect, connection_record, cargs, cparams):
+        statement_timeout_ms, lock_timeout_ms = default_db_timeouts()
+        options = (
+            f"-c statement_timeout={statement_timeout_ms}"
+            f" -c lock_timeout={lock_timeout_ms}"
+        )
+        if cparams.get("options"):
+            options = f"{cparams['options']} {options}"
+        cparams["options"] = options
+
+
+install_default_timeouts(engine)
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_timeouts(session, transaction, connection):
+    overrides = _db_timeouts.get()
+    if overrides is None or connection.dialect.name != "postgresql":
+        return
+
+    changed = {
+        name: f"{value}ms"
+        for name, value, default in zip(
+            ("statement_timeout", "lock_timeout"), overrides, default_db_timeouts()
+        )
+        if value != default
+    }
+    if not changed:
+        return
+
+    # is_local=true scopes the overrides to this transaction only, so the pooled
+    # connection falls back to its connect-time defaults for the next user.
+    connection.execute(
+        text(
+            "SELECT "
+            + ", ".join(f"set_config('{name}', :{name}, true)" for name in changed)
+        ),
+        changed,
+    )
+
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
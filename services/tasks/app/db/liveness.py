@@ -0,0 +1,39 @@
+import time
+from logging import getLogger
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+logger = getLogger(__name__)
+
+CHECKED_IN_AT = "checked_in_at"
+
+
+def install_idle_ping(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping pooled connections on checkout only after they sat idle for `idle_seconds`.
+
+    Replaces `pool_pre_ping`, which costs a round trip on every checkout. A
+    connection that was returned moments ago is almost certainly alive; one that
+    idled long enough for a server or proxy timeout to drop it gets pinged, and
+    if the ping fails the pool discards it and transparently opens a new one.
+    Register it before other checkout listeners so they only see live connections.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info[CHECKED_IN_AT] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        # Fresh connections carry no checkin time and need no ping
+        checked_in_at = connection_record.info.pop(CHECKED_IN_AT, None)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            logger.warning(f"Discarding dead pooled connection: {e}")
+            # The pool invalidates the connection and retries the checkout
+            raise exc.DisconnectionError() from e
@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import settings
+
+logger = getLogger(__name__)
+
+MAX_STATEMENT_LENGTH = 4000
+# Slow SELECTs waiting for their plan; more are logged without one
+EXPLAIN_QUEUE_SIZE = 100
+# SQLSTATEs of statements cancelled by statement_timeout and lock_timeout
+TIMEOUT_SQLSTATES = {"57014", "55P03"}
+
+
+class SlowQueryLog:
+    """Bounded, thread-safe log of the most recent slow queries."""
+
+    def __init__(self, maxlen: int = settings.SLOW_QUERY_LOG_SIZE):
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def update(self, entry: dict, **fields) -> None:
+        with self._lock:
+            entry.update(fields)
+
+    def entries(self) -> List[dict]:
+        """Return the captured queries, newest first."""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _current_route() -> Optional[str]:
+    try:
+        from flask import has_request_context, request
+
+        if has_request_context():
+            return f"{request.method} {request.path}"
+    except ImportError:
+        pass
+    return None
+
+
+class PlanCapture:
+    """
+    Adds the plans of slow SELECTs to their log entries in the background.
+
+    Plans come from a plain EXPLAIN (no ANALYZE, so the query is not run again),
+    on a connection of the worker's own, so the request that ran the slow query
+    never waits for it. When the queue is full the entry keeps no plan.
+    """
+
+    def __init__(self, engine: Engine, log: SlowQueryLog, maxsize: int = EXPLAIN_QUEUE_SIZE):
+        self.engine = engine
+        self.log = log
+        self.queue: "queue.Queue[tuple]" = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, entry: dict, statement: str, parameters) -> None:
+        try:
+            self.queue.put_nowait((entry, statement, parameters))
+        except queue.Full:
+            logger.warning("Slow query plan queue is full; logging the query without a plan")
+            return
+
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="slow-query-explain", daemon=True
+                )
+                self._worker.start()
+
+    def explain(self, statement: str, parameters) -> Optional[list]:
+        try:
+            with self.engine.connect() as conn:
+                return conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                ).scalar()
+        except Exception as e:
+            logger.warning(f"Could not capture slow query plan: {e}")
+            return None
+
+    def _run(self) -> None:
+        while True:
+            entry, statement, parameters = self.queue.get()
+            try:
+                self.log.update(entry, plan=self.explain(statement, parameters))
+            finally:
+                self.queue.task_done()
+
+
+def _is_timeout(error: BaseException) -> bool:
+    # psycopg 3 exposes `sqlstate`, psycopg2 `pgcode`
+    sqlstate = getattr(error, "sqlstate", None) or getattr(error, "pgcode", None)
+    return sqlstate in TIMEOUT_SQLSTATES
+
+
+def _entry(statement: str, parameters, duration_ms: float, error: Optional[str] = None) -> dict:
+    return {
+        "statement": statement[:MAX_STATEMENT_LENGTH],
+        "parameters": repr(parameters)[:MAX_STATEMENT_LENGTH],
+        "duration_ms": round(duration_ms, 3),
+        "route": _current_route(),
+        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "plan": None,
+        "error": error,
+    }
+
+
+def install_slow_query_capture(
+    engine: Engine, log: SlowQueryLog = slow_query_log
+) -> PlanCapture:
+    """
+    Time every statement on the engine and log the ones slower than SLOW_QUERY_MS.
+
+    Statements that fail are logged with their error when they were slow too or
+    were cancelled by statement_timeout or lock_timeout. On Postgres, plans of
+    slow SELECTs are added in the background when SLOW_QUERY_EXPLAIN is enabled.
+    """
+    plans = PlanCapture(engine, log)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_slow_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_time"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if duration_ms < settings.SLOW_QUERY_MS:
+            return
+
+        entry = _entry(statement, parameters, duration_ms)
+        log.record(entry)
+        logger.warning(f"Slow query ({duration_ms:.1f} ms): {statement[:200]}")
+
+        if (
+            settings.SLOW_QUERY_EXPLAIN
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and statement.lstrip().upper().startswith("SELECT")
+        ):
+            plans.submit(entry, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _record_failed_query(context):
+        # after_cursor_execute never fires for a statement that raised, so its
+        # timer is popped here
+        if context.connection is None or context.statement is None:
+            return
+        timers = context.connection.info.get("query_start_time")
+        if not timers:
+            return
+
+        duration_ms = (time.perf_counter() - timers.pop()) * 1000
+        error = context.original_exception
+        if duration_ms < settings.SLOW_QUERY_MS and not _is_timeout(error):
+            return
+
+        log.record(
+            _entry(
+                context.statement,
+                context.parameters,
+                duration_ms,
+                error=f"{error}"[:MAX_STATEMENT_LENGTH],
+            )
+        )
+        logger.warning(
+            f"Failed slow query ({duration_ms:.1f} ms): {context.statement[:200]}: {error}"
+        )
+
+    return plans
@@ -5,4 +5,6 @@ class Base(DeclarativeBase):
 
 from .board import Board
 from .project import Project
-from .task import Task
\ No newline at end of file
+from .task import Task, TaskTombstone
+from .outbox import OutboxEvent
+from .job import Job
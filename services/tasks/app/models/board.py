@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, JSON, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from . import Base
@@ -14,6 +14,11 @@ class Board(Base):
     columns = Column(JSON,nullable=True,default=lambda:["ToDO", "InProgress", "Done"])
     
     project_id = Column(Integer,ForeignKey("projects.id"),index=True,nullable=False)
+
+    # Last change sequence handed out to this board's tasks (see task_service.next_change_seq)
+    change_seq = Column(BigInteger,nullable=False,default=0,server_default="0")
+    # Highest change sequence whose tombstones were pruned (see task_service.prune_tombstones)
+    tombstones_pruned_seq = Column(BigInteger,nullable=False,default=0,server_default="0")
     
     
     created_at = Column(DateTime(timezone=True),server_default=func.now())
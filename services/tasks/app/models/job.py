@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Enum, UniqueConstraint
+from sqlalchemy.sql import func
+from enum import Enum as FlaskEnum
+from . import Base
+
+
+class JobStatus(FlaskEnum):
+    """
+    Enum for background job status.
+    PENDING: Job is waiting for a worker (or for a retry).
+    RUNNING: A worker holds the job's lease and is working on it.
+    SUCCEEDED: Job finished; `result` holds its outcome.
+    FAILED: Job gave up after JOB_MAX_ATTEMPTS; `error` holds the last failure.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobKind(FlaskEnum):
+    """
+    Enum for the operations the tasks worker runs.
+    PROJECT_DELETE: Delete a project with all of its boards and tasks.
+    BOARD_RECONCILE: Raise board change sequences that fell behind their tasks.
+    """
+    PROJECT_DELETE = "project_delete"
+    BOARD_RECONCILE = "board_reconcile"
+
+
+class Job(Base):
+    """
+    A unit of background work run by the tasks worker.
+
+    Handlers save a checkpoint with every batch, so a job picked up again after
+    a worker restart continues where it stopped instead of starting over.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    params = Column(JSON, nullable=False, default=dict)
+    idempotency_key = Column(String(255), nullable=True)
+
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    checkpoint = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # A running job whose lease expired is considered abandoned and may be claimed again
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("kind", "idempotency_key", name="uq_jobs_kind_idempotency_key"),
+    )
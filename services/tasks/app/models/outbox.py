@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index, and_
+from sqlalchemy.sql import func
+from . import Base
+
+
+class OutboxEvent(Base):
+    """
+    Change event staged in the same transaction as the mutation that produced it.
+    The outbox relay publishes unpublished rows to the history queue in id order.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    action = Column(String(100), nullable=False)
+    user_id = Column(String(255), nullable=False)
+    details = Column(JSON, nullable=False, default=dict)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    # Set once the relay gives up on the row; it stays for inspection
+    dead_lettered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_unpublished",
+            "id",
+            postgresql_where=and_(published_at.is_(None), dead_lettered_at.is_(None)),
+            sqlite_where=and_(published_at.is_(None), dead_lettered_at.is_(None)),
+        ),
+        # Dead letters hold back the later events of their aggregate; the relay
+        # checks for them on every batch
+        Index(
+            "ix_outbox_events_dead_lettered",
+            "aggregate_type",
+            "aggregate_id",
+            "id",
+            postgresql_where=dead_lettered_at.isnot(None),
+            sqlite_where=dead_lettered_at.isnot(None),
+        ),
+    )
+
+    def to_history_event(self, service: str) -> dict:
+        """
+        Build the payload consumed by the history service's event task.
+
+        The event id is derived from the row, so republishing a row the relay
+        already sent (e.g. after a crash before it was marked published) is
+        recognised as a duplicate by the history service.
+        """
+        return {
+            "event_id": f"{service}:outbox:{self.id}",
+            "service": service,
+            "action": self.action,
+            "user_id": self.user_id,
+            "details": {
+                "aggregate_type": self.aggregate_type,
+                "aggregate_id": self.aggregate_id,
+                **(self.details or {}),
+            },
+        }
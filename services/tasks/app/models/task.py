@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum as FlaskEnum
@@ -46,5 +46,29 @@ class Task(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    
+
+    # Per-board change sequence, bumped on every insert and update
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     board = relationship("Board",back_populates="tasks")
+
+    __table_args__ = (Index("ix_tasks_board_id_change_seq", "board_id", "change_seq"),)
+
+
+class TaskTombstone(Base):
+    """
+    Marker left behind when a task is deleted or moved off a board,
+    so delta sync clients can learn about removals.
+    """
+
+    __tablename__ = "task_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    board_id = Column(Integer, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_task_tombstones_board_id_change_seq", "board_id", "change_seq"),
+    )
@@ -0,0 +1,72 @@
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from app.models.job import JobKind, JobStatus
+
+
+class ProjectDeleteParams(BaseModel):
+    project_id: int = Field(..., description="ID of the project to delete")
+
+
+class BoardReconcileParams(BaseModel):
+    board_ids: Optional[List[int]] = Field(
+        None, description="Boards to reconcile, all boards when omitted"
+    )
+
+
+JOB_PARAMS = {
+    JobKind.PROJECT_DELETE: ProjectDeleteParams,
+    JobKind.BOARD_RECONCILE: BoardReconcileParams,
+}
+
+
+class JobCreate(BaseModel):
+    kind: JobKind = Field(..., description="Operation to run")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Operation parameters")
+    idempotency_key: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="Submitting the same kind and key again returns the existing job",
+    )
+
+    @model_validator(mode="after")
+    def validate_params(self) -> "JobCreate":
+        self.params = JOB_PARAMS[self.kind](**self.params).model_dump(exclude_none=True)
+        return self
+
+
+class JobProgress(BaseModel):
+    done: int = Field(..., description="Items processed so far")
+    total: Optional[int] = Field(None, description="Items to process, once known")
+
+
+class JobResponse(BaseModel):
+    id: str = Field(..., description="ID of the job")
+    kind: str = Field(..., description="Operation the job runs")
+    status: JobStatus = Field(..., description="Job status")
+    params: Dict[str, Any] = Field(..., description="Operation parameters")
+    progress: JobProgress = Field(..., description="Job progress")
+    result: Optional[Dict[str, Any]] = Field(None, description="Outcome of a finished job")
+    error: Optional[str] = Field(None, description="Last failure, if any")
+    attempts: int = Field(..., description="Number of times a worker picked the job up")
+    created_at: Optional[datetime] = Field(None, description="Submission timestamp")
+    started_at: Optional[datetime] = Field(None, description="First pickup timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Completion timestamp")
+
+    model_config = ConfigDict(use_enum_values=True)
+
+    @classmethod
+    def from_job(cls, job) -> "JobResponse":
+        return cls(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            params=job.params or {},
+            progress=JobProgress(done=job.progress_done, total=job.progress_total),
+            result=job.result,
+            error=job.error,
+            attempts=job.attempts,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
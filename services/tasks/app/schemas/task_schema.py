@@ -50,3 +50,27 @@ class TaskStats(BaseModel):
     total_tasks: int = Field(..., description="Total number of tasks")
     tasks_by_status: dict = Field(..., description="Number of tasks by status")
     tasks_by_priority: dict = Field(..., description="Number of tasks by priority")
+    tasks_by_user: dict = Field(..., description="Number of tasks by owner")
+
+
+class TaskTombstoneResponse(BaseModel):
+    id: int = Field(..., description="ID of the removed task")
+    change_seq: int = Field(..., description="Change sequence of the removal")
+    deleted_at: Optional[datetime] = Field(None, description="Removal timestamp")
+
+
+class BoardChanges(BaseModel):
+    board_id: int = Field(..., description="ID of the board")
+    upserts: List[TaskResponse] = Field(..., description="Tasks created or updated since the cursor")
+    deletions: List[TaskTombstoneResponse] = Field(
+        ..., description="Tasks deleted or moved off the board since the cursor"
+    )
+    cursor: str = Field(..., description="Cursor to pass as `since` on the next sync")
+    has_more: bool = Field(..., description="Whether more changes are pending after the cursor")
+    resync_required: bool = Field(
+        False,
+        description=(
+            "Removals after the cursor were pruned; a client resuming a stored"
+            " cursor must drop its copy of the board and sync again from 0"
+        ),
+    )
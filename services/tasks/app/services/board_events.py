@@ -0,0 +1,194 @@
+import json
+import queue
+import threading
+import time
+from logging import getLogger
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app import settings
+
+logger = getLogger(__name__)
+
+# Postgres channel carrying every board delta. Listeners fan the payloads out
+# in-process to the "board:<id>" topics that stream clients subscribe to.
+BOARD_EVENTS_CHANNEL = "board_events"
+
+# NOTIFY payloads must stay below 8000 bytes; larger deltas only carry the ID.
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+def board_topic(board_id: int) -> str:
+    return f"board:{board_id}"
+
+
+def board_event_notification(board_id: int, event_type: str, task: dict) -> Tuple[str, str]:
+    """
+    Build the NOTIFY for a board delta, as a (channel, payload) pair.
+
+    Task writes send it on the statement that inserts their outbox row (see
+    `record_event`), so it costs no round trip of its own. Postgres delivers it
+    only when the transaction commits, so listeners never see changes that were
+    rolled back.
+
+    Args:
+        board_id (int): The board the delta belongs to
+        event_type (str): One of "task_created", "task_updated", "task_moved", "task_deleted"
+        task (dict): JSON-serializable task data
+    """
+    payload = json.dumps({"type": event_type, "board_id": board_id, "task": task})
+    if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+        payload = json.dumps(
+            {"type": event_type, "board_id": board_id, "task": {"id": task["id"]}}
+        )
+
+    return BOARD_EVENTS_CHANNEL, payload
+
+
+def notify_board_resync(db: Session, board_id: int) -> None:
+    """
+    Tell a board's stream clients to refetch it, for changes too large to send
+    as task deltas. Delivered on commit like board deltas; no-op on other databases.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {
+            "channel": BOARD_EVENTS_CHANNEL,
+            "payload": json.dumps({"type": "resync", "board_id": board_id}),
+        },
+    )
+
+
+class BoardSubscription:
+    """A single stream client's bounded inbox for one board topic."""
+
+    def __init__(self, board_id: int, maxsize: int):
+        self.board_id = board_id
+        self.topic = board_topic(board_id)
+        self.queue: "queue.Queue[dict]" = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # Slow consumer: stop buffering and tell the client to refetch the board
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[dict]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def reset(self) -> None:
+        with self.queue.mutex:
+            self.queue.queue.clear()
+        self.overflowed = False
+
+    def resync(self) -> None:
+        """Replace the queued deltas with a resync event; the client refetches the board."""
+        self.reset()
+        self.put({"type": "resync", "board_id": self.board_id})
+
+
+class BoardEventHub:
+    """
+    Fans out board deltas from one LISTEN connection to all stream clients of this process.
+
+    The listener thread is started lazily by the first subscriber and reconnects
+    with backoff if the connection drops. Notifications sent while it was
+    disconnected are lost, so every client is sent a resync once it is back.
+    """
+
+    def __init__(self, db_url: str = settings.DB_URL):
+        self.db_url = db_url
+        self._subscriptions: Dict[str, Set[BoardSubscription]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, board_id: int) -> BoardSubscription:
+        subscription = BoardSubscription(board_id, settings.BOARD_STREAM_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.topic, set()).add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: BoardSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.topic, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscriptions.pop(subscription.topic, None)
+
+    def dispatch(self, payload: str) -> None:
+        """Deliver one NOTIFY payload to the subscribers of its board."""
+        try:
+            event = json.loads(payload)
+            topic = board_topic(event["board_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed board event payload: {payload!r}")
+            return
+
+        with self._lock:
+            subscribers = list(self._subscriptions.get(topic, ()))
+
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def resync_all(self) -> None:
+        """Send a resync event to every subscription of this process."""
+        with self._lock:
+            subscriptions = [
+                subscription
+                for subscribers in self._subscriptions.values()
+                for subscription in subscribers
+            ]
+
+        for subscription in subscriptions:
+            subscription.resync()
+
+    def _ensure_listener(self) -> None:
+        if not self.db_url.startswith("postgresql"):
+            return
+
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="board-event-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        import psycopg
+        from sqlalchemy.engine import make_url
+
+        conninfo = (
+            make_url(self.db_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        backoff = 1.0
+        reconnecting = False
+
+        while True:
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {BOARD_EVENTS_CHANNEL}")
+                    logger.info(f"Listening on {BOARD_EVENTS_CHANNEL}")
+                    backoff = 1.0
+                    if reconnecting:
+                        self.resync_all()
+                    reconnecting = True
+                    for notify in conn.notifies():
+                        self.dispatch(notify.payload)
+            except Exception as e:
+                logger.error(f"Board event listener failed: {e}", exc_info=True)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+board_event_hub = BoardEventHub()
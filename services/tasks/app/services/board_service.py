@@ -1,8 +1,16 @@
 from typing import List, Optional
+from sqlalchemy import insert, update
 from app.models.board import Board
 from app.models.project import Project
 from app.schemas.board_schema import BoardCreate, BoardUpdate, BoardResponse
 from app.db.database import get_db_session
+from app.services.outbox_service import record_event
+from app.services.pagination import clamp_pagination
+
+
+def _board_owner(db_board: Board) -> str:
+    """Boards have no owner of their own; events are attributed to the project owner."""
+    return db_board.project.owner_id if db_board.project else ""
 
 
 def get_board_by_project(
@@ -12,13 +20,15 @@ def get_board_by_project(
     Retrieve a paginated list of boards associated with a specific project.
     Args:
         project_id (int): The ID of the project to retrieve boards for.
-        limit (int, optional): The maximum number of boards to return. Defaults to 50.
+        limit (int, optional): The maximum number of boards to return. Defaults to 50, capped at MAX_PAGE_LIMIT.
         offset (int, optional): The number of boards to skip before collecting results. Defaults to 0.
     Returns:
         List[BoardResponse]: A list of BoardResponse objects representing the boards for the project.
     Raises:
         ValueError: If the project with the specified ID does not exist.
     """
+    limit, offset = clamp_pagination(limit, offset)
+
     with get_db_session() as db:
 
         db_boards = (
@@ -67,18 +77,28 @@ def create_board(board_data: BoardCreate) -> BoardResponse:
     """
 
     with get_db_session() as db:
-        db_board = Board(
-            name=board_data.name,
-            description=board_data.description,
-            project_id=board_data.project_id,
-            columns=board_data.columns,
+        db_board = db.scalars(
+            insert(Board)
+            .values(
+                name=board_data.name,
+                description=board_data.description,
+                project_id=board_data.project_id,
+                columns=board_data.columns,
+            )
+            .returning(Board)
+        ).one()
+
+        board = BoardResponse.model_validate(db_board)
+        record_event(
+            db,
+            aggregate_type="board",
+            aggregate_id=board.id,
+            action="board_create",
+            user_id=_board_owner(db_board),
+            details={"board": board.model_dump(mode="json")},
         )
 
-        db.add(db_board)
-        db.flush()
-        db.refresh(db_board)
-
-        return BoardResponse.model_validate(db_board)
+        return board
 
 
 def update_board(board_id: int, board_data: BoardUpdate) -> Optional[BoardResponse]:
@@ -93,25 +113,44 @@ def update_board(board_id: int, board_data: BoardUpdate) -> Optional[BoardRespon
     Returns:
         Optional[BoardResponse]: The updated board details if the update was successful, or None if the board was not found
     """
-    with get_db_session() as db:
-        db_board = db.query(Board).filter(Board.id == board_id).first()
+    changes = {}
+    if board_data.name is not None:
+        changes["name"] = board_data.name
 
-        if not db_board:
-            raise ValueError(f"Board with id {board_id} does not exist")
+    if board_data.description is not None:
+        changes["description"] = board_data.description
 
-        if board_data.name is not None:
-            db_board.name = board_data.name
+    if board_data.columns is not None:
+        changes["columns"] = board_data.columns
 
-        if board_data.description is not None:
-            db_board.description = board_data.description
+    with get_db_session() as db:
+        if changes:
+            db_board = db.scalars(
+                update(Board)
+                .where(Board.id == board_id)
+                .values(**changes)
+                .returning(Board)
+            ).one_or_none()
+        else:
+            db_board = db.get(Board, board_id)
 
-        if board_data.columns is not None:
-            db_board.columns = board_data.columns
+        if not db_board:
+            raise ValueError(f"Board with id {board_id} does not exist")
 
-        db.flush()
-        db.refresh(db_board)
+        board = BoardResponse.model_validate(db_board)
+        record_event(
+            db,
+            aggregate_type="board",
+            aggregate_id=board.id,
+            action="board_update",
+            user_id=_board_owner(db_board),
+            details={
+                "changes": board_data.model_dump(mode="json", exclude_unset=True),
+                "board": board.model_dump(mode="json"),
+            },
+        )
 
-        return BoardResponse.model_validate(db_board)
+        return board
 
 
 def delete_board(board_id: int) -> bool:
@@ -134,6 +173,15 @@ def delete_board(board_id: int) -> bool:
         if not db_board:
             return False
 
+        board = BoardResponse.model_validate(db_board)
+        record_event(
+            db,
+            aggregate_type="board",
+            aggregate_id=board.id,
+            action="board_delete",
+            user_id=_board_owner(db_board),
+            details={"board": board.model_dump(mode="json")},
+        )
         db.delete(db_board)
         db.flush()
 
@@ -0,0 +1,183 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import func, insert, or_, select, update
+from app import settings
+from app.db.database import get_db_session
+from app.models.job import Job, JobStatus
+from app.schemas.job_schema import JobCreate, JobResponse
+
+
+class JobLeaseLost(Exception):
+    """Raised when a worker no longer holds the lease of the job it is running."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _lease_expiry() -> datetime:
+    return _now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+def submit_job(job_data: JobCreate) -> Tuple[JobResponse, bool]:
+    """
+    Store a new pending job.
+
+    With an idempotency key, a job already submitted with the same kind and key
+    is returned instead of creating a second one.
+
+    Args:
+        job_data (JobCreate): The operation and its parameters
+
+    Returns:
+        Tuple[JobResponse, bool]: The job, and whether it was created by this call
+    """
+    if job_data.idempotency_key:
+        existing = get_job_by_key(job_data.kind.value, job_data.idempotency_key)
+        if existing:
+            return existing, False
+
+    try:
+        with get_db_session() as db:
+            db_job = db.scalars(
+                insert(Job)
+                .values(
+                    id=uuid.uuid4().hex,
+                    kind=job_data.kind.value,
+                    status=JobStatus.PENDING,
+                    params=job_data.params,
+                    idempotency_key=job_data.idempotency_key,
+                )
+                .returning(Job)
+            ).one()
+
+            return JobResponse.from_job(db_job), True
+    except Exception:
+        # A concurrent submission with the same key won the unique constraint
+        if job_data.idempotency_key:
+            existing = get_job_by_key(job_data.kind.value, job_data.idempotency_key)
+            if existing:
+                return existing, False
+        raise
+
+
+def get_job(job_id: str) -> JobResponse:
+    with get_db_session() as db:
+        db_job = db.get(Job, job_id)
+        job = JobResponse.from_job(db_job) if db_job else None
+
+    # Raised outside the session, which would wrap it into a plain Exception
+    if job is None:
+        raise ValueError(f"Job with ID {job_id} not found!")
+    return job
+
+
+def get_job_by_key(kind: str, idempotency_key: str) -> Optional[JobResponse]:
+    with get_db_session() as db:
+        db_job = db.scalar(
+            select(Job).where(Job.kind == kind, Job.idempotency_key == idempotency_key)
+        )
+        return JobResponse.from_job(db_job) if db_job else None
+
+
+def claim_job(job_id: str) -> Optional[Job]:
+    """
+    Take the lease of a pending job, or of a running one whose worker went away.
+
+    Returns None when the job is finished or another worker holds a live lease,
+    so a duplicate delivery of the same job is a no-op.
+    """
+    now = _now()
+    with get_db_session() as db:
+        db_job = db.scalars(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                or_(Job.locked_until.is_(None), Job.locked_until < now),
+            )
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_until=_lease_expiry(),
+                started_at=func.coalesce(Job.started_at, now),
+            )
+            .returning(Job)
+        ).one_or_none()
+
+        if db_job is not None:
+            db.expunge(db_job)
+        return db_job
+
+
+def _update_leased(job_id: str, **values) -> None:
+    """Update a job only while its lease is held, raising JobLeaseLost otherwise."""
+    with get_db_session() as db:
+        updated = db.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status == JobStatus.RUNNING,
+                Job.locked_until >= _now(),
+            )
+            .values(**values)
+            .returning(Job.id)
+        ).scalar_one_or_none()
+
+    if updated is None:
+        raise JobLeaseLost(f"Lease of job {job_id} was lost")
+
+
+def save_progress(
+    job_id: str, done: int, checkpoint: dict, total: Optional[int] = None
+) -> None:
+    """Record progress and the resume point, renewing the lease."""
+    values = {"progress_done": done, "checkpoint": checkpoint, "locked_until": _lease_expiry()}
+    if total is not None:
+        values["progress_total"] = total
+    _update_leased(job_id, **values)
+
+
+def finish_job(job_id: str, result: dict) -> None:
+    _update_leased(
+        job_id,
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        error=None,
+        locked_until=None,
+        finished_at=_now(),
+    )
+
+
+def release_job(job_id: str, error: str, retry: bool) -> None:
+    """Give a failed job back for a retry, or mark it failed for good."""
+    _update_leased(
+        job_id,
+        status=JobStatus.PENDING if retry else JobStatus.FAILED,
+        error=error,
+        locked_until=None,
+        finished_at=None if retry else _now(),
+    )
+
+
+def stalled_job_ids(limit: int = 100) -> List[str]:
+    """
+    Jobs nobody is working on: pending jobs whose message may have been lost
+    and running jobs whose lease expired with their worker.
+    """
+    cutoff = _now() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+    with get_db_session() as db:
+        return list(
+            db.scalars(
+                select(Job.id)
+                .where(
+                    or_(
+                        (Job.status == JobStatus.PENDING) & (Job.created_at < cutoff),
+                        (Job.status == JobStatus.RUNNING) & (Job.locked_until < _now()),
+                    )
+                )
+                .order_by(Job.created_at)
+                .limit(limit)
+            )
+        )
@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Any, Dict, Sequence, Tuple
+from sqlalchemy import delete, func, insert, literal, select, true
+from sqlalchemy.orm import Session
+from app.db.database import get_db_session
+from app.models.outbox import OutboxEvent
+
+# Published rows deleted per transaction when pruning
+PRUNE_BATCH_SIZE = 1000
+
+
+def record_event(
+    db: Session,
+    aggregate_type: str,
+    aggregate_id: int,
+    action: str,
+    user_id: str,
+    details: Dict[str, Any],
+    notifications: Sequence[Tuple[str, str]] = (),
+) -> OutboxEvent:
+    """
+    Stage a change event in the outbox.
+
+    The row is added to the caller's session, so it is committed or rolled back
+    together with the mutation it describes. Nothing is sent to the broker here.
+
+    On Postgres, `notifications` are queued by the statement that inserts the
+    row, selecting it from `pg_notify()` so they cost no round trip of their own.
+    They are delivered on commit; other databases ignore them.
+
+    Args:
+        db (Session): The session of the mutation being recorded
+        aggregate_type (str): The kind of entity that changed ("task", "board", "project")
+        aggregate_id (int): The ID of the entity that changed
+        action (str): The history action name, e.g. "task_create"
+        user_id (str): The user the event is attributed to
+        details (Dict[str, Any]): JSON-serializable event details
+        notifications (Sequence[Tuple[str, str]]): (channel, payload) pairs to NOTIFY
+
+    Returns:
+        OutboxEvent: The pending outbox row
+    """
+    values = {
+        "aggregate_type": aggregate_type,
+        "aggregate_id": aggregate_id,
+        "action": action,
+        "user_id": str(user_id),
+        "details": details,
+    }
+
+    if notifications and db.get_bind().dialect.name == "postgresql":
+        columns = OutboxEvent.__table__.c
+        # pg_notify() returns a single row, so joining the calls still selects,
+        # and inserts, exactly one outbox row
+        calls = [
+            func.pg_notify(channel, payload).alias(f"notify_{i}")
+            for i, (channel, payload) in enumerate(notifications)
+        ]
+        notify = calls[0]
+        for call in calls[1:]:
+            notify = notify.join(call, true())
+        source = select(
+            *(literal(value, columns[name].type) for name, value in values.items())
+        ).select_from(notify)
+
+        return db.scalars(
+            insert(OutboxEvent).from_select(list(values), source).returning(OutboxEvent)
+        ).one()
+
+    event = OutboxEvent(**values)
+    db.add(event)
+
+    return event
+
+
+def prune_published_events(older_than: datetime) -> int:
+    """
+    Delete outbox rows published before a cutoff, a batch per transaction.
+
+    Dead-lettered rows were never published and are kept for inspection.
+
+    Args:
+        older_than (datetime): Rows published before this time are deleted
+
+    Returns:
+        int: The number of rows deleted
+    """
+    pruned = 0
+
+    while True:
+        with get_db_session() as db:
+            ids = db.scalars(
+                select(OutboxEvent.id)
+                .where(OutboxEvent.published_at < older_than)
+                .order_by(OutboxEvent.id)
+                .limit(PRUNE_BATCH_SIZE)
+            ).all()
+            if not ids:
+                return pruned
+            pruned += db.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(ids))
+            ).rowcount
@@ -0,0 +1,52 @@
+from typing import Optional, Tuple, Union
+from app import settings
+
+
+def clamp_limit(
+    limit: Optional[Union[int, str]],
+    default: Optional[int] = None,
+    maximum: Optional[int] = None,
+) -> int:
+    """
+    Resolve a requested page size against the configured hard cap.
+
+    Args:
+        limit (Optional[Union[int, str]]): The requested limit, as passed from the query string
+        default (Optional[int]): Used when no limit was requested. Defaults to settings.DEFAULT_PAGE_LIMIT.
+        maximum (Optional[int]): The hard cap. Defaults to settings.MAX_PAGE_LIMIT.
+
+    Raises:
+        ValueError: If the limit is not an integer
+
+    Returns:
+        int: A limit between 1 and the cap
+    """
+    default = settings.DEFAULT_PAGE_LIMIT if default is None else default
+    maximum = settings.MAX_PAGE_LIMIT if maximum is None else maximum
+
+    if limit is None or limit == "":
+        return min(default, maximum)
+
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid limit: {limit}")
+
+    return max(1, min(limit, maximum))
+
+
+def clamp_offset(offset: Optional[Union[int, str]]) -> int:
+    """Resolve a requested offset, treating missing values as 0."""
+    if offset is None or offset == "":
+        return 0
+
+    try:
+        return max(0, int(offset))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid offset: {offset}")
+
+
+def clamp_pagination(
+    limit: Optional[Union[int, str]], offset: Optional[Union[int, str]]
+) -> Tuple[int, int]:
+    return clamp_limit(limit), clamp_offset(offset)
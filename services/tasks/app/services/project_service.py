@@ -1,7 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import insert, update
 from app.models.project import Project
+from app.models.job import JobKind
+from app.schemas.job_schema import JobCreate, JobResponse
 from app.schemas.project_schema import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.db.database import get_db_session
+from app.services.job_service import submit_job
+from app.services.outbox_service import record_event
+from app.services.pagination import clamp_pagination
 
 
 def get_projects_by_owner(
@@ -11,11 +17,13 @@ def get_projects_by_owner(
 
     Keyword arguments:
     owner_id -- the ID of the project owner
-    limit -- the maximum number of projects to return (default: 50)
+    limit -- the maximum number of projects to return (default: 50, capped at MAX_PAGE_LIMIT)
     offset -- the number of projects to skip before starting to collect the result set (default: 0)
 
     Return: a list of ProjectResponse objects representing the projects owned by the specified owner.
     """
+    limit, offset = clamp_pagination(limit, offset)
+
     with get_db_session() as db:
         db_projects = (
             db.query(Project)
@@ -52,17 +60,27 @@ def create_project(project_data: ProjectCreate) -> ProjectResponse:
     Return: a ProjectResponse object representing the newly created project
     """
     with get_db_session() as db:
-        db_project = Project(
-            name=project_data.name,
-            description=project_data.description,
-            owner_id=project_data.owner_id,
+        db_project = db.scalars(
+            insert(Project)
+            .values(
+                name=project_data.name,
+                description=project_data.description,
+                owner_id=project_data.owner_id,
+            )
+            .returning(Project)
+        ).one()
+
+        project = ProjectResponse.model_validate(db_project)
+        record_event(
+            db,
+            aggregate_type="project",
+            aggregate_id=project.id,
+            action="project_create",
+            user_id=db_project.owner_id,
+            details={"project": project.model_dump(mode="json")},
         )
 
-        db.add(db_project)
-        db.flush()
-        db.refresh(db_project)
-
-        return ProjectResponse.model_validate(db_project)
+        return project
 
 
 def update_project(
@@ -75,37 +93,65 @@ def update_project(
     project_data -- the updated data for the project
     Return: a ProjectResponse object representing the updated project, or None if not found
     """
+    changes = {}
+    if project_data.name is not None:
+        changes["name"] = project_data.name
+
+    if project_data.description is not None:
+        changes["description"] = project_data.description
+
     with get_db_session() as db:
-        db_project = db.query(Project).filter(Project.id == project_id).first()
+        if changes:
+            db_project = db.scalars(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(**changes)
+                .returning(Project)
+            ).one_or_none()
+        else:
+            db_project = db.get(Project, project_id)
 
         if not db_project:
             raise ValueError(f"Project with id {project_id} does not exist")
 
-        if project_data.name is not None:
-            db_project.name = project_data.name
-
-        if project_data.description is not None:
-            db_project.description = project_data.description
-
-        db.flush()
-        db.refresh(db_project)
+        project = ProjectResponse.model_validate(db_project)
+        record_event(
+            db,
+            aggregate_type="project",
+            aggregate_id=project.id,
+            action="project_update",
+            user_id=db_project.owner_id,
+            details={
+                "changes": project_data.model_dump(mode="json", exclude_unset=True),
+                "project": project.model_dump(mode="json"),
+            },
+        )
 
-        return ProjectResponse.model_validate(db_project)
+        return project
 
 
-def delete_project(project_id: int) -> bool:
+def delete_project(project_id: int) -> Tuple[JobResponse, bool]:
     """Delete Project
 
+    The project's tasks, boards and the project itself are removed in batches
+    by a project_delete job (see app.tasks.jobs.delete_project_job). Deleting
+    the same project again returns the job already submitted for it.
+
     Keyword arguments:
     project_id -- the ID of the project to delete
-    Return: True if the project was deleted, False otherwise
+    Return: the delete job, and whether it was created by this call
     """
     with get_db_session() as db:
-        db_project = db.query(Project).filter(Project.id == project_id).first()
+        exists = db.query(Project.id).filter(Project.id == project_id).first()
 
-        if db_project:
-            db.delete(db_project)
-            db.flush()
-            return True
-        
+    # Raised outside the session, which would wrap it into a plain Exception
+    if not exists:
         raise ValueError(f"Project with id {project_id} does not exist")
+
+    return submit_job(
+        JobCreate(
+            kind=JobKind.PROJECT_DELETE,
+            params={"project_id": project_id},
+            idempotency_key=f"project:{project_id}",
+        )
+    )
@@ -1,9 +1,94 @@
-from typing import List, Optional
-from app.models.task import Task, TaskStatus, TaskPriority
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.models.task import Task, TaskStatus, TaskPriority, TaskTombstone
 from app.models.board import Board
-from app.schemas.task_schema import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task_schema import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskTombstoneResponse,
+    BoardChanges,
+)
 from app.db.database import get_db_session
-from sqlalchemy import func
+from app.services.outbox_service import record_event
+from app.services.board_events import board_event_notification
+from app.services.pagination import clamp_limit, clamp_pagination
+from app import settings
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+
+def next_change_seq(db: Session, board_id: int) -> int:
+    """
+    Hand out the next change sequence for a board.
+
+    The increment row-locks the board until the transaction ends, so writers of
+    the same board commit in sequence order and a sync cursor never skips a
+    change that commits late.
+    """
+    change_seq = db.execute(
+        update(Board)
+        .where(Board.id == board_id)
+        .values(change_seq=Board.change_seq + 1)
+        .returning(Board.change_seq)
+    ).scalar_one_or_none()
+
+    if change_seq is None:
+        raise ValueError(f"Board with ID of {board_id} does not exist!")
+
+    return change_seq
+
+
+def _add_tombstone(
+    db: Session, task_id: int, board_id: int, change_seq: Optional[int] = None
+) -> None:
+    db.add(
+        TaskTombstone(
+            task_id=task_id,
+            board_id=board_id,
+            change_seq=next_change_seq(db, board_id) if change_seq is None else change_seq,
+        )
+    )
+
+
+def add_tombstones(db: Session, tasks: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    Leave tombstones for many removed tasks at once.
+
+    Each board's sequence is raised once by its number of tasks, boards in id
+    order, and the tombstones take the sequences in between, so every removal
+    still has a sequence of its own for cursors to page through.
+
+    Args:
+        db (Session): The session removing the tasks
+        tasks (Sequence[Tuple[int, int]]): (task_id, board_id) pairs
+
+    Returns:
+        List[int]: The IDs of the boards the tasks were on, ascending
+    """
+    task_ids_by_board: Dict[int, List[int]] = {}
+    for task_id, board_id in tasks:
+        task_ids_by_board.setdefault(board_id, []).append(task_id)
+
+    tombstones = []
+    for board_id in sorted(task_ids_by_board):
+        task_ids = task_ids_by_board[board_id]
+        last_seq = db.execute(
+            update(Board)
+            .where(Board.id == board_id)
+            .values(change_seq=Board.change_seq + len(task_ids))
+            .returning(Board.change_seq)
+        ).scalar_one()
+        first_seq = last_seq - len(task_ids) + 1
+        tombstones.extend(
+            {"task_id": task_id, "board_id": board_id, "change_seq": first_seq + i}
+            for i, task_id in enumerate(task_ids)
+        )
+
+    if tombstones:
+        db.execute(insert(TaskTombstone), tombstones)
+
+    return sorted(task_ids_by_board)
 
 
 def get_tasks(
@@ -15,6 +100,8 @@ def get_tasks(
     limit: int = 50,
     offest: int = 0,
 ) -> List[TaskResponse]:
+    limit, offest = clamp_pagination(limit, offest)
+
     with get_db_session() as db:
 
         query = db.query(Task)
@@ -61,53 +148,237 @@ def get_user_tasks(user_id: int):
 
 def create_task(task_data: TaskCreate) -> TaskResponse:
     with get_db_session() as db:
-        db_task = Task(
-            title=task_data.title,
-            description=task_data.description,
-            status=task_data.status,
-            priority=task_data.priority,
-            user_id=task_data.user_id,
-            assigned_to=task_data.assigned_to,
-            board_id=task_data.board_id,
-            due_date=task_data.due_date,
-        )
+        # RETURNING hands back the generated id and timestamps in the same round trip
+        db_task = db.scalars(
+            insert(Task)
+            .values(
+                title=task_data.title,
+                description=task_data.description,
+                status=task_data.status,
+                priority=task_data.priority,
+                user_id=task_data.user_id,
+                assigned_to=task_data.assigned_to,
+                board_id=task_data.board_id,
+                due_date=task_data.due_date,
+                change_seq=next_change_seq(db, task_data.board_id),
+            )
+            .returning(Task)
+        ).one()
 
-        db.add(db_task)
-        db.flush()
-        db.refresh(db_task)
+        task = TaskResponse.model_validate(db_task)
+        task_json = task.model_dump(mode="json")
+        record_event(
+            db,
+            aggregate_type="task",
+            aggregate_id=task.id,
+            action="task_create",
+            user_id=task.user_id,
+            details={"task": task_json},
+            notifications=[
+                board_event_notification(task.board_id, "task_created", task_json)
+            ],
+        )
 
-        return TaskResponse.model_validate(db_task)
+        return task
 
 
 def update_task(task_id: int, task_data: TaskUpdate) -> Optional[TaskResponse]:
     with get_db_session() as db:
-        db_task = db.query(Task).filter(Task.id == task_id).first()
+        previous_board_id = db.scalar(select(Task.board_id).where(Task.id == task_id))
 
-        if not db_task:
+        if previous_board_id is None:
             raise ValueError(f"Task with ID {task_id} not found!")
 
-        for field, value in task_data.model_dump(exclude_unset=True).items():
-            setattr(db_task, field, value)
+        changes = task_data.model_dump(exclude_unset=True)
+        board_id = changes.get("board_id", previous_board_id)
 
-        db_task.updated_at = func.now()
-        db.flush()
-        db.refresh(db_task)
+        if board_id != previous_board_id:
+            # A move locks both boards; taking them in id order keeps two
+            # opposite moves from each holding the board the other one needs
+            change_seqs = {
+                locked_id: next_change_seq(db, locked_id)
+                for locked_id in sorted((previous_board_id, board_id))
+            }
+            _add_tombstone(
+                db, task_id, previous_board_id, change_seqs[previous_board_id]
+            )
+            change_seq = change_seqs[board_id]
+        else:
+            change_seq = next_change_seq(db, board_id)
+
+        db_task = db.scalars(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(
+                **changes,
+                change_seq=change_seq,
+                updated_at=func.now(),
+            )
+            .returning(Task)
+        ).one()
 
-        return TaskResponse.model_validate(db_task)
+        task = TaskResponse.model_validate(db_task)
+        task_json = task.model_dump(mode="json")
+        if task.board_id != previous_board_id:
+            notifications = [
+                board_event_notification(previous_board_id, "task_moved", task_json),
+                board_event_notification(task.board_id, "task_moved", task_json),
+            ]
+        else:
+            notifications = [
+                board_event_notification(task.board_id, "task_updated", task_json)
+            ]
+        record_event(
+            db,
+            aggregate_type="task",
+            aggregate_id=task.id,
+            action="task_update",
+            user_id=task.user_id,
+            details={
+                "changes": task_data.model_dump(mode="json", exclude_unset=True),
+                "task": task_json,
+            },
+            notifications=notifications,
+        )
+
+        return task
 
 
 def delete_task(task_id: int) -> bool:
     with get_db_session() as db:
-        db_task = db.query(Task).filter(Task.id == task_id).first()
+        board_id = db.scalar(select(Task.board_id).where(Task.id == task_id))
 
-        if not db_task:
+        if board_id is None:
             raise ValueError(f"Task with ID {task_id} not found!")
 
-        db.delete(db_task)
+        # Lock the board before the task row, in the same order as updates do
+        _add_tombstone(db, task_id, board_id)
+        db_task = db.scalars(
+            delete(Task).where(Task.id == task_id).returning(Task)
+        ).one()
+
+        task = TaskResponse.model_validate(db_task)
+        task_json = task.model_dump(mode="json")
+        record_event(
+            db,
+            aggregate_type="task",
+            aggregate_id=task.id,
+            action="task_delete",
+            user_id=task.user_id,
+            details={"task": task_json},
+            notifications=[
+                board_event_notification(task.board_id, "task_deleted", task_json)
+            ],
+        )
         db.flush()
         return True
 
 
+def get_board_changes(board_id: int, since: int = 0, limit: int = 500) -> BoardChanges:
+    """
+    Return the tasks upserted and removed on a board after a sync cursor.
+
+    Changes are merged in sequence order and cut at `limit`; the returned cursor
+    points at the last change included, so clients page until `has_more` is False.
+    A cursor older than the board's pruned tombstones is answered as usual but
+    flagged with `resync_required`, since removals after it may be missing.
+    """
+    since = int(since or 0)
+    limit = clamp_limit(limit, default=500, maximum=settings.MAX_SYNC_LIMIT)
+
+    with get_db_session() as db:
+        tombstones_pruned_seq = db.scalar(
+            select(Board.tombstones_pruned_seq).where(Board.id == board_id)
+        )
+        if tombstones_pruned_seq is None:
+            raise ValueError(f"Board with ID of {board_id} does not exist!")
+
+        db_tasks = (
+            db.query(Task)
+            .filter(Task.board_id == board_id, Task.change_seq > since)
+            .order_by(Task.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+        db_tombstones = (
+            db.query(TaskTombstone)
+            .filter(TaskTombstone.board_id == board_id, TaskTombstone.change_seq > since)
+            .order_by(TaskTombstone.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+
+        changes = sorted(db_tasks + db_tombstones, key=lambda change: change.change_seq)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        cursor = changes[-1].change_seq if changes else since
+
+        upserts = [
+            TaskResponse.model_validate(change)
+            for change in changes
+            if isinstance(change, Task)
+        ]
+        upserted_ids = {task.id for task in upserts}
+        deletions = [
+            TaskTombstoneResponse(
+                id=change.task_id,
+                change_seq=change.change_seq,
+                deleted_at=change.deleted_at,
+            )
+            for change in changes
+            if isinstance(change, TaskTombstone) and change.task_id not in upserted_ids
+        ]
+
+        return BoardChanges(
+            board_id=board_id,
+            upserts=upserts,
+            deletions=deletions,
+            cursor=str(cursor),
+            has_more=has_more,
+            resync_required=0 < since < tombstones_pruned_seq,
+        )
+
+
+def prune_tombstones(older_than: datetime) -> int:
+    """
+    Delete the tombstones left before a cutoff.
+
+    Each board records the highest sequence pruned from it, so a client still
+    holding a cursor below it is told to resync instead of silently keeping the
+    removed tasks. Boards are locked in id order, like moves lock them.
+
+    Args:
+        older_than (datetime): Tombstones removed before this time are pruned
+
+    Returns:
+        int: The number of tombstones deleted
+    """
+    pruned = 0
+
+    with get_db_session() as db:
+        pruned_seqs = db.execute(
+            select(TaskTombstone.board_id, func.max(TaskTombstone.change_seq))
+            .where(TaskTombstone.deleted_at < older_than)
+            .group_by(TaskTombstone.board_id)
+            .order_by(TaskTombstone.board_id)
+        ).all()
+
+        for board_id, change_seq in pruned_seqs:
+            db.execute(
+                update(Board)
+                .where(Board.id == board_id, Board.tombstones_pruned_seq < change_seq)
+                .values(tombstones_pruned_seq=change_seq)
+            )
+            pruned += db.execute(
+                delete(TaskTombstone).where(
+                    TaskTombstone.board_id == board_id,
+                    TaskTombstone.change_seq <= change_seq,
+                )
+            ).rowcount
+
+    return pruned
+
+
 def get_task_stats() -> dict:
     with get_db_session() as db:
         db_rows = db.query(Task.status, Task.priority, Task.user_id).all()
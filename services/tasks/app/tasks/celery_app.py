@@ -0,0 +1,44 @@
+from celery import Celery
+from app import settings
+
+HISTORY_EVENT_TASK = "app.tasks.event_task.process_event_background"
+HISTORY_QUEUE = "history"
+
+RUN_JOB_TASK = "app.tasks.jobs.run_job"
+JOBS_QUEUE = "tasks.jobs"
+
+PRUNE_TOMBSTONES_TASK = "app.tasks.maintenance.prune_tombstones_task"
+PRUNE_OUTBOX_TASK = "app.tasks.maintenance.prune_outbox_task"
+MAINTENANCE_QUEUE = "tasks.maintenance"
+
+celery_app = Celery(
+    "tasks",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.jobs", "app.tasks.maintenance"],
+)
+
+celery_app.conf.update(
+    task_ignore_result=True,
+    # Wait for a broker ack on every publish so the outbox only marks
+    # rows as published once RabbitMQ has taken responsibility for them.
+    broker_transport_options={"confirm_publish": True},
+    task_routes={
+        HISTORY_EVENT_TASK: {"queue": HISTORY_QUEUE},
+        RUN_JOB_TASK: {"queue": JOBS_QUEUE},
+        PRUNE_TOMBSTONES_TASK: {"queue": MAINTENANCE_QUEUE},
+        PRUNE_OUTBOX_TASK: {"queue": MAINTENANCE_QUEUE},
+    },
+    beat_schedule={
+        "prune-tombstones": {
+            "task": PRUNE_TOMBSTONES_TASK,
+            "schedule": settings.TOMBSTONE_PRUNE_INTERVAL_SECONDS,
+        },
+        "prune-outbox": {
+            "task": PRUNE_OUTBOX_TASK,
+            "schedule": settings.OUTBOX_PRUNE_INTERVAL_SECONDS,
+        },
+    },
+    # Jobs are long; hand each worker process one at a time
+    worker_prefetch_multiplier=1,
+)
@@ -0,0 +1,224 @@
+from logging import getLogger
+from typing import Callable, Dict, Optional
+from celery.signals import worker_ready
+from sqlalchemy import case, delete, func, select, true, update
+from app import settings
+from app.db.database import get_db_session
+from app.models.board import Board
+from app.models.job import Job, JobKind
+from app.models.project import Project
+from app.models.task import Task, TaskTombstone
+from app.services.board_events import notify_board_resync
+from app.services.job_service import (
+    JobLeaseLost,
+    claim_job,
+    finish_job,
+    release_job,
+    save_progress,
+    stalled_job_ids,
+)
+from app.services.outbox_service import record_event
+from app.services.task_service import add_tombstones
+from app.tasks.celery_app import celery_app, JOBS_QUEUE, RUN_JOB_TASK
+
+logger = getLogger(__name__)
+
+
+class JobContext:
+    """What a handler sees of its job: parameters, the saved resume point and progress reporting."""
+
+    def __init__(self, job: Job):
+        self.job_id = job.id
+        self.params = job.params or {}
+        self.checkpoint = dict(job.checkpoint or {})
+        self.done = job.progress_done
+        self.total = job.progress_total
+
+    def report(
+        self, done: int, checkpoint: Optional[dict] = None, total: Optional[int] = None
+    ) -> None:
+        """
+        Save progress after a committed batch.
+
+        The checkpoint must describe work that is already committed, so a
+        resumed job may redo at most the batch that was in flight.
+        """
+        self.done = done
+        if checkpoint is not None:
+            self.checkpoint = checkpoint
+        if total is not None:
+            self.total = total
+        save_progress(self.job_id, self.done, self.checkpoint, total=total)
+
+
+def delete_project_job(ctx: JobContext) -> dict:
+    """
+    Delete a project's tasks in batches, then its boards and the project itself.
+
+    Deleting is naturally resumable: every batch removes what is left, so after
+    a restart the job simply carries on with the remaining rows. Each batch
+    leaves tombstones for delta sync clients and tells stream clients of the
+    affected boards to resync.
+    """
+    project_id = ctx.params["project_id"]
+    board_ids = select(Board.id).where(Board.project_id == project_id)
+
+    if ctx.total is None:
+        with get_db_session() as db:
+            total = db.scalar(
+                select(func.count(Task.id)).where(Task.board_id.in_(board_ids))
+            )
+        ctx.report(ctx.done, total=total)
+
+    while True:
+        with get_db_session() as db:
+            tasks = db.execute(
+                select(Task.id, Task.board_id)
+                .where(Task.board_id.in_(board_ids))
+                .order_by(Task.id)
+                .limit(settings.JOB_BATCH_SIZE)
+            ).all()
+            if not tasks:
+                break
+            task_ids = [task_id for task_id, _ in tasks]
+            # Tombstones lock the boards first, in the order task writers use
+            affected_board_ids = add_tombstones(db, tasks)
+            db.execute(
+                delete(Task).where(Task.id.in_(task_ids), Task.board_id.in_(board_ids))
+            )
+            for board_id in affected_board_ids:
+                notify_board_resync(db, board_id)
+
+        ctx.report(ctx.done + len(task_ids))
+
+    with get_db_session() as db:
+        db_project = db.get(Project, project_id)
+        if db_project is None:
+            # Finished by an earlier attempt that died before recording the result
+            return {"project_id": project_id, "deleted": False, "tasks_deleted": ctx.done}
+
+        db.execute(delete(TaskTombstone).where(TaskTombstone.board_id.in_(board_ids)))
+        boards_deleted = db.execute(
+            delete(Board).where(Board.project_id == project_id)
+        ).rowcount
+        record_event(
+            db,
+            aggregate_type="project",
+            aggregate_id=db_project.id,
+            action="project_delete",
+            user_id=db_project.owner_id,
+            details={"project": {"id": db_project.id, "name": db_project.name}},
+        )
+        db.delete(db_project)
+
+    return {
+        "project_id": project_id,
+        "deleted": True,
+        "tasks_deleted": ctx.done,
+        "boards_deleted": boards_deleted,
+    }
+
+
+def reconcile_boards_job(ctx: JobContext) -> dict:
+    """
+    Raise each board's change sequence to the highest one its tasks and
+    tombstones carry, so new changes never reuse a sequence a client has seen.
+
+    Boards are walked in id order; the last reconciled id is the checkpoint.
+    """
+    selected = Board.id.in_(ctx.params["board_ids"]) if "board_ids" in ctx.params else true()
+
+    if ctx.total is None:
+        with get_db_session() as db:
+            total = db.scalar(select(func.count(Board.id)).where(selected))
+        ctx.report(ctx.done, total=total)
+
+    task_seq = (
+        select(func.coalesce(func.max(Task.change_seq), 0))
+        .where(Task.board_id == Board.id)
+        .scalar_subquery()
+    )
+    tombstone_seq = (
+        select(func.coalesce(func.max(TaskTombstone.change_seq), 0))
+        .where(TaskTombstone.board_id == Board.id)
+        .scalar_subquery()
+    )
+    highest_seq = case((task_seq > tombstone_seq, task_seq), else_=tombstone_seq)
+    repaired = ctx.checkpoint.get("repaired", 0)
+
+    while True:
+        last_board_id = ctx.checkpoint.get("last_board_id", 0)
+        with get_db_session() as db:
+            ids = db.scalars(
+                select(Board.id)
+                .where(selected, Board.id > last_board_id)
+                .order_by(Board.id)
+                .limit(settings.JOB_BATCH_SIZE)
+            ).all()
+            if not ids:
+                break
+            repaired += db.execute(
+                update(Board)
+                .where(Board.id.in_(ids), Board.change_seq < highest_seq)
+                .values(change_seq=highest_seq)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        ctx.report(
+            ctx.done + len(ids), checkpoint={"last_board_id": ids[-1], "repaired": repaired}
+        )
+
+    return {"boards_checked": ctx.done, "boards_repaired": repaired}
+
+
+JOB_HANDLERS: Dict[str, Callable[[JobContext], dict]] = {
+    JobKind.PROJECT_DELETE.value: delete_project_job,
+    JobKind.BOARD_RECONCILE.value: reconcile_boards_job,
+}
+
+
+def enqueue_job(job_id: str) -> None:
+    celery_app.send_task(RUN_JOB_TASK, args=[job_id], queue=JOBS_QUEUE)
+
+
+@celery_app.task(
+    bind=True,
+    name=RUN_JOB_TASK,
+    # Only ack once the job ran, so a message whose worker died is redelivered
+    acks_late=True,
+    reject_on_worker_lost=True,
+    ignore_result=True,
+)
+def run_job(self, job_id: str) -> None:
+    job = claim_job(job_id)
+    if job is None:
+        logger.info(f"Job {job_id} is finished or held by another worker, skipping")
+        return
+
+    handler = JOB_HANDLERS[job.kind]
+    try:
+        result = handler(JobContext(job))
+        finish_job(job_id, result)
+    except JobLeaseLost:
+        logger.warning(f"Job {job_id} lost its lease, leaving it to the new holder")
+    except Exception as e:
+        retry = job.attempts < settings.JOB_MAX_ATTEMPTS
+        logger.error(f"Job {job_id} failed (attempt {job.attempts}): {e}", exc_info=True)
+        try:
+            release_job(job_id, error=str(e), retry=retry)
+        except JobLeaseLost:
+            logger.warning(
+                f"Job {job_id} lost its lease before its failure was recorded,"
+                " leaving it to the new holder"
+            )
+            return
+        if retry:
+            raise self.retry(countdown=2**job.attempts, max_retries=None)
+
+
+@worker_ready.connect
+def requeue_stalled_jobs(**kwargs) -> None:
+    """Re-enqueue jobs left behind by a worker that stopped or a lost publish."""
+    for job_id in stalled_job_ids():
+        logger.info(f"Resuming stalled job {job_id}")
+        enqueue_job(job_id)
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from app import settings
+from app.services.outbox_service import prune_published_events
+from app.services.task_service import prune_tombstones
+from app.tasks.celery_app import celery_app, PRUNE_OUTBOX_TASK, PRUNE_TOMBSTONES_TASK
+
+logger = getLogger(__name__)
+
+
+@celery_app.task(name=PRUNE_TOMBSTONES_TASK, ignore_result=True)
+def prune_tombstones_task() -> int:
+    """Delete delta sync tombstones older than the retention window."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    pruned = prune_tombstones(older_than=cutoff)
+    logger.info(f"Pruned {pruned} task tombstones removed before {cutoff.isoformat()}")
+    return pruned
+
+
+@celery_app.task(name=PRUNE_OUTBOX_TASK, ignore_result=True)
+def prune_outbox_task() -> int:
+    """Delete outbox rows published before the retention window."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    pruned = prune_published_events(older_than=cutoff)
+    logger.info(f"Pruned {pruned} outbox events published before {cutoff.isoformat()}")
+    return pruned
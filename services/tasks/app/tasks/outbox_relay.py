@@ -0,0 +1,216 @@
+import time
+from logging import getLogger
+from typing import Callable, Optional, Protocol
+from kombu.exceptions import OperationalError
+from sqlalchemy import exists, func, text
+from sqlalchemy.orm import aliased
+from app import settings
+from app.db.database import get_db_session
+from app.models.outbox import OutboxEvent
+from app.tasks.celery_app import celery_app, HISTORY_EVENT_TASK, HISTORY_QUEUE
+from app.core.metrics import (
+    celery_tasks_published_total,
+    outbox_events_dead_lettered_total,
+    registry,
+)
+
+logger = getLogger(__name__)
+
+# Arbitrary application-wide key for the Postgres advisory lock that keeps a
+# single relay active at a time, so per-aggregate ordering cannot interleave.
+OUTBOX_RELAY_LOCK_ID = 0x7A5C0B0C
+
+
+class BrokerUnavailable(ConnectionError):
+    """The broker could not take the event; the outbox row itself is not at fault."""
+
+
+class OutboxPublisher(Protocol):
+    def publish(self, event: dict) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CeleryOutboxPublisher:
+    """
+    Publishes history events through one persistent broker connection.
+
+    The Celery app is configured with publisher confirms, so `publish` returns
+    only after the broker has acknowledged the message and raises otherwise.
+    Connection failures are raised as `BrokerUnavailable`.
+    """
+
+    def __init__(self, app=celery_app):
+        self.app = app
+        self._connection = None
+        self._producer = None
+
+    def _ensure_producer(self):
+        if self._producer is None:
+            self._connection = self.app.connection_for_write()
+            self._connection.ensure_connection(max_retries=3)
+            self._producer = self._connection.Producer()
+        return self._producer
+
+    def publish(self, event: dict) -> None:
+        try:
+            producer = self._ensure_producer()
+        except Exception as e:
+            raise BrokerUnavailable(f"Broker connection failed: {e}") from e
+        try:
+            self.app.send_task(
+                HISTORY_EVENT_TASK,
+                args=[event],
+                queue=HISTORY_QUEUE,
+                producer=producer,
+                retry=False,
+            )
+        except Exception as e:
+            celery_tasks_published_total.labels(HISTORY_EVENT_TASK, "failed").inc()
+            # Drop the connection so the next publish starts from a clean channel
+            self.close()
+            if isinstance(e, (OperationalError, OSError)):
+                raise BrokerUnavailable(f"Broker connection failed: {e}") from e
+            raise
+        celery_tasks_published_total.labels(HISTORY_EVENT_TASK, "published").inc()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.release()
+            finally:
+                self._connection = None
+                self._producer = None
+
+
+class OutboxRelay:
+    """
+    Drains the outbox table into the history queue in batches.
+
+    Rows are read in id order. If publishing an event fails, later events of the
+    same aggregate in that batch are held back, so consumers always see the
+    changes of one task/board/project in the order they were committed.
+
+    A row that fails `max_attempts` times is dead-lettered: it is left in the
+    table with its last error and the later events of its aggregate stay held
+    back until someone resolves it. Clearing `dead_lettered_at` and `attempts`
+    queues it again ahead of them; deleting it drops the event and releases
+    them. Other aggregates keep flowing meanwhile. While the broker is
+    unreachable the batch stops early and no attempts are counted.
+    """
+
+    def __init__(
+        self,
+        publisher: OutboxPublisher,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        session_factory: Callable = get_db_session,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+    ):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+
+    def relay_batch(self) -> int:
+        """
+        Publish one batch of pending events.
+
+        Returns:
+            int: The number of events published
+        """
+        published = 0
+
+        with self.session_factory() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                acquired = db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:lock_id)"),
+                    {"lock_id": OUTBOX_RELAY_LOCK_ID},
+                ).scalar()
+                if not acquired:
+                    return 0
+
+            dead_letter = aliased(OutboxEvent)
+            rows = (
+                db.query(OutboxEvent)
+                .filter(
+                    OutboxEvent.published_at.is_(None),
+                    OutboxEvent.dead_lettered_at.is_(None),
+                    ~exists().where(
+                        dead_letter.aggregate_type == OutboxEvent.aggregate_type,
+                        dead_letter.aggregate_id == OutboxEvent.aggregate_id,
+                        dead_letter.dead_lettered_at.isnot(None),
+                        dead_letter.id < OutboxEvent.id,
+                    ),
+                )
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update()
+                .all()
+            )
+
+            held_back = set()
+            for row in rows:
+                aggregate = (row.aggregate_type, row.aggregate_id)
+                if aggregate in held_back:
+                    continue
+
+                try:
+                    self.publisher.publish(row.to_history_event(settings.SERVICE_NAME))
+                except BrokerUnavailable as e:
+                    logger.error(f"Outbox relay cannot reach the broker: {e}")
+                    break
+                except Exception as e:
+                    row.attempts += 1
+                    row.last_error = str(e)
+                    if row.attempts >= self.max_attempts:
+                        logger.error(
+                            f"Dead-lettering outbox event {row.id} after"
+                            f" {row.attempts} attempts: {e}",
+                            exc_info=True,
+                        )
+                        row.dead_lettered_at = func.now()
+                        outbox_events_dead_lettered_total.inc()
+                        held_back.add(aggregate)
+                        continue
+
+                    logger.error(
+                        f"Error publishing outbox event {row.id}: {e}", exc_info=True
+                    )
+                    held_back.add(aggregate)
+                    continue
+
+                row.published_at = func.now()
+                published += 1
+
+        return published
+
+    def run_forever(self, poll_interval: Optional[float] = None) -> None:
+        """Relay batches until interrupted, sleeping only when the outbox is drained."""
+        poll_interval = (
+            settings.OUTBOX_POLL_INTERVAL if poll_interval is None else poll_interval
+        )
+
+        try:
+            while True:
+                try:
+                    published = self.relay_batch()
+                except Exception as e:
+                    logger.error(f"Outbox relay batch failed: {e}", exc_info=True)
+                    published = 0
+
+                if published < self.batch_size:
+                    time.sleep(poll_interval)
+        finally:
+            self.publisher.close()
+
+
+if __name__ == "__main__":
+    if settings.OUTBOX_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.OUTBOX_METRICS_PORT, registry=registry())
+
+    print(
+        f"Starting {settings.SERVICE_NAME} outbox relay (batch size {settings.OUTBOX_BATCH_SIZE})"
+    )
+    OutboxRelay(CeleryOutboxPublisher()).run_forever()
@@ -0,0 +1,78 @@
+"""
+Compare request body decoding strategies for the write endpoints.
+
+    python -m benchmarks.decoding_bench [--number 2000] [--bulk-size 1000]
+
+"dict" is what the handlers used to do (`request.get_json()` then `TaskCreate(**data)`),
+"json" is `TaskCreate.model_validate_json(raw)` as done by app.core.decoding.
+"""
+import argparse
+import json
+import timeit
+from typing import List
+from pydantic import TypeAdapter
+from app.schemas.task_schema import TaskCreate
+
+TASK = {
+    "title": "Prepare sprint review",
+    "description": "Collect the demo items and book the room for Friday.",
+    "status": "in_progress",
+    "priority": "high",
+    "user_id": "42",
+    "assigned_to": "17",
+    "board_id": 3,
+    "due_date": "2026-10-30T15:00:00+00:00",
+}
+
+bulk_adapter = TypeAdapter(List[TaskCreate])
+
+
+def _rate(stmt, number: int) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return number / best
+
+
+def run(number: int, bulk_size: int) -> dict:
+    typical = json.dumps(TASK).encode()
+    bulk = json.dumps([TASK] * bulk_size).encode()
+    bulk_number = max(1, number // bulk_size * 10)
+
+    results = {
+        "typical": {
+            "dict": _rate(lambda: TaskCreate(**json.loads(typical)), number),
+            "json": _rate(lambda: TaskCreate.model_validate_json(typical), number),
+        },
+        "bulk": {
+            "dict": _rate(
+                lambda: [TaskCreate(**item) for item in json.loads(bulk)], bulk_number
+            )
+            * bulk_size,
+            "json": _rate(lambda: bulk_adapter.validate_json(bulk), bulk_number)
+            * bulk_size,
+        },
+    }
+
+    for payload, rates in results.items():
+        rates["speedup"] = rates["json"] / rates["dict"]
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--bulk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = run(args.number, args.bulk_size)
+
+    for payload, rates in results.items():
+        print(
+            f"{payload:>8}: dict {rates['dict']:>10.0f} tasks/s"
+            f" | json {rates['json']:>10.0f} tasks/s"
+            f" | x{rates['speedup']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Time the tasks service layer and its endpoints against seeded datasets.
+
+    python -m benchmarks.service_bench [--sizes 1000,100000,1000000] [--db-url URL]
+        [--iterations 20] [--max-seconds 10] [--output results.json]
+        [--baseline benchmarks/baseline.json] [--tolerance 0.25] [--update-baseline]
+
+For every size the schema in `--db-url` is dropped, recreated and seeded with
+`size` tasks spread over boards of TASKS_PER_BOARD tasks, so point it at a
+scratch database. Without `--db-url` a throwaway SQLite file is used.
+
+Each case is timed for `--iterations` runs (or until `--max-seconds` is spent,
+with at least MIN_ITERATIONS runs). The results are written as JSON and compared
+with the baseline by median; the command exits with status 1 when a case got
+slower than `tolerance` allows.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+TASKS_PER_BOARD = 1000
+BOARDS_PER_PROJECT = 10
+USERS = 200
+SEED_BATCH_SIZE = 10_000
+WARMUP_ITERATIONS = 2
+MIN_ITERATIONS = 3
+# Differences below this are treated as noise, whatever the relative change
+MIN_REGRESSION_MS = 2.0
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def layout(size: int) -> Dict[str, int]:
+    boards = max(1, size // TASKS_PER_BOARD)
+    projects = max(1, -(-boards // BOARDS_PER_PROJECT))
+    return {"tasks": size, "boards": boards, "projects": projects}
+
+
+def seed(engine, size: int) -> Dict[str, int]:
+    """Recreate the schema and bulk insert `size` tasks with their projects and boards."""
+    from sqlalchemy import func, insert, select, text, update
+    from app.models import Base
+    from app.models.board import Board
+    from app.models.project import Project
+    from app.models.task import Task, TaskPriority, TaskStatus
+
+    shape = layout(size)
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    due_date = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Project),
+            [
+                {"id": p, "name": f"Project {p}", "owner_id": f"user-{p % USERS}"}
+                for p in range(1, shape["projects"] + 1)
+            ],
+        )
+        conn.execute(
+            insert(Board),
+            [
+                {
+                    "id": b,
+                    "name": f"Board {b}",
+                    "project_id": (b - 1) // BOARDS_PER_PROJECT + 1,
+                    "change_seq": 0,
+                }
+                for b in range(1, shape["boards"] + 1)
+            ],
+        )
+
+        for start in range(0, size, SEED_BATCH_SIZE):
+            conn.execute(
+                insert(Task),
+                [
+                    {
+                        "id": i + 1,
+                        "title": f"Task {i + 1}",
+                        "description": "Seeded by benchmarks.service_bench",
+                        "status": statuses[i % len(statuses)],
+                        "priority": priorities[i % len(priorities)],
+                        "due_date": due_date,
+                        "created_at": created_at + timedelta(seconds=i),
+                        "user_id": f"user-{i % USERS}",
+                        "assigned_to": f"user-{(i * 7) % USERS}",
+                        "board_id": i % shape["boards"] + 1,
+                        "change_seq": i // shape["boards"] + 1,
+                    }
+                    for i in range(start, min(start + SEED_BATCH_SIZE, size))
+                ],
+            )
+
+        # Leave the board counters where the service would have left them
+        conn.execute(
+            update(Board).values(
+                change_seq=select(func.coalesce(func.max(Task.change_seq), 0))
+                .where(Task.board_id == Board.id)
+                .scalar_subquery()
+            )
+        )
+
+    if engine.dialect.name == "postgresql":
+        # Identity sequences do not advance on explicit ids
+        with engine.begin() as conn:
+            for table in ("projects", "boards", "tasks"):
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'),"
+                        f" (SELECT MAX(id) FROM {table}))"
+                    )
+                )
+            conn.execute(text("ANALYZE"))
+
+    return shape
+
+
+def time_case(func: Callable[[], object], iterations: int, max_seconds: float) -> dict:
+    for _ in range(WARMUP_ITERATIONS):
+        func()
+
+    samples: List[float] = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < iterations:
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+        if len(samples) >= MIN_ITERATIONS and time.perf_counter() > deadline:
+            break
+
+    samples.sort()
+    return {
+        "iterations": len(samples),
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def build_cases(shape: Dict[str, int]) -> Dict[str, Callable[[], object]]:
+    from app import create_app
+    from app.schemas.task_schema import TaskCreate
+    from app.services.board_service import get_board_by_project
+    from app.services.task_service import create_task, get_task_stats, get_tasks
+
+    board_id = shape["boards"] // 2 + 1
+    project_id = shape["projects"] // 2 + 1
+    deep_offset = max(0, TASKS_PER_BOARD - 50)
+    new_task = {
+        "title": "Benchmark task",
+        "description": "Created by benchmarks.service_bench",
+        "user_id": "user-1",
+        "assigned_to": "user-2",
+        "board_id": board_id,
+        "due_date": "2030-01-01T00:00:00+00:00",
+    }
+
+    def expect_ok(response):
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.status_code}: {response.get_data(as_text=True)}")
+
+    app = create_app()
+    app.testing = True
+    client = app.test_client()
+
+    return {
+        "service.get_tasks.board_first_page": lambda: get_tasks(board_id, limit=50),
+        "service.get_tasks.board_deep_offset": lambda: get_tasks(
+            board_id, None, None, None, None, 50, deep_offset
+        ),
+        "service.get_tasks.by_user": lambda: get_tasks(None, user_id="user-7"),
+        "service.create_task": lambda: create_task(TaskCreate(**new_task)),
+        "service.get_board_by_project": lambda: get_board_by_project(project_id),
+        "service.get_task_stats": get_task_stats,
+        "api.tasks_list": lambda: expect_ok(
+            client.get(f"/api/v1/tasks/?board_id={board_id}&limit=50")
+        ),
+        "api.task_create": lambda: expect_ok(client.post("/api/v1/tasks/", json=new_task)),
+        "api.boards_list": lambda: expect_ok(
+            client.get(f"/api/v1/boards/?project_id={project_id}")
+        ),
+        "api.tasks_stats": lambda: expect_ok(client.get("/api/v1/tasks/stats")),
+    }
+
+
+def run(sizes: List[int], iterations: int, max_seconds: float) -> dict:
+    """Seed each size in turn and time every case against it."""
+    from app.db.database import engine
+
+    # Statement logging would dominate the timings
+    engine.echo = False
+
+    results = {}
+    for size in sizes:
+        print(f"Seeding {size} tasks...", file=sys.stderr)
+        shape = seed(engine, size)
+
+        size_results = {}
+        for name, func in build_cases(shape).items():
+            size_results[name] = time_case(func, iterations, max_seconds)
+            print(
+                f"{size:>9} {name:<40} median {size_results[name]['median_ms']:>10.3f} ms",
+                file=sys.stderr,
+            )
+        results[str(size)] = size_results
+
+    return {engine.dialect.name: results}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[dict]:
+    """
+    Return the cases whose median regressed against the baseline.
+
+    Cases missing from the baseline (new case, size or database) are skipped.
+    """
+    regressions = []
+    for dialect, sizes in results.items():
+        for size, cases in sizes.items():
+            for name, current in cases.items():
+                expected = baseline.get(dialect, {}).get(size, {}).get(name)
+                if expected is None:
+                    continue
+                allowed = expected["median_ms"] * (1 + tolerance)
+                if (
+                    current["median_ms"] > allowed
+                    and current["median_ms"] - expected["median_ms"] > MIN_REGRESSION_MS
+                ):
+                    regressions.append(
+                        {
+                            "dialect": dialect,
+                            "size": size,
+                            "case": name,
+                            "baseline_ms": expected["median_ms"],
+                            "current_ms": current["median_ms"],
+                            "ratio": round(current["median_ms"] / expected["median_ms"], 2),
+                        }
+                    )
+    return regressions
+
+
+def merge_baseline(baseline: dict, results: dict) -> dict:
+    merged = json.loads(json.dumps(baseline))
+    for dialect, sizes in results.items():
+        for size, cases in sizes.items():
+            merged.setdefault(dialect, {})[size] = {
+                name: {"median_ms": case["median_ms"]} for name, case in cases.items()
+            }
+    return merged
+
+
+def _load_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000", help="Comma separated task counts")
+    parser.add_argument("--db-url", default=None)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    db_url = args.db_url or "sqlite:///" + os.path.join(
+        tempfile.gettempdir(), "tasks-service-bench.db"
+    )
+    # The engine is bound when app.db.database is first imported
+    os.environ["DB_URL"] = db_url
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.iterations, args.max_seconds)
+
+    baseline = _load_json(args.baseline)
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tolerance": args.tolerance,
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "meta": report["meta"],
+                    "results": merge_baseline(baseline.get("results", {}), results),
+                },
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['dialect']}/{regression['size']} {regression['case']}:"
+            f" {regression['baseline_ms']:.3f} ms -> {regression['current_ms']:.3f} ms"
+            f" (x{regression['ratio']})",
+            file=sys.stderr,
+        )
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,5 @@
 from app import settings, create_app
-from utils.openapi.path_converter import FlaskPathConverter
-from utils.openapi.route_collector import RouteCollector
-from utils.openapi.schema_collector import SchemaCollector
-from utils.openapi.doc_generator import OpenAPIDocGenerator
-from utils.openapi.operations_builder import OperationBuilder
+from utils.openapi.spec_cache import OpenAPISpecCache
 from app.db.database import get_db_session, create_tables
 from swagger_ui import api_doc
 
@@ -11,20 +7,20 @@ app = create_app()
 
 
 def initiate_swagger_ui():
-    converter = FlaskPathConverter()
-    operations_builder = OperationBuilder()
-    routes_c = RouteCollector(app, converter, operations_builder)
-    schemas_c = SchemaCollector("app.schemas")
-    generator = OpenAPIDocGenerator(routes_c, schemas_c)
-    output_path = "./openapi.yaml"
+    # The spec is served from memory and only generated on the first request
+    # if no build-time copy matches the current routes and schemas.
+    spec_cache = OpenAPISpecCache(app, cache_dir=settings.OPENAPI_CACHE_DIR)
 
     try:
-        generator.generate(output_path)
+        spec_cache.register(url_prefix="/api/swagger")
         api_doc(
-            app, config_path=output_path, url_prefix="/api/swagger", title="API Doc"
+            app,
+            config_rel_url="/openapi.json",
+            url_prefix="/api/swagger",
+            title="API Doc",
         )
     except Exception as e:
-        print(f"OpenAPI generation Error:{e}")
+        print(f"OpenAPI setup Error:{e}")
 
 
 @app.route(f"{settings.API_V1_PREFIX}")
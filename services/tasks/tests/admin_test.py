@@ -0,0 +1,204 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import pytest
+from app import create_app
+from app.db.database import (
+    SessionLocal,
+    current_db_timeouts,
+    db_timeouts,
+    engine,
+    install_default_timeouts,
+    route_timeouts,
+    get_db_session,
+)
+from app.db.slow_queries import (
+    PlanCapture,
+    SlowQueryLog,
+    _is_timeout,
+    install_slow_query_capture,
+    slow_query_log,
+)
+from sqlalchemy import create_engine, event, text
+
+# Postgres-only behaviour needs a real server; point this at a scratch database
+POSTGRES_TEST_URL = os.getenv("POSTGRES_TEST_URL")
+
+
+@pytest.fixture
+def client():
+    os.environ["DB_URL"] = "sqlite:///:memory:"
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def clean_log():
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+def test_slow_queries_requires_configured_token(client, monkeypatch):
+    monkeypatch.setattr("app.apis.admin_api.settings.ADMIN_TOKEN", "")
+
+    response = client.get("/api/v1/admin/slow-queries")
+
+    assert response.status_code == 404
+
+
+def test_slow_queries_rejects_wrong_token(client, monkeypatch):
+    monkeypatch.setattr("app.apis.admin_api.settings.ADMIN_TOKEN", "secret")
+
+    response = client.get(
+        "/api/v1/admin/slow-queries", headers={"X-Admin-Token": "wrong"}
+    )
+
+    assert response.status_code == 403
+
+
+def test_slow_queries_lists_captured_queries(client, monkeypatch):
+    monkeypatch.setattr("app.apis.admin_api.settings.ADMIN_TOKEN", "secret")
+    monkeypatch.setattr("app.db.slow_queries.settings.SLOW_QUERY_MS", 0)
+
+    with get_db_session() as db:
+        db.execute(text("SELECT 1"))
+
+    response = client.get(
+        "/api/v1/admin/slow-queries", headers={"X-Admin-Token": "secret"}
+    )
+
+    assert response.status_code == 200
+    entries = response.get_json()
+    assert entries[0]["statement"] == "SELECT 1"
+    assert entries[0]["plan"] is None
+
+
+def test_route_timeouts_override_defaults(monkeypatch):
+    monkeypatch.setattr("app.db.database.settings.DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr("app.db.database.settings.DB_LOCK_TIMEOUT_MS", 2000)
+
+    @route_timeouts(statement_timeout_ms=100)
+    def view():
+        return current_db_timeouts()
+
+    assert view() == (100, 2000)
+    assert current_db_timeouts() == (5000, 2000)
+
+    with db_timeouts(lock_timeout_ms=50):
+        assert current_db_timeouts() == (5000, 50)
+
+    # 0 turns a timeout off rather than falling back to the default
+    with db_timeouts(statement_timeout_ms=0):
+        assert current_db_timeouts() == (0, 2000)
+
+
+def test_failed_slow_statement_is_recorded_with_its_error(monkeypatch):
+    monkeypatch.setattr("app.db.slow_queries.settings.SLOW_QUERY_MS", 0)
+
+    with pytest.raises(Exception):
+        with get_db_session() as db:
+            db.execute(text("SELECT * FROM missing_table"))
+
+    entry = slow_query_log.entries()[0]
+    assert entry["statement"] == "SELECT * FROM missing_table"
+    assert "missing_table" in entry["error"]
+    with engine.connect() as conn:
+        assert not conn.info.get("query_start_time")
+
+
+def test_fast_failures_are_only_recorded_when_cancelled_by_a_timeout():
+    class QueryCanceled(Exception):
+        sqlstate = "57014"
+
+    class UniqueViolation(Exception):
+        sqlstate = "23505"
+
+    assert _is_timeout(QueryCanceled())
+    assert not _is_timeout(UniqueViolation())
+
+
+def test_plans_are_added_to_entries_in_the_background():
+    log = SlowQueryLog()
+    plans = PlanCapture(engine=None, log=log, maxsize=1)
+    plans.explain = lambda statement, parameters: [{"Plan": {"Node Type": "Seq Scan"}}]
+    entry = {"statement": "SELECT 1", "plan": None}
+    log.record(entry)
+
+    plans.submit(entry, "SELECT 1", {})
+    plans.queue.join()
+
+    assert log.entries()[0]["plan"] == [{"Plan": {"Node Type": "Seq Scan"}}]
+
+
+@pytest.mark.skipif(not POSTGRES_TEST_URL, reason="POSTGRES_TEST_URL is not set")
+def test_postgres_timeouts_are_recorded_and_plans_explained(monkeypatch):
+    monkeypatch.setattr("app.db.slow_queries.settings.SLOW_QUERY_MS", 50)
+    monkeypatch.setattr("app.db.slow_queries.settings.SLOW_QUERY_EXPLAIN", True)
+    pg_engine = create_engine(POSTGRES_TEST_URL)
+    log = SlowQueryLog()
+    plans = install_slow_query_capture(pg_engine, log)
+
+    try:
+        with pg_engine.connect() as conn:
+            conn.execute(text("SELECT pg_sleep(0.1)"))
+            conn.execute(text("SET statement_timeout = 20"))
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT pg_sleep(1)"))
+            assert not conn.info["query_start_time"]
+        plans.queue.join()
+    finally:
+        pg_engine.dispose()
+
+    cancelled, slow = log.entries()
+    assert "statement timeout" in cancelled["error"]
+    assert slow["error"] is None
+    assert slow["plan"][0]["Plan"]["Node Type"] == "Result"
+
+
+@pytest.mark.skipif(not POSTGRES_TEST_URL, reason="POSTGRES_TEST_URL is not set")
+def test_postgres_default_timeouts_are_set_per_connection(monkeypatch):
+    monkeypatch.setattr("app.db.database.settings.DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr("app.db.database.settings.DB_LOCK_TIMEOUT_MS", 2000)
+    pg_engine = create_engine(POSTGRES_TEST_URL)
+    install_default_timeouts(pg_engine)
+    SessionLocal.configure(bind=pg_engine)
+    statements = []
+
+    def on_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def timeouts(db):
+        return (
+            db.execute(text("SHOW statement_timeout")).scalar(),
+            db.execute(text("SHOW lock_timeout")).scalar(),
+        )
+
+    event.listen(pg_engine, "before_cursor_execute", on_statement)
+    try:
+        with get_db_session() as db:
+            assert timeouts(db) == ("5s", "2s")
+        with db_timeouts(statement_timeout_ms=5000, lock_timeout_ms=2000):
+            with get_db_session() as db:
+                assert timeouts(db) == ("5s", "2s")
+        # Only the timeout that differs from the default is sent
+        assert not any("set_config" in statement for statement in statements)
+
+        with db_timeouts(statement_timeout_ms=0):
+            with get_db_session() as db:
+                assert timeouts(db) == ("0", "2s")
+        assert "set_config('statement_timeout'" in statements[-3]
+        assert "lock_timeout" not in statements[-3]
+
+        # The override ends with its transaction
+        with get_db_session() as db:
+            assert timeouts(db) == ("5s", "2s")
+    finally:
+        event.remove(pg_engine, "before_cursor_execute", on_statement)
+        SessionLocal.configure(bind=engine)
+        pg_engine.dispose()
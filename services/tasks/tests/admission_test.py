@@ -0,0 +1,142 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import pytest
+from app import create_app
+from app.core import admission
+from app.services.pagination import clamp_limit, clamp_offset
+
+
+@pytest.fixture
+def client():
+    os.environ["DB_URL"] = "sqlite:///:memory:"
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def test_clamp_limit_applies_default_and_cap(monkeypatch):
+    monkeypatch.setattr("app.services.pagination.settings.DEFAULT_PAGE_LIMIT", 50)
+    monkeypatch.setattr("app.services.pagination.settings.MAX_PAGE_LIMIT", 200)
+
+    assert clamp_limit(None) == 50
+    assert clamp_limit("10") == 10
+    assert clamp_limit("100000") == 200
+    assert clamp_limit(0) == 1
+    assert clamp_offset(None) == 0
+
+
+def test_clamp_limit_rejects_non_integers():
+    with pytest.raises(ValueError):
+        clamp_limit("ten")
+
+
+def test_quota_exhausted_returns_429_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(
+        admission.quota, "take", lambda key, rate, burst, cost=1: (False, 2.4)
+    )
+
+    response = client.get("/api/v1/tasks/?user_id=user-1")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_quota_key_is_the_owner_the_request_is_scoped_to(client, monkeypatch):
+    keys = []
+
+    def fake_take(key, rate, burst, cost=1):
+        keys.append(key)
+        return False, 0
+
+    monkeypatch.setattr(admission.quota, "take", fake_take)
+
+    client.get("/api/v1/projects/?owner_id=42", environ_base={"REMOTE_ADDR": "10.0.0.7"})
+    client.get(
+        "/api/v1/projects/?owner_id=43",
+        headers={"X-User-Id": "someone-else"},
+        environ_base={"REMOTE_ADDR": "10.0.0.7"},
+    )
+    client.get("/api/v1/tasks/?user_id=42", environ_base={"REMOTE_ADDR": "10.0.0.8"})
+
+    assert keys == [
+        "projects_list:owner:42",
+        "projects_list:owner:43",
+        "tasks_list:owner:42",
+    ]
+
+
+def test_quota_key_falls_back_to_the_client_behind_the_proxy(monkeypatch):
+    keys = []
+
+    def fake_take(key, rate, burst, cost=1):
+        keys.append(key)
+        return False, 0
+
+    monkeypatch.setattr(admission.quota, "take", fake_take)
+    forwarded = {"X-Forwarded-For": "203.0.113.9, 10.0.0.2"}
+
+    direct = create_app().test_client()
+    direct.get(
+        "/api/v1/boards/?project_id=1",
+        headers=forwarded,
+        environ_base={"REMOTE_ADDR": "10.0.0.1"},
+    )
+
+    # One trusted proxy: the entry it appended is the client, earlier ones are spoofable
+    monkeypatch.setattr("app.settings.PROXY_FIX_HOPS", 1)
+    proxied = create_app().test_client()
+    proxied.get(
+        "/api/v1/boards/?project_id=1",
+        headers=forwarded,
+        environ_base={"REMOTE_ADDR": "10.0.0.1"},
+    )
+
+    assert keys == ["boards_list:addr:10.0.0.1", "boards_list:addr:10.0.0.2"]
+
+
+def test_saturated_endpoint_returns_503(client, monkeypatch):
+    taken = []
+    monkeypatch.setattr(
+        admission.quota, "take", lambda key, rate, burst, cost=1: taken.append(key) or (True, 0.0)
+    )
+    limiter = admission._concurrency_limits["tasks_stats"]
+    held = 0
+    while limiter.acquire(blocking=False):
+        held += 1
+
+    try:
+        response = client.get("/api/v1/tasks/stats")
+    finally:
+        for _ in range(held):
+            limiter.release()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    # Turned away before the quota, so no tokens were spent
+    assert taken == []
+
+
+def test_quota_fails_open_without_redis():
+    quota = admission.TokenBucketQuota(redis_url="")
+
+    assert quota.take("tasks_list:user-1", rate=1, burst=1) == (True, 0.0)
+
+
+def test_tasks_stats_returns_counts(client, monkeypatch):
+    stats = {
+        "total_tasks": 1,
+        "tasks_by_status": {"todo": 1},
+        "tasks_by_priority": {"medium": 1},
+        "tasks_by_user": {"user-1": 1},
+    }
+    monkeypatch.setattr("app.apis.task_api.get_task_stats", lambda: stats)
+
+    response = client.get("/api/v1/tasks/stats")
+
+    assert response.status_code == 200
+    assert response.get_json() == stats
@@ -0,0 +1,56 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+from benchmarks.service_bench import compare, layout, merge_baseline, run
+
+
+def test_layout_spreads_tasks_over_boards_and_projects():
+    assert layout(1000) == {"tasks": 1000, "boards": 1, "projects": 1}
+    assert layout(100_000) == {"tasks": 100_000, "boards": 100, "projects": 10}
+
+
+def test_run_times_every_case():
+    results = run([200], iterations=3, max_seconds=0.1)
+
+    cases = results["sqlite"]["200"]
+    assert "service.get_tasks.board_first_page" in cases
+    assert "api.tasks_stats" in cases
+    for timing in cases.values():
+        assert timing["iterations"] >= 3
+        assert timing["min_ms"] <= timing["median_ms"] <= timing["p95_ms"]
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"sqlite": {"1000": {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}}}}
+    results = {
+        "sqlite": {
+            "1000": {
+                "fast": {"median_ms": 12.0},
+                "slow": {"median_ms": 20.0},
+                "new": {"median_ms": 99.0},
+            }
+        }
+    }
+
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    assert [r["case"] for r in regressions] == ["slow"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_compare_ignores_sub_millisecond_noise():
+    baseline = {"sqlite": {"1000": {"tiny": {"median_ms": 0.2}}}}
+    results = {"sqlite": {"1000": {"tiny": {"median_ms": 0.6}}}}
+
+    assert compare(results, baseline, tolerance=0.25) == []
+
+
+def test_merge_baseline_keeps_other_sizes():
+    baseline = {"sqlite": {"1000": {"a": {"median_ms": 1.0}}}}
+    results = {"sqlite": {"100000": {"a": {"median_ms": 5.0, "min_ms": 4.0}}}}
+
+    merged = merge_baseline(baseline, results)
+
+    assert merged["sqlite"]["1000"] == {"a": {"median_ms": 1.0}}
+    assert merged["sqlite"]["100000"] == {"a": {"median_ms": 5.0}}
@@ -0,0 +1,232 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from sqlalchemy import create_engine, update
+from app import create_app
+from app.db.database import SessionLocal, get_db_session
+from app.models.board import Board
+from app.models.project import Project
+from app.models.task import TaskTombstone
+from app.schemas.task_schema import TaskCreate, TaskUpdate
+from app.services import task_service
+from app.services.task_service import (
+    create_task,
+    update_task,
+    delete_task,
+    get_board_changes,
+    prune_tombstones,
+)
+
+POSTGRES_TEST_URL = os.getenv("POSTGRES_TEST_URL")
+
+
+@pytest.fixture(autouse=True)
+def boards():
+    from app.db.database import create_tables, engine
+    from app.models import Base
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+
+    with get_db_session() as db:
+        db.add_all(
+            [
+                Board(id=1, name="Board 1", project_id=1),
+                Board(id=2, name="Board 2", project_id=1),
+            ]
+        )
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def _create(title, board_id=1):
+    return create_task(
+        task_data=TaskCreate(
+            title=title,
+            user_id="user-1",
+            assigned_to="assignee-1",
+            board_id=board_id,
+            due_date=datetime(2024, 5, 1, tzinfo=timezone.utc),
+        )
+    )
+
+
+def test_full_sync_returns_all_tasks_and_cursor():
+    first = _create("First")
+    second = _create("Second")
+
+    changes = get_board_changes(board_id=1)
+
+    assert [task.id for task in changes.upserts] == [first.id, second.id]
+    assert changes.deletions == []
+    assert changes.cursor == "2"
+    assert changes.has_more is False
+
+
+def test_sync_since_cursor_returns_only_the_diff():
+    first = _create("First")
+    second = _create("Second")
+    cursor = get_board_changes(board_id=1).cursor
+
+    update_task(task_id=first.id, task_data=TaskUpdate(title="First, renamed"))
+    delete_task(task_id=second.id)
+
+    changes = get_board_changes(board_id=1, since=cursor)
+
+    assert [task.title for task in changes.upserts] == ["First, renamed"]
+    assert [tombstone.id for tombstone in changes.deletions] == [second.id]
+
+
+def test_moved_task_leaves_tombstone_on_previous_board():
+    task = _create("Moving")
+    cursor_board_1 = get_board_changes(board_id=1).cursor
+
+    update_task(task_id=task.id, task_data=TaskUpdate(board_id=2))
+
+    assert [t.id for t in get_board_changes(board_id=1, since=cursor_board_1).deletions] == [task.id]
+    assert [t.id for t in get_board_changes(board_id=2).upserts] == [task.id]
+
+
+def test_move_takes_board_sequences_in_id_order():
+    task = _create("Moving back", board_id=2)
+
+    with patch.object(
+        task_service, "next_change_seq", wraps=task_service.next_change_seq
+    ) as next_change_seq:
+        update_task(task_id=task.id, task_data=TaskUpdate(board_id=1))
+
+    assert [call.args[1] for call in next_change_seq.call_args_list] == [1, 2]
+    assert [t.id for t in get_board_changes(board_id=2, since=1).deletions] == [task.id]
+    assert [t.id for t in get_board_changes(board_id=1).upserts] == [task.id]
+
+
+def test_pruned_tombstones_flag_older_cursors_for_resync():
+    kept, gone, late = _create("Kept"), _create("Gone"), _create("Late")
+    stale_cursor = get_board_changes(board_id=1).cursor
+    delete_task(task_id=gone.id)
+    with get_db_session() as db:
+        db.execute(
+            update(TaskTombstone).values(deleted_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        )
+    delete_task(task_id=late.id)
+    fresh_cursor = get_board_changes(board_id=1).cursor
+
+    assert prune_tombstones(older_than=datetime(2024, 2, 1, tzinfo=timezone.utc)) == 1
+
+    stale = get_board_changes(board_id=1, since=stale_cursor)
+    assert stale.resync_required is True
+    assert [t.id for t in stale.deletions] == [late.id]
+    assert get_board_changes(board_id=1, since=fresh_cursor).resync_required is False
+    # A full sync never needs the pruned removals
+    full = get_board_changes(board_id=1)
+    assert full.resync_required is False
+    assert [task.id for task in full.upserts] == [kept.id]
+    assert get_board_changes(board_id=2).resync_required is False
+
+
+def test_prune_tombstones_keeps_recent_ones():
+    delete_task(task_id=_create("Recent").id)
+
+    assert prune_tombstones(older_than=datetime.now(timezone.utc) - timedelta(days=1)) == 0
+    assert len(get_board_changes(board_id=1).deletions) == 1
+
+
+@pytest.mark.skipif(not POSTGRES_TEST_URL, reason="POSTGRES_TEST_URL is not set")
+def test_opposite_moves_do_not_deadlock_on_postgres():
+    from app.models import Base
+
+    pg_engine = create_engine(POSTGRES_TEST_URL)
+    Base.metadata.drop_all(bind=pg_engine)
+    Base.metadata.create_all(bind=pg_engine)
+    SessionLocal.configure(bind=pg_engine)
+    original_next_change_seq = task_service.next_change_seq
+
+    def slow_next_change_seq(db, board_id):
+        # Hold the first board lock long enough for the other move to take one
+        change_seq = original_next_change_seq(db, board_id)
+        time.sleep(0.3)
+        return change_seq
+
+    try:
+        with get_db_session() as db:
+            db.add(Project(id=1, name="Project 1", owner_id="user-1"))
+            db.flush()
+            db.add_all(
+                [
+                    Board(id=1, name="Board 1", project_id=1),
+                    Board(id=2, name="Board 2", project_id=1),
+                ]
+            )
+        on_board_1, on_board_2 = _create("Left", board_id=1), _create("Right", board_id=2)
+        errors = []
+
+        def move(task_id, board_id):
+            try:
+                update_task(task_id=task_id, task_data=TaskUpdate(board_id=board_id))
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(task_service, "next_change_seq", slow_next_change_seq):
+            moves = [
+                threading.Thread(target=move, args=(on_board_1.id, 2)),
+                threading.Thread(target=move, args=(on_board_2.id, 1)),
+            ]
+            for thread in moves:
+                thread.start()
+            for thread in moves:
+                thread.join()
+
+        assert errors == []
+        assert [t.id for t in get_board_changes(board_id=1).upserts] == [on_board_2.id]
+        assert [t.id for t in get_board_changes(board_id=2).upserts] == [on_board_1.id]
+    finally:
+        from app.db.database import engine
+
+        SessionLocal.configure(bind=engine)
+        Base.metadata.drop_all(bind=pg_engine)
+        pg_engine.dispose()
+
+
+def test_sync_pages_by_limit():
+    for title in ("One", "Two", "Three"):
+        _create(title)
+
+    page = get_board_changes(board_id=1, limit=2)
+    rest = get_board_changes(board_id=1, since=page.cursor, limit=2)
+
+    assert [task.title for task in page.upserts] == ["One", "Two"]
+    assert page.has_more is True
+    assert [task.title for task in rest.upserts] == ["Three"]
+    assert rest.has_more is False
+
+
+def test_create_task_on_missing_board_fails():
+    with pytest.raises(Exception):
+        _create("Orphan", board_id=99)
+
+
+def test_board_changes_endpoint(client):
+    task = _create("Endpoint")
+
+    response = client.get("/api/v1/boards/1/changes?since=0")
+
+    assert response.status_code == 200
+    assert response.get_json()["upserts"][0]["id"] == task.id
+    assert response.get_json()["cursor"] == "1"
+
+
+def test_board_changes_rejects_invalid_cursor(client):
+    response = client.get("/api/v1/boards/1/changes?since=abc")
+
+    assert response.status_code == 400
@@ -0,0 +1,126 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import json
+import pytest
+from app import create_app
+from app.services.board_events import BoardEventHub
+
+
+class DummyModel:
+    def __init__(self, data):
+        self._data = data
+
+    def model_dump(self):
+        return self._data
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = BoardEventHub(db_url="sqlite:///:memory:")
+    monkeypatch.setattr("app.apis.board_api.board_event_hub", hub)
+    return hub
+
+
+@pytest.fixture
+def client():
+    os.environ["DB_URL"] = "sqlite:///:memory:"
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def _payload(board_id, event_type="task_created", task_id=1):
+    return json.dumps(
+        {"type": event_type, "board_id": board_id, "task": {"id": task_id}}
+    )
+
+
+def test_hub_dispatches_only_to_board_subscribers(hub):
+    board_1 = hub.subscribe(1)
+    board_2 = hub.subscribe(2)
+
+    hub.dispatch(_payload(1))
+
+    assert board_1.get(timeout=0)["type"] == "task_created"
+    assert board_2.get(timeout=0) is None
+
+
+def test_hub_flags_overflowing_subscription(hub, monkeypatch):
+    monkeypatch.setattr("app.services.board_events.settings.BOARD_STREAM_QUEUE_SIZE", 1)
+    subscription = hub.subscribe(1)
+
+    hub.dispatch(_payload(1, task_id=1))
+    hub.dispatch(_payload(1, task_id=2))
+
+    assert subscription.overflowed is True
+    subscription.reset()
+    assert subscription.get(timeout=0) is None
+
+
+def test_hub_resyncs_every_subscription_after_reconnecting(monkeypatch):
+    import psycopg
+
+    hub = BoardEventHub(db_url="sqlite:///:memory:")
+    board_1, board_2 = hub.subscribe(1), hub.subscribe(2)
+    # Run the listener loop in the test instead of a thread
+    hub.db_url = "postgresql://tasks@db/tasks"
+    hub.dispatch(_payload(1))
+    connections = []
+
+    class DroppedConnection:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query):
+            pass
+
+        def notifies(self):
+            if len(connections) == 1:
+                raise psycopg.OperationalError("server closed the connection")
+            raise KeyboardInterrupt()
+
+    def connect(conninfo, autocommit):
+        connections.append(conninfo)
+        return DroppedConnection()
+
+    monkeypatch.setattr(psycopg, "connect", connect)
+    monkeypatch.setattr("app.services.board_events.time.sleep", lambda seconds: None)
+
+    with pytest.raises(KeyboardInterrupt):
+        hub._listen()
+
+    assert len(connections) == 2
+    # The queued delta is superseded by the resync
+    assert board_1.get(timeout=0) == {"type": "resync", "board_id": 1}
+    assert board_1.get(timeout=0) is None
+    assert board_2.get(timeout=0) == {"type": "resync", "board_id": 2}
+
+
+def test_board_stream_emits_task_deltas(client, hub, monkeypatch):
+    monkeypatch.setattr(
+        "app.apis.board_api.get_board_by_id",
+        lambda board_id: DummyModel({"id": board_id}),
+    )
+
+    response = client.get("/api/v1/boards/7/stream", buffered=False)
+    chunks = iter(response.response)
+
+    assert response.mimetype == "text/event-stream"
+    assert next(chunks).startswith(b"event: subscribed")
+
+    hub.dispatch(_payload(7, event_type="task_moved", task_id=3))
+    chunk = next(chunks)
+
+    assert chunk.startswith(b"event: task_moved")
+    assert json.loads(chunk.split(b"data: ", 1)[1])["task"] == {"id": 3}
+
+    response.close()
+    assert hub._subscriptions == {}
@@ -38,7 +38,7 @@ def test_boards_list_returns_boards(client, monkeypatch):
     ]
 
     def fake_get_board_by_project(project_id, limit, offset):
-        assert project_id == "11"
+        assert project_id == 11
         assert limit == "2"
         assert offset == "0"
         return [DummyModel(expected[0])]
@@ -53,6 +53,14 @@ def test_boards_list_returns_boards(client, monkeypatch):
     assert response.get_json() == expected
 
 
+def test_boards_list_requires_integer_project_id(client):
+    for query in ("", "?project_id=abc"):
+        response = client.get(f"/api/v1/boards/{query}")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "project_id must be a non-negative integer"}
+
+
 def test_board_get_returns_board(client, monkeypatch):
     expected = {
         "id": 2,
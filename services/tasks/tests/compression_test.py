@@ -0,0 +1,145 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import gzip
+import brotli
+import pytest
+from flask import Flask, Response, jsonify, stream_with_context
+from app import create_app
+from app.core.compression import init_compression
+from utils.openapi.spec_cache import OpenAPISpecCache
+
+
+class DummyModel:
+    def __init__(self, data):
+        self.data = data
+
+    def model_dump(self, mode="json"):
+        return self.data
+
+
+@pytest.fixture
+def client():
+    os.environ["DB_URL"] = "sqlite:///:memory:"
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+@pytest.fixture
+def plain_client():
+    app = Flask(__name__)
+    init_compression(app, minimum_size=100, level=6)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/large")
+    def large():
+        return jsonify({"items": ["x" * 50] * 50})
+
+    @app.route("/events")
+    def events():
+        def generate():
+            yield "data: one\n\n"
+            yield "data: two\n\n"
+
+        return Response(stream_with_context(generate()), mimetype="text/event-stream")
+
+    @app.route("/export")
+    def export():
+        def generate():
+            for i in range(100):
+                yield f'{{"row": {i}}}\n'
+
+        return Response(generate(), mimetype="application/x-ndjson")
+
+    @app.route("/binary")
+    def binary():
+        return Response(b"\x00" * 4096, mimetype="application/octet-stream")
+
+    app.testing = True
+    return app.test_client()
+
+
+def test_tasks_list_is_gzipped_when_accepted(client, monkeypatch):
+    rows = [
+        DummyModel({"id": i, "title": f"Task {i}", "description": "x" * 100})
+        for i in range(50)
+    ]
+    monkeypatch.setattr("app.apis.task_api.get_tasks", lambda *args: rows)
+
+    response = client.get("/api/v1/tasks/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(gzip.decompress(response.data)) > len(response.data)
+
+
+def test_brotli_is_preferred_over_gzip(plain_client):
+    response = plain_client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert b"items" in brotli.decompress(response.data)
+
+
+def test_client_quality_values_are_respected(plain_client):
+    response = plain_client.get(
+        "/large", headers={"Accept-Encoding": "br;q=0.5, gzip;q=1.0"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_responses_below_threshold_are_not_compressed(plain_client):
+    response = plain_client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == {"ok": True}
+
+
+def test_no_compression_without_accept_encoding(plain_client):
+    response = plain_client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_event_streams_are_never_compressed(plain_client):
+    response = plain_client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.data == b"data: one\n\ndata: two\n\n"
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk(plain_client):
+    response = plain_client.get("/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert lines[0] == '{"row": 0}'
+    assert len(lines) == 100
+
+
+def test_binary_responses_are_not_compressed(plain_client):
+    response = plain_client.get("/binary", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_pre_encoded_openapi_spec_is_left_alone(tmp_path):
+    app = create_app()
+    OpenAPISpecCache(app, cache_dir=str(tmp_path)).register(url_prefix="/api/swagger")
+
+    response = app.test_client().get(
+        "/api/swagger/openapi.json", headers={"Accept-Encoding": "gzip, br"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).startswith(b"{")
@@ -0,0 +1,246 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from app import create_app
+from app.db.database import get_db_session
+from app.models.board import Board
+from app.models.job import Job, JobStatus
+from app.models.outbox import OutboxEvent
+from app.models.project import Project
+from app.models.task import Task
+from app.services.job_service import claim_job, get_job
+from app.services.task_service import get_board_changes
+from app.tasks.jobs import JOB_HANDLERS, JobContext, delete_project_job, run_job
+
+
+@pytest.fixture(autouse=True)
+def clean_db(monkeypatch):
+    from app.db.database import create_tables, engine
+    from app.models import Base
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+    monkeypatch.setattr("app.tasks.jobs.settings.JOB_BATCH_SIZE", 2)
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    job_ids = []
+    monkeypatch.setattr("app.apis.job_api.enqueue_job", job_ids.append)
+    return job_ids
+
+
+@pytest.fixture
+def client(enqueued):
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def _seed_project(tasks=5, change_seq=0):
+    due = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    with get_db_session() as db:
+        db.add(Project(id=1, name="Project", owner_id="1"))
+        db.add(Board(id=1, name="Board", project_id=1, change_seq=change_seq))
+        db.flush()
+        db.add_all(
+            Task(
+                title=f"Task {i}",
+                user_id="1",
+                assigned_to="2",
+                board_id=1,
+                due_date=due,
+                change_seq=i + 1,
+            )
+            for i in range(tasks)
+        )
+
+
+def _submit(client, kind, params, **kwargs):
+    return client.post("/api/v1/jobs/", json={"kind": kind, "params": params}, **kwargs)
+
+
+def test_submit_returns_202_and_enqueues(client, enqueued):
+    response = _submit(client, "project_delete", {"project_id": 1})
+
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job["status"] == "pending"
+    assert response.headers["Location"] == f"/api/v1/jobs/{job['id']}"
+    assert enqueued == [job["id"]]
+
+    polled = client.get(response.headers["Location"])
+    assert polled.status_code == 200
+    assert polled.get_json()["progress"] == {"done": 0, "total": None}
+
+
+def test_invalid_params_are_rejected(client, enqueued):
+    assert _submit(client, "project_delete", {}).status_code == 400
+    assert _submit(client, "unknown", {}).status_code == 400
+    assert enqueued == []
+
+
+def test_idempotency_key_returns_the_same_job(client, enqueued):
+    headers = {"Idempotency-Key": "delete-project-1"}
+    first = _submit(client, "project_delete", {"project_id": 1}, headers=headers)
+    second = _submit(client, "project_delete", {"project_id": 1}, headers=headers)
+
+    assert first.get_json()["id"] == second.get_json()["id"]
+    assert second.status_code == 202
+    assert enqueued == [first.get_json()["id"]]
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get("/api/v1/jobs/missing").status_code == 404
+
+
+def test_project_delete_job_removes_everything_in_batches(client):
+    _seed_project(tasks=5)
+    job_id = _submit(client, "project_delete", {"project_id": 1}).get_json()["id"]
+
+    run_job(job_id)
+
+    job = get_job(job_id)
+    assert job.status == "succeeded"
+    assert job.progress.model_dump() == {"done": 5, "total": 5}
+    assert job.result == {
+        "project_id": 1,
+        "deleted": True,
+        "tasks_deleted": 5,
+        "boards_deleted": 1,
+    }
+    with get_db_session() as db:
+        assert db.query(Task).count() == 0
+        assert db.query(Board).count() == 0
+        assert db.get(Project, 1) is None
+        assert [e.action for e in db.query(OutboxEvent)] == ["project_delete"]
+
+
+def test_project_delete_batches_leave_tombstones_and_resync_boards(client, monkeypatch):
+    _seed_project(tasks=5, change_seq=5)
+    job_id = _submit(client, "project_delete", {"project_id": 1}).get_json()["id"]
+    resynced = []
+    monkeypatch.setattr(
+        "app.tasks.jobs.notify_board_resync", lambda db, board_id: resynced.append(board_id)
+    )
+
+    class WorkerDied(Exception):
+        pass
+
+    class DiesAfterFirstBatch(JobContext):
+        def report(self, done, checkpoint=None, total=None):
+            super().report(done, checkpoint, total)
+            if done:
+                raise WorkerDied()
+
+    with pytest.raises(WorkerDied):
+        delete_project_job(DiesAfterFirstBatch(claim_job(job_id)))
+
+    # A client synced before the job learns about the batch already deleted
+    changes = get_board_changes(board_id=1, since=5)
+    assert [(t.id, t.change_seq) for t in changes.deletions] == [(1, 6), (2, 7)]
+    assert changes.cursor == "7"
+    assert resynced == [1]
+
+
+def test_project_delete_endpoint_runs_through_one_job(client, enqueued):
+    _seed_project(tasks=3)
+
+    response = client.delete("/api/v1/projects/1")
+    again = client.delete("/api/v1/projects/1")
+
+    assert response.status_code == 202
+    job_id = response.get_json()["id"]
+    assert response.headers["Location"] == f"/api/v1/jobs/{job_id}"
+    # Deleting again before the job ran returns the same job
+    assert again.get_json()["id"] == job_id
+    assert enqueued == [job_id]
+
+    run_job(job_id)
+
+    assert get_job(job_id).result["tasks_deleted"] == 3
+    assert client.delete("/api/v1/projects/1").status_code == 404
+
+
+def test_lost_lease_while_failing_keeps_the_original_error_logged(client, monkeypatch, caplog):
+    job_id = _submit(client, "board_reconcile", {}).get_json()["id"]
+
+    def broken(ctx):
+        # Another worker took the job over meanwhile
+        with get_db_session() as db:
+            db.get(Job, job_id).locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+        raise RuntimeError("database went away")
+
+    monkeypatch.setitem(JOB_HANDLERS, "board_reconcile", broken)
+
+    run_job(job_id)
+
+    assert "database went away" in caplog.text
+    assert "lost its lease" in caplog.text
+    assert get_job(job_id).status == "running"
+
+
+def test_reconcile_job_resumes_from_checkpoint(client):
+    _seed_project(tasks=3, change_seq=0)
+    with get_db_session() as db:
+        db.add(Board(id=2, name="Behind", project_id=1, change_seq=0))
+        db.add(Board(id=3, name="Ahead", project_id=1, change_seq=50))
+    job_id = _submit(client, "board_reconcile", {}).get_json()["id"]
+
+    # A previous attempt reconciled board 1 and then its worker died
+    with get_db_session() as db:
+        job = db.get(Job, job_id)
+        job.status = JobStatus.RUNNING
+        job.attempts = 1
+        job.progress_done = 1
+        job.progress_total = 3
+        job.checkpoint = {"last_board_id": 1, "repaired": 0}
+        job.locked_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    run_job(job_id)
+
+    job = get_job(job_id)
+    assert job.status == "succeeded"
+    assert job.attempts == 2
+    assert job.result == {"boards_checked": 3, "boards_repaired": 0}
+    with get_db_session() as db:
+        # Board 1 was skipped as already done; the others are never lowered
+        assert db.get(Board, 1).change_seq == 0
+        assert db.get(Board, 3).change_seq == 50
+
+
+def test_reconcile_job_raises_counters_behind_their_tasks(client):
+    _seed_project(tasks=3, change_seq=0)
+    job_id = _submit(client, "board_reconcile", {"board_ids": [1]}).get_json()["id"]
+
+    run_job(job_id)
+
+    assert get_job(job_id).result == {"boards_checked": 1, "boards_repaired": 1}
+    with get_db_session() as db:
+        assert db.get(Board, 1).change_seq == 3
+
+
+def test_job_with_live_lease_is_not_claimed_twice(client):
+    job_id = _submit(client, "board_reconcile", {}).get_json()["id"]
+
+    assert claim_job(job_id) is not None
+    assert claim_job(job_id) is None
+
+
+def test_failed_job_is_released_for_retry(client, monkeypatch):
+    job_id = _submit(client, "board_reconcile", {}).get_json()["id"]
+
+    def broken(ctx):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setitem(JOB_HANDLERS, "board_reconcile", broken)
+    monkeypatch.setattr("app.tasks.jobs.settings.JOB_MAX_ATTEMPTS", 1)
+
+    run_job(job_id)
+
+    job = get_job(job_id)
+    assert job.status == "failed"
+    assert job.error == "database went away"
@@ -0,0 +1,92 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import pytest
+from prometheus_client import REGISTRY
+from app import create_app
+from app.tasks.celery_app import HISTORY_EVENT_TASK
+from app.tasks.outbox_relay import CeleryOutboxPublisher
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr("app.apis.task_api.get_tasks", lambda *args: [])
+
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_labelled_by_route(client):
+    before = sample(
+        "http_requests_total", method="GET", route="/api/v1/tasks/", status="200"
+    )
+
+    client.get("/api/v1/tasks/")
+
+    assert (
+        sample("http_requests_total", method="GET", route="/api/v1/tasks/", status="200")
+        == before + 1
+    )
+    assert sample(
+        "http_request_duration_seconds_count", method="GET", route="/api/v1/tasks/"
+    ) >= 1
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_unmatched_paths_share_one_label(client):
+    before = sample(
+        "http_requests_total", method="GET", route="<unmatched>", status="404"
+    )
+
+    client.get("/api/v1/nope/1")
+    client.get("/api/v1/nope/2")
+
+    assert (
+        sample("http_requests_total", method="GET", route="<unmatched>", status="404")
+        == before + 2
+    )
+
+
+def test_metrics_endpoint_exposes_pool_stats(client):
+    client.get("/api/v1/tasks/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert "db_pool_checkout_seconds_count" in body
+    assert "db_pool_connections_in_use" in body
+    assert 'route="/metrics"' not in body
+
+
+def test_publish_outcomes_are_counted():
+    class FailingApp:
+        def connection_for_write(self):
+            raise AssertionError("unused")
+
+        def send_task(self, *args, **kwargs):
+            raise ConnectionError("broker down")
+
+    publisher = CeleryOutboxPublisher(app=FailingApp())
+    publisher._producer = object()
+    before = sample(
+        "celery_tasks_published_total", task=HISTORY_EVENT_TASK, outcome="failed"
+    )
+
+    with pytest.raises(ConnectionError):
+        publisher.publish({"event_type": "task_created"})
+
+    assert (
+        sample("celery_tasks_published_total", task=HISTORY_EVENT_TASK, outcome="failed")
+        == before + 1
+    )
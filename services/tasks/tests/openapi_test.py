@@ -0,0 +1,81 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import gzip
+import json
+import pytest
+from app import create_app
+from utils.openapi.spec_cache import OpenAPISpecCache
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.testing = True
+    return app
+
+
+@pytest.fixture
+def spec_cache(app, tmp_path):
+    cache = OpenAPISpecCache(app, cache_dir=str(tmp_path))
+    cache.register(url_prefix="/api/swagger")
+    return cache
+
+
+def test_spec_is_served_with_etag(app, spec_cache):
+    client = app.test_client()
+
+    response = client.get("/api/swagger/openapi.json")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    spec = json.loads(response.data)
+    assert "/api/v1/tasks/{task_id}" in spec["paths"]
+    assert "/api/swagger/openapi.json" not in spec["paths"]
+
+
+def test_spec_is_gzipped_when_accepted(app, spec_cache):
+    client = app.test_client()
+
+    response = client.get(
+        "/api/swagger/openapi.yaml", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).startswith(b"openapi:")
+
+
+def test_matching_etag_returns_304(app, spec_cache):
+    client = app.test_client()
+    etag = client.get("/api/swagger/openapi.json").headers["ETag"]
+
+    response = client.get("/api/swagger/openapi.json", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_build_time_spec_is_reused_without_generation(app, tmp_path, monkeypatch):
+    built = OpenAPISpecCache(app, cache_dir=str(tmp_path)).build()
+
+    def fail_generation(self):
+        raise AssertionError("spec should come from the cache directory")
+
+    monkeypatch.setattr(
+        "utils.openapi.spec_cache.OpenAPIDocGenerator.build", fail_generation
+    )
+
+    assert OpenAPISpecCache(app, cache_dir=str(tmp_path)).get() == built
+
+
+def test_fingerprint_changes_with_routes(app, tmp_path):
+    cache = OpenAPISpecCache(app, cache_dir=str(tmp_path))
+    before = cache.fingerprint()
+
+    other_app = create_app()
+    other_app.add_url_rule("/api/v1/tasks/extra", "task.extra", lambda: "")
+    other_app.view_functions["task.extra"].__module__ = "app.apis.task_api"
+
+    assert OpenAPISpecCache(other_app, cache_dir=str(tmp_path)).fingerprint() != before
+    assert cache.fingerprint() == before
@@ -0,0 +1,209 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, update
+from app.db.database import get_db_session
+from app.models.board import Board
+from app.models.outbox import OutboxEvent
+from app.schemas.task_schema import TaskCreate, TaskUpdate
+from app.services.outbox_service import prune_published_events
+from app.services.task_service import create_task, update_task
+from kombu.exceptions import EncodeError, OperationalError
+from app.tasks.outbox_relay import BrokerUnavailable, CeleryOutboxPublisher, OutboxRelay
+
+
+class FakePublisher:
+    def __init__(self, fail_for=None, broker_down=False):
+        self.fail_for = fail_for or set()
+        self.broker_down = broker_down
+        self.published = []
+
+    def publish(self, event):
+        if self.broker_down:
+            raise BrokerUnavailable("broker unavailable")
+        if event["details"]["aggregate_id"] in self.fail_for:
+            raise ValueError("event rejected")
+        self.published.append(event)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    from app.db.database import create_tables, engine
+    from app.models import Base
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+
+    with get_db_session() as db:
+        db.add(Board(id=1, name="Outbox Board", project_id=1))
+
+
+def _task_data(**overrides):
+    data = {
+        "title": "Outbox Task",
+        "user_id": "user-1",
+        "assigned_to": "assignee-1",
+        "board_id": 1,
+        "due_date": datetime(2024, 5, 1, tzinfo=timezone.utc),
+    }
+    data.update(overrides)
+    return TaskCreate(**data)
+
+
+def test_create_task_records_outbox_event():
+    task = create_task(task_data=_task_data())
+
+    with get_db_session() as db:
+        events = db.query(OutboxEvent).all()
+        assert len(events) == 1
+        assert events[0].aggregate_type == "task"
+        assert events[0].aggregate_id == task.id
+        assert events[0].action == "task_create"
+        assert events[0].user_id == "user-1"
+        assert events[0].published_at is None
+
+
+def test_relay_publishes_pending_events_in_order():
+    task = create_task(task_data=_task_data())
+    update_task(task_id=task.id, task_data=TaskUpdate(title="Renamed"))
+
+    publisher = FakePublisher()
+    relay = OutboxRelay(publisher, batch_size=10)
+
+    assert relay.relay_batch() == 2
+    assert [e["action"] for e in publisher.published] == ["task_create", "task_update"]
+    assert publisher.published[0]["service"] == "tasks"
+    assert relay.relay_batch() == 0
+
+
+def test_relayed_events_carry_a_stable_event_id():
+    task = create_task(task_data=_task_data())
+    update_task(task_id=task.id, task_data=TaskUpdate(title="Renamed"))
+
+    with get_db_session() as db:
+        rows = db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+        event_ids = [row.to_history_event("tasks")["event_id"] for row in rows]
+        assert event_ids == [f"tasks:outbox:{row.id}" for row in rows]
+        assert event_ids == [row.to_history_event("tasks")["event_id"] for row in rows]
+
+
+def test_relay_holds_back_later_events_of_failed_aggregate():
+    failing = create_task(task_data=_task_data(title="Failing"))
+    healthy = create_task(task_data=_task_data(title="Healthy"))
+    update_task(task_id=failing.id, task_data=TaskUpdate(title="Still failing"))
+
+    publisher = FakePublisher(fail_for={failing.id})
+    relay = OutboxRelay(publisher, batch_size=10)
+
+    assert relay.relay_batch() == 1
+    assert [e["details"]["aggregate_id"] for e in publisher.published] == [healthy.id]
+
+    with get_db_session() as db:
+        pending = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.published_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .all()
+        )
+        assert [e.action for e in pending] == ["task_create", "task_update"]
+        assert pending[0].attempts == 1
+        assert pending[1].attempts == 0
+
+
+def test_relay_dead_letters_a_row_after_max_attempts():
+    failing = create_task(task_data=_task_data(title="Failing"))
+    update_task(task_id=failing.id, task_data=TaskUpdate(title="Queued behind"))
+    other = create_task(task_data=_task_data(title="Other"))
+
+    publisher = FakePublisher(fail_for={failing.id})
+    relay = OutboxRelay(publisher, batch_size=10, max_attempts=2)
+
+    assert relay.relay_batch() == 1
+    # The second failure parks the event; the one behind it stays held back
+    assert relay.relay_batch() == 0
+    assert [e["details"]["aggregate_id"] for e in publisher.published] == [other.id]
+
+    with get_db_session() as db:
+        parked = db.query(OutboxEvent).filter(OutboxEvent.action == "task_create").first()
+        assert parked.attempts == 2
+        assert parked.dead_lettered_at is not None
+        assert parked.published_at is None
+        assert parked.last_error == "event rejected"
+        parked_id = parked.id
+
+    publisher.fail_for = set()
+    assert relay.relay_batch() == 0
+
+    # Resolving the dead letter publishes it ahead of the events behind it
+    with get_db_session() as db:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == parked_id)
+            .values(dead_lettered_at=None, attempts=0)
+        )
+    assert relay.relay_batch() == 2
+    assert [e["action"] for e in publisher.published[1:]] == ["task_create", "task_update"]
+
+
+def test_deleting_a_dead_letter_releases_the_events_behind_it():
+    failing = create_task(task_data=_task_data(title="Failing"))
+    update_task(task_id=failing.id, task_data=TaskUpdate(title="Queued behind"))
+
+    publisher = FakePublisher(fail_for={failing.id})
+    relay = OutboxRelay(publisher, batch_size=10, max_attempts=1)
+    assert relay.relay_batch() == 0
+
+    publisher.fail_for = set()
+    with get_db_session() as db:
+        db.execute(delete(OutboxEvent).where(OutboxEvent.dead_lettered_at.isnot(None)))
+
+    assert relay.relay_batch() == 1
+    assert [e["action"] for e in publisher.published] == ["task_update"]
+
+
+def test_relay_does_not_count_attempts_while_the_broker_is_down():
+    create_task(task_data=_task_data())
+    create_task(task_data=_task_data())
+
+    relay = OutboxRelay(FakePublisher(broker_down=True), batch_size=10, max_attempts=1)
+
+    assert relay.relay_batch() == 0
+    with get_db_session() as db:
+        rows = db.query(OutboxEvent).all()
+        assert [(row.attempts, row.dead_lettered_at) for row in rows] == [(0, None), (0, None)]
+
+
+def test_prune_published_events_keeps_pending_and_recent_rows():
+    for title in ("Old", "Recent", "Pending"):
+        create_task(task_data=_task_data(title=title))
+    now = datetime.now(timezone.utc)
+    with get_db_session() as db:
+        db.execute(update(OutboxEvent).where(OutboxEvent.id == 1).values(published_at=now - timedelta(days=10)))
+        db.execute(update(OutboxEvent).where(OutboxEvent.id == 2).values(published_at=now))
+
+    assert prune_published_events(older_than=now - timedelta(days=7)) == 1
+
+    with get_db_session() as db:
+        assert [row.id for row in db.query(OutboxEvent).order_by(OutboxEvent.id)] == [2, 3]
+
+
+@pytest.mark.parametrize(
+    "error, raised",
+    [(OperationalError("connection reset"), BrokerUnavailable), (EncodeError("bad payload"), EncodeError)],
+)
+def test_publisher_tells_broker_failures_from_event_failures(error, raised):
+    class BrokenApp:
+        def send_task(self, *args, **kwargs):
+            raise error
+
+    publisher = CeleryOutboxPublisher(app=BrokenApp())
+    publisher._producer = object()
+
+    with pytest.raises(raised):
+        publisher.publish({"action": "task_create"})
@@ -0,0 +1,121 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import time
+import pytest
+from pathlib import Path
+from app import create_app
+from app.core.profiling import (
+    PROFILE_HEADER,
+    ProfileStore,
+    profile_request_token,
+    sign,
+    verify_request_token,
+)
+
+SERVICES_DIR = Path(__file__).resolve().parents[2]
+PROFILING_COPIES = [
+    SERVICES_DIR / "tasks" / "app" / "core" / "profiling.py",
+    SERVICES_DIR / "history" / "app" / "core" / "profiling.py",
+    SERVICES_DIR / "users" / "utils" / "profiling.py",
+]
+
+
+def _shared_code(path: Path) -> str:
+    source = path.read_text()
+    start = source.index("# sign, profile_request_token, verify_request_token")
+    return source[start : source.index("# End of the code shared between the services")]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SECRET", "secret")
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr("app.apis.task_api.get_tasks", lambda *args: [])
+
+    from app.db.database import create_tables
+
+    create_tables()
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def test_unsigned_requests_are_not_profiled(client):
+    response = client.get("/api/v1/tasks/")
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_forged_token_is_ignored(client):
+    expires = str(int(time.time()) + 60)
+    response = client.get(
+        "/api/v1/tasks/", headers={PROFILE_HEADER: f"{expires}.{sign('wrong', expires)}"}
+    )
+
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_signed_request_is_profiled_and_downloadable(client, tmp_path):
+    response = client.get(
+        "/api/v1/tasks/", headers={PROFILE_HEADER: profile_request_token("secret", 60)}
+    )
+
+    profile_id = response.headers["X-Profile-Id"]
+    assert (tmp_path / f"{profile_id}.speedscope.json").exists()
+
+    link = response.headers["Link"]
+    url = link[link.index("<") + 1 : link.index(">")]
+    profile = client.get(url)
+
+    assert profile.status_code == 200
+    assert profile.get_json()["$schema"].startswith("https://www.speedscope.app")
+
+
+def test_profile_download_requires_signature(client):
+    response = client.get(
+        "/api/v1/tasks/", headers={PROFILE_HEADER: profile_request_token("secret", 60)}
+    )
+    profile_id = response.headers["X-Profile-Id"]
+
+    assert client.get(f"/api/v1/profiles/{profile_id}").status_code == 404
+    assert client.get(f"/api/v1/profiles/{profile_id}?sig=bad").status_code == 404
+
+
+def test_sampled_requests_are_profiled(client, monkeypatch):
+    monkeypatch.setattr("app.core.profiling.settings.PROFILE_SAMPLE_RATE", 1.0)
+
+    response = client.get("/api/v1/tasks/")
+
+    assert "X-Profile-Id" in response.headers
+
+
+def test_tokens_expiring_too_far_ahead_are_rejected():
+    expires = str(int(time.time()) + 3600)
+
+    assert not verify_request_token(f"{expires}.{sign('secret', expires)}", "secret", 300)
+    assert verify_request_token(profile_request_token("secret", 60), "secret", 300)
+
+
+def test_store_keeps_newest_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path), max_files=2, fmt="html")
+    for name in ("1-a", "2-b", "3-c"):
+        (tmp_path / f"{name}.html").write_text("")
+
+    store.prune()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["2-b.html", "3-c.html"]
+
+
+@pytest.mark.skipif(
+    not all(path.exists() for path in PROFILING_COPIES),
+    reason="the other services are not checked out next to this one",
+)
+def test_profiling_helpers_match_the_other_services():
+    tasks, history, users = (_shared_code(path) for path in PROFILING_COPIES)
+
+    assert history == tasks
+    assert users == tasks
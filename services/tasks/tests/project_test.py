@@ -108,13 +108,27 @@ def test_project_update_returns_201(client, monkeypatch):
     assert response.get_json() == expected
 
 
-def test_project_delete_returns_200(client, monkeypatch):
-    monkeypatch.setattr("app.apis.project_api.delete_project", lambda project_id: True)
+def test_project_delete_returns_202_with_the_job(client, monkeypatch):
+    from app.schemas.job_schema import JobProgress, JobResponse
+
+    job = JobResponse(
+        id="job-1",
+        kind="project_delete",
+        status="pending",
+        params={"project_id": 5},
+        progress=JobProgress(done=0),
+        attempts=0,
+    )
+    enqueued = []
+    monkeypatch.setattr("app.apis.project_api.delete_project", lambda project_id: (job, True))
+    monkeypatch.setattr("app.apis.job_api.enqueue_job", enqueued.append)
 
     response = client.delete("/api/v1/projects/5")
 
-    assert response.status_code == 200
-    assert response.get_json() == {"message": "Project Deleted Successfully!"}
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/api/v1/jobs/job-1"
+    assert response.get_json()["params"] == {"project_id": 5}
+    assert enqueued == ["job-1"]
 
 
 def test_project_delete_not_found_returns_404(client, monkeypatch):
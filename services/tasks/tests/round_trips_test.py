@@ -0,0 +1,269 @@
+import os
+
+os.environ["DB_URL"] = "sqlite:///:memory:"
+
+import json
+import re
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event, select
+from app import create_app
+from app.db.database import (
+    SessionLocal,
+    engine,
+    get_db_session,
+    install_default_timeouts,
+)
+from app.models.board import Board
+from app.models.outbox import OutboxEvent
+from app.models.project import Project
+from app.services.board_events import BOARD_EVENTS_CHANNEL
+from app.schemas.task_schema import TaskCreate, TaskUpdate
+from app.services.task_service import create_task, update_task
+
+POSTGRES_TEST_URL = os.getenv("POSTGRES_TEST_URL")
+
+
+class RoundTrips:
+    """
+    Statements and commits sent to the database while recording.
+
+    The suite runs on SQLite. On Postgres the live stream notifications of task
+    writes ride on the outbox insert, so the statements are the same.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def on_statement(self, conn, cursor, statement, parameters, context, executemany):
+        # "INSERT INTO tasks (...)" -> "INSERT tasks"
+        verb = statement.split()[0].upper()
+        table = re.search(r"\b(?:INTO|UPDATE|FROM)\s+(\w+)", statement, re.IGNORECASE)
+        self.statements.append(f"{verb} {table.group(1) if table else ''}".strip())
+
+    def on_commit(self, conn):
+        self.commits += 1
+
+
+@pytest.fixture(autouse=True)
+def board():
+    from app.db.database import create_tables
+    from app.models import Base
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+
+    with get_db_session() as db:
+        db.add(Project(id=1, name="Project", owner_id="1"))
+        db.add(Board(id=1, name="Board", project_id=1))
+
+
+@pytest.fixture
+def client():
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+@pytest.fixture
+def round_trips():
+    recorder = RoundTrips()
+    event.listen(engine, "before_cursor_execute", recorder.on_statement)
+    event.listen(engine, "commit", recorder.on_commit)
+    yield recorder
+    event.remove(engine, "before_cursor_execute", recorder.on_statement)
+    event.remove(engine, "commit", recorder.on_commit)
+
+
+TASK = {
+    "title": "Task",
+    "user_id": "user-1",
+    "assigned_to": "user-2",
+    "board_id": 1,
+    "due_date": "2024-05-01T00:00:00Z",
+}
+
+
+def test_create_task_inserts_with_returning(client, round_trips):
+    response = client.post("/api/v1/tasks/", json=TASK)
+
+    assert response.status_code == 200
+    assert response.get_json()["created_at"] is not None
+    # The change sequence and outbox row come with the task; nothing is read back.
+    assert round_trips.statements == [
+        "UPDATE boards",
+        "INSERT tasks",
+        "INSERT outbox_events",
+    ]
+    assert round_trips.commits == 1
+
+
+def test_update_task_updates_with_returning(client, round_trips):
+    task_id = client.post("/api/v1/tasks/", json=TASK).get_json()["id"]
+    round_trips.statements.clear()
+
+    response = client.put(f"/api/v1/tasks/{task_id}", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "Renamed"
+    assert response.get_json()["updated_at"] is not None
+    assert round_trips.statements == [
+        "SELECT tasks",
+        "UPDATE boards",
+        "UPDATE tasks",
+        "INSERT outbox_events",
+    ]
+
+
+def test_delete_task_deletes_with_returning(client, round_trips):
+    task_id = client.post("/api/v1/tasks/", json=TASK).get_json()["id"]
+    round_trips.statements.clear()
+
+    response = client.delete(f"/api/v1/tasks/{task_id}")
+
+    assert response.status_code == 200
+    assert sorted(round_trips.statements) == sorted(
+        [
+            "SELECT tasks",
+            "UPDATE boards",
+            "DELETE tasks",
+            "INSERT task_tombstones",
+            "INSERT outbox_events",
+        ]
+    )
+
+
+def test_create_project_and_board_do_not_read_back(client, round_trips):
+    project = client.post("/api/v1/projects/", json={"name": "Project", "owner_id": 1})
+
+    assert project.status_code == 201
+    assert round_trips.statements == ["INSERT projects", "INSERT outbox_events"]
+
+    round_trips.statements.clear()
+    board = client.post(
+        "/api/v1/boards/", json={"name": "Board", "project_id": project.get_json()["id"]}
+    )
+
+    assert board.status_code == 200
+    # Events are attributed to the project owner, which is the only read
+    assert round_trips.statements == [
+        "INSERT boards",
+        "SELECT projects",
+        "INSERT outbox_events",
+    ]
+
+
+def test_update_project_updates_with_returning(client, round_trips):
+    response = client.put("/api/v1/projects/1", json={"name": "Renamed"})
+
+    assert response.status_code == 201
+    assert response.get_json()["name"] == "Renamed"
+    assert round_trips.statements == ["UPDATE projects", "INSERT outbox_events"]
+
+
+@pytest.mark.skipif(not POSTGRES_TEST_URL, reason="POSTGRES_TEST_URL is not set")
+def test_postgres_create_task_notifies_with_the_outbox_insert():
+    import psycopg
+    from app.models import Base
+
+    pg_engine = create_engine(POSTGRES_TEST_URL)
+    install_default_timeouts(pg_engine)
+    Base.metadata.drop_all(bind=pg_engine)
+    Base.metadata.create_all(bind=pg_engine)
+    SessionLocal.configure(bind=pg_engine)
+    recorder = RoundTrips()
+
+    try:
+        with get_db_session() as db:
+            db.add(Project(id=1, name="Project", owner_id="1"))
+            db.flush()
+            db.add(Board(id=1, name="Board", project_id=1))
+            db.add(Board(id=2, name="Other board", project_id=1))
+
+        listener = psycopg.connect(
+            pg_engine.url.set(drivername="postgresql").render_as_string(
+                hide_password=False
+            ),
+            autocommit=True,
+        )
+        listener.execute(f"LISTEN {BOARD_EVENTS_CHANNEL}")
+        event.listen(pg_engine, "before_cursor_execute", recorder.on_statement)
+        event.listen(pg_engine, "commit", recorder.on_commit)
+        try:
+            task = create_task(
+                TaskCreate(**{**TASK, "due_date": datetime(2024, 5, 1, tzinfo=timezone.utc)})
+            )
+        finally:
+            event.remove(pg_engine, "before_cursor_execute", recorder.on_statement)
+            event.remove(pg_engine, "commit", recorder.on_commit)
+        # A move notifies both boards from its single outbox insert
+        update_task(task.id, TaskUpdate(board_id=2))
+        notifies = list(listener.notifies(timeout=1, stop_after=3))
+        listener.close()
+        with get_db_session() as db:
+            outbox_actions = db.scalars(
+                select(OutboxEvent.action).order_by(OutboxEvent.id)
+            ).all()
+    finally:
+        SessionLocal.configure(bind=engine)
+        Base.metadata.drop_all(bind=pg_engine)
+        pg_engine.dispose()
+
+    # The default timeouts come with the connection and the notify with the
+    # outbox row, so Postgres runs the same statements as SQLite
+    assert recorder.statements == [
+        "UPDATE boards",
+        "INSERT tasks",
+        "INSERT outbox_events",
+    ]
+    assert recorder.commits == 1
+    payloads = [json.loads(notify.payload) for notify in notifies]
+    assert [(p["type"], p["board_id"], p["task"]["id"]) for p in payloads] == [
+        ("task_created", 1, task.id),
+        ("task_moved", 1, task.id),
+        ("task_moved", 2, task.id),
+    ]
+    assert outbox_actions == ["task_create", "task_update"]
+
+
+def test_only_idle_connections_are_pinged(monkeypatch):
+    from sqlalchemy import create_engine, text
+    from app.db.liveness import install_idle_ping
+
+    idle_engine = create_engine("sqlite://")
+    install_idle_ping(idle_engine, idle_seconds=60)
+    pings = []
+    monkeypatch.setattr(idle_engine.dialect, "do_ping", pings.append)
+
+    with idle_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with idle_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert pings == []
+
+    monkeypatch.setattr("app.db.liveness.time.monotonic", lambda: 10**9)
+    with idle_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert len(pings) == 1
+
+
+def test_dead_idle_connection_is_replaced(monkeypatch):
+    from sqlalchemy import create_engine, text
+    from app.db.liveness import install_idle_ping
+
+    idle_engine = create_engine("sqlite://")
+    install_idle_ping(idle_engine, idle_seconds=0)
+
+    with idle_engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+
+    def dead(dbapi_connection):
+        raise ConnectionError("server closed the connection")
+
+    monkeypatch.setattr(idle_engine.dialect, "do_ping", dead)
+    with idle_engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        assert conn.connection.dbapi_connection is not first
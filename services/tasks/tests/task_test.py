@@ -44,7 +44,7 @@ def test_tasks_list_returns_tasks(client, monkeypatch):
     ]
 
     def fake_get_tasks(board_id, user_id, assigned_to, status, priority, limit, offset):
-        assert board_id == "21"
+        assert board_id == 21
         assert user_id == "user-1"
         assert assigned_to == "assignee-1"
         assert status == "TODO"
@@ -146,8 +146,47 @@ def test_task_delete_returns_200(client, monkeypatch):
     assert response.get_json() == {"message": "Task deleted successfully!"}
 
 
+def test_tasks_list_rejects_non_integer_board_id(client):
+    response = client.get("/api/v1/tasks/?board_id=abc")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "board_id must be a non-negative integer"}
+
+
 def test_task_update_no_data_returns_400(client):
     response = client.put("/api/v1/tasks/6",json={})
 
     assert response.status_code == 400
     assert response.get_json() == {"error": "No Data Provided"}
+
+
+def test_task_create_no_data_returns_400(client):
+    response = client.post("/api/v1/tasks/", data=b"", content_type="application/json")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "No Data Provided"}
+
+
+def test_task_create_invalid_body_returns_400(client):
+    response = client.post(
+        "/api/v1/tasks/",
+        data=b'{"title": "", "board_id": "not-a-number"}',
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["error"] == "Invalid request body"
+    assert {tuple(error["loc"]) for error in body["details"]} >= {
+        ("title",),
+        ("board_id",),
+        ("user_id",),
+    }
+
+
+def test_task_create_oversized_body_returns_413(client, monkeypatch):
+    monkeypatch.setattr("app.core.decoding.settings.MAX_BODY_BYTES", 16)
+
+    response = client.post("/api/v1/tasks/", json={"title": "x" * 64})
+
+    assert response.status_code == 413
@@ -0,0 +1,30 @@
+"""
+Generate the OpenAPI spec ahead of time.
+
+    python -m utils.openapi.build [--output openapi.yaml]
+
+The spec is written to OPENAPI_CACHE_DIR under its fingerprint, where the
+running service picks it up instead of generating it again.
+"""
+import argparse
+from app import create_app, settings
+from .spec_cache import OpenAPISpecCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the cached OpenAPI spec")
+    parser.add_argument("--output", help="Also write the spec as YAML to this path")
+    args = parser.parse_args()
+
+    cache = OpenAPISpecCache(create_app(), cache_dir=settings.OPENAPI_CACHE_DIR)
+    spec = cache.build()
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(spec.yaml)
+
+    print(f"OpenAPI spec cached ({len(spec.json)} bytes, ETag {spec.etag})")
+
+
+if __name__ == "__main__":
+    main()
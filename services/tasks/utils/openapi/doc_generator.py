@@ -11,14 +11,17 @@ class OpenAPIDocGenerator:
         
     def generate(self,output_path):
         try:
-            routes = self.route_collector.collect()
-            schemas = self.schema_collector.collect()
-            
-            doc = self._build_doc(routes,schemas)
+            doc = self.build()
             self._write(doc=doc,output_path=output_path)
 
         except Exception as e:
             print(f"Error generating OpenAPI documentation: {e}")
+
+    def build(self) -> dict:
+        routes = self.route_collector.collect()
+        schemas = self.schema_collector.collect()
+
+        return self._build_doc(routes,schemas)
     
     def _build_doc(self,routes,schemas):
         _, processed_schemas = models_json_schema(
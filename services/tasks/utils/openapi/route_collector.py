@@ -1,8 +1,6 @@
-from pydantic.json_schema import models_json_schema
 from flask import Flask
 from .path_converter import FlaskPathConverter
 from .operations_builder import OperationBuilder
-import importlib
 
 
 class RouteCollector:
@@ -19,6 +17,22 @@ class RouteCollector:
         self.operations_builder = operations_builder
 
     IGNORED_METHODS = {"HEAD", "OPTIONS"}
+    DOCUMENTED_PACKAGE = "app.apis."
+
+    def documented_rules(self):
+        """
+        Yield (rule, view function) pairs for the API blueprints' routes.
+
+        View functions are taken from the app's registry instead of re-importing
+        their modules; routes outside app.apis (static files, the docs UI) are skipped.
+        """
+        for rule in self.app.url_map.iter_rules():
+            func_data = self.app.view_functions.get(rule.endpoint)
+            if func_data is None or not func_data.__module__.startswith(
+                self.DOCUMENTED_PACKAGE
+            ):
+                continue
+            yield rule, func_data
 
     def collect(self) -> dict:
         """
@@ -40,10 +54,7 @@ class RouteCollector:
         paths = {}
 
         with self.app.app_context():
-            for rule in self.app.url_map.iter_rules():
-                if rule.endpoint == "static":
-                    continue
-
+            for rule, func_data in self.documented_rules():
                 openapi_path = self.converter.convert(rule.rule)
 
                 if openapi_path not in paths:
@@ -54,16 +65,8 @@ class RouteCollector:
                     if method in self.IGNORED_METHODS:
                         continue
 
-                    endpoint = rule.endpoint.rsplit(".", 1)
-                    if len(endpoint) < 2:
-                        continue
-                    module_name, function_name = endpoint
-                    base_module = importlib.import_module(f"app.apis.{module_name}_api")
-                    func_data = getattr(base_module, function_name)
-
-                    if func_data:
-                        operation = self.operations_builder.build(func_data)
-                        
-                        paths[openapi_path][method.lower()] = operation
+                    operation = self.operations_builder.build(func_data)
+
+                    paths[openapi_path][method.lower()] = operation
 
         return paths
@@ -0,0 +1,157 @@
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import pkgutil
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional
+import yaml
+from flask import Flask, Response, request
+from .doc_generator import OpenAPIDocGenerator
+from .operations_builder import OperationBuilder
+from .path_converter import FlaskPathConverter
+from .route_collector import RouteCollector
+from .schema_collector import SchemaCollector
+
+
+@dataclass(frozen=True)
+class CachedSpec:
+    """A generated spec, pre-encoded once in every representation it is served in."""
+
+    etag: str
+    json: bytes
+    json_gzip: bytes
+    yaml: bytes
+    yaml_gzip: bytes
+
+    @classmethod
+    def from_json(cls, fingerprint: str, spec_json: bytes) -> "CachedSpec":
+        spec_yaml = yaml.dump(json.loads(spec_json), sort_keys=False).encode()
+        return cls(
+            etag=fingerprint[:32],
+            json=spec_json,
+            json_gzip=gzip.compress(spec_json, mtime=0),
+            yaml=spec_yaml,
+            yaml_gzip=gzip.compress(spec_yaml, mtime=0),
+        )
+
+
+class OpenAPISpecCache:
+    """
+    Generates the OpenAPI spec at most once per distinct API surface.
+
+    The spec is keyed by a fingerprint of the documented routes and the source of
+    the API and schema modules. It is looked up in memory first, then in
+    `cache_dir` (filled at build time by `python -m utils.openapi.build`), and only
+    generated when neither has it, on the first request that needs it.
+    """
+
+    def __init__(self, app: Flask, schemas_module: str = "app.schemas", cache_dir: str = ".openapi_cache"):
+        self.app = app
+        self.schemas_module = schemas_module
+        self.cache_dir = cache_dir
+        self.route_collector = RouteCollector(app, FlaskPathConverter(), OperationBuilder())
+        self.schema_collector = SchemaCollector(schemas_module)
+        self._spec: Optional[CachedSpec] = None
+        self._lock = threading.Lock()
+
+    def _source_files(self):
+        module_names = {
+            func.__module__ for _, func in self.route_collector.documented_rules()
+        }
+
+        package = importlib.import_module(self.schemas_module)
+        module_names.update(
+            name
+            for _, name, _ in pkgutil.walk_packages(package.__path__, package.__name__ + ".")
+        )
+
+        for name in sorted(module_names):
+            module = sys.modules.get(name)
+            origin = getattr(module, "__file__", None)
+            if origin is None:
+                spec = importlib.util.find_spec(name)
+                origin = spec.origin if spec else None
+            if origin:
+                yield origin
+
+    def fingerprint(self) -> str:
+        """Hash the documented URL map and the API/schema module sources, without generating the spec."""
+        digest = hashlib.sha256()
+
+        for rule, _ in sorted(
+            self.route_collector.documented_rules(), key=lambda item: item[0].rule
+        ):
+            digest.update(f"{rule.rule} {sorted(rule.methods)} {rule.endpoint}\n".encode())
+
+        for path in self._source_files():
+            with open(path, "rb") as f:
+                digest.update(f.read())
+
+        return digest.hexdigest()
+
+    def _cache_path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, f"openapi-{fingerprint[:32]}.json")
+
+    def build(self) -> CachedSpec:
+        """Generate the spec and store it in the cache directory."""
+        fingerprint = self.fingerprint()
+        generator = OpenAPIDocGenerator(self.route_collector, self.schema_collector)
+        spec_json = json.dumps(generator.build(), separators=(",", ":")).encode()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._cache_path(fingerprint)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(spec_json)
+        os.replace(tmp_path, self._cache_path(fingerprint))
+
+        return CachedSpec.from_json(fingerprint, spec_json)
+
+    def get(self) -> CachedSpec:
+        if self._spec is not None:
+            return self._spec
+
+        with self._lock:
+            if self._spec is None:
+                fingerprint = self.fingerprint()
+                try:
+                    with open(self._cache_path(fingerprint), "rb") as f:
+                        self._spec = CachedSpec.from_json(fingerprint, f.read())
+                except FileNotFoundError:
+                    self._spec = self.build()
+
+        return self._spec
+
+    def _serve(self, body: bytes, body_gzip: bytes, mimetype: str) -> Response:
+        spec = self.get()
+
+        if request.if_none_match.contains(spec.etag):
+            response = Response(status=304)
+        elif "gzip" in request.accept_encodings:
+            response = Response(body_gzip, mimetype=mimetype)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(body, mimetype=mimetype)
+
+        response.set_etag(spec.etag)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "public, max-age=0, must-revalidate"
+        return response
+
+    def register(self, url_prefix: str) -> None:
+        """Serve the spec as JSON and YAML under `url_prefix`."""
+
+        def openapi_json():
+            spec = self.get()
+            return self._serve(spec.json, spec.json_gzip, "application/json")
+
+        def openapi_yaml():
+            spec = self.get()
+            return self._serve(spec.yaml, spec.yaml_gzip, "application/yaml")
+
+        self.app.add_url_rule(f"{url_prefix}/openapi.json", "openapi_json", openapi_json)
+        self.app.add_url_rule(f"{url_prefix}/openapi.yaml", "openapi_yaml", openapi_yaml)
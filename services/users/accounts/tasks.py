@@ -1,8 +1,12 @@
 from celery import shared_task
 from users import celery_app
 import logging
+import uuid
 from django.core.mail import send_mail
 from .models import User
+from utils.metrics import celery_tasks_published_total
+from utils.tracing import publish_headers, tracer
+from opentelemetry.trace import SpanKind
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +41,30 @@ logger = logging.getLogger(__name__)
 
 @shared_task
 def publish_history_event(event_data):
+    # The history service stores each event id once, so a message that is
+    # redelivered or published again after a timeout is not counted twice
+    event_data = {**event_data, "event_id": event_data.get("event_id") or uuid.uuid4().hex}
     try:
         logger.info(f"Publishing history event: {event_data}")
-        result = celery_app.send_task(
-            "app.tasks.event_task.process_event_background",
-            queue="history",
-            args=[event_data],
-        )
+        with tracer().start_as_current_span(
+            "history publish",
+            kind=SpanKind.PRODUCER,
+            attributes={
+                "messaging.system": "rabbitmq",
+                "messaging.destination.name": "history",
+                "history.action": event_data.get("action", ""),
+            },
+        ):
+            # The history worker continues this trace from the message headers
+            result = celery_app.send_task(
+                "app.tasks.event_task.process_event_background",
+                queue="history",
+                args=[event_data],
+                headers=publish_headers(),
+            )
         logger.info(f"History event sent successfully. Task ID: {result}")
     except Exception as e:
+        celery_tasks_published_total.labels(
+            "app.tasks.event_task.process_event_background", "failed"
+        ).inc()
         logger.error(f"Error publishing history event: {e}", exc_info=True)
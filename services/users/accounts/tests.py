@@ -4,7 +4,17 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User, UserProfile
+from .tasks import publish_history_event
+from utils.profiling import PROFILE_HEADER, profile_request_token
+from prometheus_client import REGISTRY
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+from unittest.mock import patch
+from utils.tracing import PUBLISHED_AT_HEADER, configure_tracing
 from logging import getLogger
+import os
+import shutil
+import tempfile
 
 logger = getLogger(__name__)
 
@@ -605,3 +615,160 @@ class UserDetailsTestCase(TestCase):
         ]
         for field in required_fields:
             self.assertIn(field, response.data)
+
+
+class ProfilingMiddlewareTestCase(TestCase):
+    """Test cases for the on-demand profiling middleware"""
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        settings_override = self.settings(
+            PROFILE_SECRET="secret",
+            PROFILE_DIR=self.profile_dir,
+            PROFILE_SAMPLE_RATE=0.0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.health_url = reverse("health-check")
+
+    def test_unsigned_request_is_not_profiled(self):
+        """Test that requests without a signed header are not profiled"""
+        response = self.client.get(self.health_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_signed_request_is_profiled(self):
+        """Test that a signed request stores a profile and links to it"""
+        response = self.client.get(
+            self.health_url,
+            headers={PROFILE_HEADER: profile_request_token("secret", 60)},
+        )
+
+        profile_id = response["X-Profile-Id"]
+        self.assertEqual(
+            os.listdir(self.profile_dir), [f"{profile_id}.speedscope.json"]
+        )
+
+        link = response["Link"]
+        profile = self.client.get(link[link.index("<") + 1 : link.index(">")])
+        self.assertEqual(profile.status_code, status.HTTP_200_OK)
+
+    def test_profile_download_requires_signature(self):
+        """Test that profiles cannot be fetched without the link's signature"""
+        response = self.client.get(
+            self.health_url,
+            headers={PROFILE_HEADER: profile_request_token("secret", 60)},
+        )
+        url = reverse("profile-detail", args=[response["X-Profile-Id"]])
+
+        self.assertEqual(
+            self.client.get(url, {"sig": "bad"}).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+
+class MetricsTestCase(TestCase):
+    """Test cases for the Prometheus metrics middleware and endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def requests_to(self, route, status_code):
+        return (
+            REGISTRY.get_sample_value(
+                "http_requests_total",
+                {"method": "GET", "route": route, "status": str(status_code)},
+            )
+            or 0.0
+        )
+
+    def test_requests_are_labelled_by_route(self):
+        """Test that requests are counted under their URL pattern"""
+        before = self.requests_to("health/", 200)
+
+        self.client.get(reverse("health-check"))
+
+        self.assertEqual(self.requests_to("health/", 200), before + 1)
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test that unknown paths do not create a label per path"""
+        before = self.requests_to("<unmatched>", 404)
+
+        self.client.get("/nope/1/")
+        self.client.get("/nope/2/")
+
+        self.assertEqual(self.requests_to("<unmatched>", 404), before + 2)
+
+    def test_metrics_endpoint(self):
+        """Test that the metrics endpoint exposes request and database metrics"""
+        self.client.get(reverse("health-check"))
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn("http_request_duration_seconds_bucket", body)
+        self.assertIn("db_query_duration_seconds", body)
+
+
+class TracingTestCase(TestCase):
+    """Test cases for trace propagation from registration to the history queue"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.exporter = InMemorySpanExporter()
+        configure_tracing(cls.exporter)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.exporter.clear()
+
+    @patch("accounts.tasks.celery_app.send_task")
+    def test_registration_trace_reaches_history_message(self, send_task):
+        """Test that the publish span is part of the request trace and its context is sent along"""
+        response = self.client.post(
+            reverse("user-registration"),
+            {
+                "email": "traced@example.com",
+                "username": "traced",
+                "password": "TestPassword123",
+                "password_confirm": "TestPassword123",
+                "first_name": "Traced",
+                "last_name": "User",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        spans = {span.name: span for span in self.exporter.get_finished_spans()}
+        server = spans["POST api/v1/auth/register/"]
+        publish = spans["history publish"]
+        self.assertEqual(server.kind, SpanKind.SERVER)
+        self.assertEqual(publish.kind, SpanKind.PRODUCER)
+        self.assertEqual(publish.parent.span_id, server.context.span_id)
+
+        headers = send_task.call_args.kwargs["headers"]
+        self.assertIn(f"{publish.context.trace_id:032x}", headers["traceparent"])
+        self.assertIn(PUBLISHED_AT_HEADER, headers)
+
+
+class HistoryEventTestCase(TestCase):
+    """Test cases for the events published to the history service"""
+
+    @patch("accounts.tasks.celery_app.send_task")
+    def test_published_events_carry_an_event_id(self, send_task):
+        """Test that each event gets a unique id and an existing one is kept"""
+        event = {"service": "users", "action": "user_register", "user_id": "1", "details": {}}
+
+        publish_history_event(event)
+        publish_history_event(event)
+        publish_history_event({**event, "event_id": "users:register:1"})
+
+        event_ids = [c.kwargs["args"][0]["event_id"] for c in send_task.call_args_list]
+        self.assertEqual(len(set(event_ids[:2])), 2)
+        self.assertEqual(event_ids[2], "users:register:1")
+        self.assertNotIn("event_id", event)
@@ -1,5 +1,8 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
+from utils.metrics import install_celery_metrics
+from utils.tracing import configure_tracing
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "users.settings")
@@ -15,6 +18,13 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+install_celery_metrics()
+
+
+@worker_process_init.connect
+def start_tracing(**kwargs):
+    configure_tracing()
+
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
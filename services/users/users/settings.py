@@ -64,6 +64,9 @@ REST_FRAMEWORK = {
 AUTH_USER_MODEL = "accounts.User"
 
 MIDDLEWARE = [
+    "utils.profiling.ProfilingMiddleware",
+    "utils.metrics.MetricsMiddleware",
+    "utils.tracing.TracingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -209,3 +212,23 @@ CELERY_IGNORE_RESULT = True
 CELERY_TASK_ROUTES = {
     "app.tasks.event_task.process_event_background": {"queue": "history"}
 }
+
+# On-demand profiling (signed requests are ignored while PROFILE_SECRET is empty)
+PROFILE_SECRET = env("PROFILE_SECRET", default="")
+PROFILE_SAMPLE_RATE = env.float("PROFILE_SAMPLE_RATE", default=0.0)
+PROFILE_SIGNATURE_TTL = env.int("PROFILE_SIGNATURE_TTL", default=300)
+PROFILE_DIR = env("PROFILE_DIR", default=os.path.join(BASE_DIR, ".profiles"))
+PROFILE_MAX_FILES = env.int("PROFILE_MAX_FILES", default=50)
+PROFILE_FORMAT = env("PROFILE_FORMAT", default="speedscope")
+PROFILE_INTERVAL = env.float("PROFILE_INTERVAL", default=0.001)
+
+# Port a Celery worker serves its metrics on, 0 to disable
+METRICS_WORKER_PORT = env.int("METRICS_WORKER_PORT", default=0)
+
+# Distributed tracing ("otlp", "file" or empty to disable)
+TRACING_EXPORTER = env("TRACING_EXPORTER", default="")
+TRACING_SERVICE_NAME = env("TRACING_SERVICE_NAME", default="users")
+TRACING_OTLP_ENDPOINT = env(
+    "TRACING_OTLP_ENDPOINT", default="http://jaeger:4318/v1/traces"
+)
+TRACING_FILE = env("TRACING_FILE", default=os.path.join(BASE_DIR, "traces.jsonl"))
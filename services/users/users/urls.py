@@ -18,6 +18,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 import accounts.urls as app_apis
+from utils.profiling import profile_view
+from utils.metrics import metrics_view
 from django.http import JsonResponse
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
@@ -57,4 +59,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("health/", health_check, name="health-check"),
     path("api/v1/auth/", include(app_apis)),
+    path("profiles/<str:profile_id>/", profile_view, name="profile-detail"),
+    path("metrics/", metrics_view, name="metrics"),
 ]
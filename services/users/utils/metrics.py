@@ -0,0 +1,156 @@
+import os
+import time
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set (required under pre-fork servers and the
+# prefork Celery pool), every process writes its samples there and /metrics
+# aggregates all of them.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route"],
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+db_connections_opened_total = Counter(
+    "db_connections_opened_total",
+    "Database connections opened by Django",
+    ["alias"],
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "Time spent executing database queries",
+    ["alias"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+celery_tasks_published_total = Counter(
+    "celery_tasks_published_total",
+    "Celery tasks published",
+    ["task", "outcome"],
+)
+celery_tasks_consumed_total = Counter(
+    "celery_tasks_consumed_total",
+    "Celery tasks run by this worker",
+    ["task", "outcome"],
+)
+
+
+def registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+def _query_timer(alias: str):
+    def timed_execute(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            db_query_duration_seconds.labels(alias).observe(time.perf_counter() - started)
+
+    return timed_execute
+
+
+def _instrument_connection(sender, connection, **kwargs):
+    # Django opens a new connection per request unless CONN_MAX_AGE keeps it,
+    # so this counter is the connection churn a pooler would absorb
+    db_connections_opened_total.labels(connection.alias).inc()
+    connection.execute_wrappers.append(_query_timer(connection.alias))
+
+
+connection_created.connect(_instrument_connection, dispatch_uid="utils.metrics")
+
+
+class MetricsMiddleware:
+    """
+    Record per-route latency and in-flight requests.
+
+    Routes are labelled with their URL pattern (e.g. api/v1/auth/users/<int:pk>/),
+    never the raw path, to keep the label set bounded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == "/metrics/":
+            return self.get_response(request)
+
+        http_requests_in_progress.labels(request.method).inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            match = request.resolver_match
+            route = match.route if match is not None else UNMATCHED_ROUTE
+            http_request_duration_seconds.labels(request.method, route).observe(
+                time.perf_counter() - started
+            )
+            http_requests_total.labels(request.method, route, status).inc()
+            http_requests_in_progress.labels(request.method).dec()
+
+
+def install_celery_metrics() -> None:
+    """
+    Count the tasks published and run through Celery.
+
+    A worker has no HTTP server of its own, so with METRICS_WORKER_PORT set its
+    main process serves the aggregated metrics of the pool on that port.
+    """
+    from celery import signals
+
+    @signals.after_task_publish.connect(weak=False)
+    def task_published(sender=None, **kwargs):
+        celery_tasks_published_total.labels(sender, "published").inc()
+
+    @signals.task_postrun.connect(weak=False)
+    def task_finished(task=None, state=None, **kwargs):
+        celery_tasks_consumed_total.labels(task.name, (state or "unknown").lower()).inc()
+
+    @signals.worker_init.connect(weak=False)
+    def serve_metrics(**kwargs):
+        if settings.METRICS_WORKER_PORT:
+            start_http_server(settings.METRICS_WORKER_PORT, registry=registry())
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def drop_live_gauges(pid=None, **kwargs):
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def metrics_view(request):
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,111 @@
+import os
+import time
+from django.conf import settings
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+# Sent with every published message so the consumer can tell how long it sat
+# in the queue
+PUBLISHED_AT_HEADER = "published_at_ns"
+
+# configure_tracing, _build_exporter and tracer are the same in the history and
+# users services. Each service is built from its own directory and cannot import
+# the other, so the code is copied; the history tests check that the copies stay
+# identical.
+_provider = None
+
+
+def configure_tracing(span_exporter=None) -> None:
+    """
+    Install the OpenTelemetry SDK for this process.
+
+    Spans are exported to an OTLP collector (TRACING_EXPORTER="otlp") or
+    appended as JSON lines to TRACING_FILE (TRACING_EXPORTER="file"). With
+    TRACING_EXPORTER empty nothing is installed and spans are no-ops.
+    """
+    global _provider
+
+    if span_exporter is None and (_provider is not None or not settings.TRACING_EXPORTER):
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME})
+    )
+    if span_exporter is not None:
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    else:
+        # The batch processor restarts its export thread in forked pool workers
+        provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+
+    _provider = provider
+    trace.set_tracer_provider(provider)
+
+
+def _build_exporter():
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+    if settings.TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter(
+            out=open(settings.TRACING_FILE, "a"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+
+    raise ValueError(f"Unknown tracing exporter {settings.TRACING_EXPORTER}")
+
+
+def tracer() -> trace.Tracer:
+    if _provider is not None:
+        return _provider.get_tracer(__name__)
+    return trace.get_tracer(__name__)
+
+
+# End of the code shared between the services
+
+
+def publish_headers() -> dict:
+    """Message headers carrying the current trace context and the publish time."""
+    headers = {}
+    propagate.inject(headers)
+    headers[PUBLISHED_AT_HEADER] = str(time.time_ns())
+    return headers
+
+
+class TracingMiddleware:
+    """
+    Open a server span per request, continuing any incoming `traceparent`.
+
+    The span is named after the matched URL pattern once the view resolved, so
+    spans of one endpoint group together regardless of ids in the path.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        configure_tracing()
+
+    def __call__(self, request):
+        parent = propagate.extract(request.headers)
+        with tracer().start_as_current_span(
+            request.method,
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": request.method, "url.path": request.path},
+        ) as span:
+            response = self.get_response(request)
+
+            match = request.resolver_match
+            if match is not None:
+                span.update_name(f"{request.method} {match.route}")
+                span.set_attribute("http.route", match.route)
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(Status(StatusCode.ERROR))
+            return response